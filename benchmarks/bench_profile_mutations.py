@@ -0,0 +1,81 @@
+"""
+Time one add, update and delete on a DbtSwitchConfig of growing size,
+comparing the incremental profile methods with the previous full
+re-validation (DbtSwitchConfig(**config.model_dump())) after each change.
+File I/O is excluded: this measures the validation cost only.
+
+Usage:
+    python benchmarks/bench_profile_mutations.py [--sizes 10 1000 100000]
+"""
+
+import argparse
+import time
+
+from dbt_switch.validation.helpers import validate_full_config_after_modification
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+from generators import make_switch_config
+
+
+def _full_cycle(config: DbtSwitchConfig, n: int) -> None:
+    """add, update, delete the way file_handler did before the index."""
+    config.profiles["new"] = ProjectConfig(host="new.com", project_id=n + 1)
+    validate_full_config_after_modification(config)
+    config.profiles["new"] = ProjectConfig(host="new.com", project_id=n + 2)
+    validate_full_config_after_modification(config)
+    del config.profiles["new"]
+    validate_full_config_after_modification(config)
+
+
+def _incremental_cycle(config: DbtSwitchConfig, n: int) -> None:
+    """add, update, delete through the indexed profile methods."""
+    config.add_profile("new", ProjectConfig(host="new.com", project_id=n + 1))
+    config.replace_profile("new", ProjectConfig(host="new.com", project_id=n + 2))
+    config.remove_profile("new")
+
+
+def _best_of(func, repeat: int) -> float:
+    """Best wall-clock time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(n_profiles: int, repeat: int, full_repeat: int) -> dict:
+    """Time one add/update/delete cycle with both strategies."""
+    config = DbtSwitchConfig(**make_switch_config(n_profiles))
+    # The index is built once per loaded file; keep it out of the timings
+    config.project_id_index()
+    return {
+        "profiles": n_profiles,
+        "full_s": _best_of(lambda: _full_cycle(config, n_profiles), full_repeat),
+        "incremental_s": _best_of(
+            lambda: _incremental_cycle(config, n_profiles), repeat
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'profiles':>9} {'full (ms)':>11} {'incremental (us)':>17} {'speedup':>9}")
+    for size in args.sizes:
+        r = bench_size(
+            size, args.repeat, full_repeat=1 if size >= 100000 else args.repeat
+        )
+        speedup = r["full_s"] / r["incremental_s"]
+        print(
+            f"{size:>9} {r['full_s'] * 1e3:>11.3f} "
+            f"{r['incremental_s'] * 1e6:>17.2f} {speedup:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
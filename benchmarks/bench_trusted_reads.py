@@ -0,0 +1,106 @@
+"""
+Compare the ways read_dbt_cloud_config can load a large dbt_cloud.yml:
+parsing and validating the YAML, rebuilding DbtCloudProjectItem models from
+the parse cache, rebuilding slotted CloudProjectRecord objects from the
+parse cache (read_only=True), and the same after the file was touched, so
+that only its content hash matches. Reports best-of-N latency and the peak
+memory traced while loading.
+
+Usage:
+    python benchmarks/bench_trusted_reads.py [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from dbt_switch.config import cloud_handler
+from dbt_switch.config.cache import CACHE_DIR_NAME
+from generators import write_home
+
+
+def _best_of(func, repeat: int, setup=None) -> float:
+    """Best wall-clock time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak(func, setup=None) -> int:
+    """Peak traced memory of one call, in bytes."""
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def bench_size(n_projects: int, repeat: int) -> dict:
+    """Time and trace each load path for one file size."""
+    with tempfile.TemporaryDirectory() as home:
+        dbt_dir = write_home(Path(home), 1, n_projects)
+        cloud_file = dbt_dir / "dbt_cloud.yml"
+        cloud_handler.DBT_CLOUD_FILE = cloud_file
+
+        def drop_cache():
+            shutil.rmtree(dbt_dir / CACHE_DIR_NAME, ignore_errors=True)
+
+        def touch():
+            # New mtime, same contents: only the content hash matches
+            settled = time.time() - 60 - touch.count
+            touch.count += 1
+            os.utime(cloud_file, (settled, settled))
+
+        touch.count = 0
+
+        def read_models():
+            cloud_handler.read_dbt_cloud_config()
+
+        def read_records():
+            cloud_handler.read_dbt_cloud_config(read_only=True)
+
+        paths = {
+            "validate": (read_models, drop_cache),
+            "cached models": (read_models, None),
+            "cached records": (read_records, None),
+            "hash records": (read_records, touch),
+        }
+        results = {"projects": n_projects}
+        read_models()
+        for name, (func, setup) in paths.items():
+            results[name] = (
+                _best_of(func, 1 if name == "validate" else repeat, setup),
+                _peak(func, setup),
+            )
+            read_models()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = ["validate", "cached models", "cached records", "hash records"]
+    print(f"{'projects':>9} " + " ".join(f"{name:>22}" for name in names))
+    print(f"{'':>9} " + " ".join(f"{'ms / peak MiB':>22}" for _ in names))
+    for size in args.sizes:
+        r = bench_size(size, args.repeat)
+        cells = [f"{r[name][0] * 1e3:.1f} / {r[name][1] / 2**20:.1f}" for name in names]
+        print(f"{size:>9} " + " ".join(f"{cell:>22}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
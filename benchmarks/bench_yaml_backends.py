@@ -0,0 +1,78 @@
+"""
+Compare the libyaml and pure-Python PyYAML backends on synthetic
+dbt_cloud.yml files.
+
+Usage:
+    python benchmarks/bench_yaml_backends.py [--sizes 10 1000 50000]
+"""
+
+import argparse
+import io
+import time
+
+import yaml
+
+from dbt_switch.config.yaml_io import YAML_BACKEND, dump_yaml, load_yaml
+from generators import make_cloud_config
+
+
+def _best_of(func, repeat: int) -> float:
+    """Best wall-clock time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(n_projects: int, repeat: int) -> dict:
+    """Time load and dump with both backends for one file size."""
+    data = make_cloud_config(n_projects)
+    python_text = dump_yaml(data, dumper=yaml.SafeDumper)
+    results = {"projects": n_projects, "bytes": len(python_text)}
+
+    backends = {"python": (yaml.SafeLoader, yaml.SafeDumper)}
+    if YAML_BACKEND == "libyaml":
+        backends["libyaml"] = (yaml.CSafeLoader, yaml.CSafeDumper)
+
+    for name, (loader, dumper) in backends.items():
+        text = dump_yaml(data, dumper=dumper)
+        if text != python_text:
+            raise AssertionError(f"{name} dumper output differs from python")
+        if load_yaml(io.StringIO(text), loader=loader) != data:
+            raise AssertionError(f"{name} loader round trip differs")
+
+        results[f"{name}_load_s"] = _best_of(
+            lambda: load_yaml(io.StringIO(text), loader=loader), repeat
+        )
+        results[f"{name}_dump_s"] = _best_of(
+            lambda: dump_yaml(data, dumper=dumper), repeat
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"default backend: {YAML_BACKEND}")
+    print(
+        f"{'projects':>9} {'bytes':>11} {'py load':>9} {'c load':>9} "
+        f"{'py dump':>9} {'c dump':>9} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        r = bench_size(size, repeat=1 if size >= 10000 else args.repeat)
+        c_load = r.get("libyaml_load_s", float("nan"))
+        c_dump = r.get("libyaml_dump_s", float("nan"))
+        speedup = (r["python_load_s"] + r["python_dump_s"]) / (c_load + c_dump)
+        print(
+            f"{size:>9} {r['bytes']:>11} {r['python_load_s']:>9.4f} {c_load:>9.4f} "
+            f"{r['python_dump_s']:>9.4f} {c_dump:>9.4f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
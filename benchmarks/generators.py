@@ -0,0 +1,76 @@
+"""
+Synthetic dbt_switch.yml and dbt_cloud.yml generators shared by the
+benchmarks.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from dbt_switch.config.yaml_io import dump_yaml
+
+N_ACCOUNTS = 50
+
+
+def project_name(i: int) -> str:
+    """Profile name of the i-th generated project."""
+    return f"project-{i}"
+
+
+def account_host(i: int) -> str:
+    """Host of the account that owns the i-th generated project."""
+    return f"acct{i % N_ACCOUNTS}.us1.dbt.com"
+
+
+def make_switch_config(n_profiles: int) -> dict:
+    """Build a dbt_switch.yml mapping with n_profiles profiles."""
+    return {
+        "profiles": {
+            project_name(i): {"host": account_host(i), "project_id": i + 1}
+            for i in range(n_profiles)
+        }
+    }
+
+
+def make_cloud_config(n_projects: int) -> dict:
+    """Build a dbt_cloud.yml mapping with n_projects project items."""
+    return {
+        "version": "1",
+        "context": {"active-host": account_host(0), "active-project": "1"},
+        "projects": [
+            {
+                "project-name": f"Project {i}",
+                "project-id": str(i + 1),
+                "account-name": f"Account {i % N_ACCOUNTS}",
+                "account-id": str(i % N_ACCOUNTS + 1),
+                "account-host": account_host(i),
+                "token-name": f"cloud-cli-{i % N_ACCOUNTS}",
+                "token-value": f"dbtu_{i:032x}",
+            }
+            for i in range(n_projects)
+        ],
+    }
+
+
+def write_home(home: Path, n_profiles: int, n_projects: int) -> Path:
+    """
+    Write ~/.dbt/dbt_switch.yml and ~/.dbt/dbt_cloud.yml under a fake HOME.
+    Both files are backdated by a minute so the parse cache treats them as
+    settled, as it would on a real machine, rather than freshly written.
+    Args:
+        home: Directory to use as HOME
+        n_profiles: Profiles in dbt_switch.yml
+        n_projects: Project items in dbt_cloud.yml
+    Returns:
+        Path: The .dbt directory
+    """
+    dbt_dir = home / ".dbt"
+    dbt_dir.mkdir(parents=True, exist_ok=True)
+    with open(dbt_dir / "dbt_switch.yml", "w") as file:
+        dump_yaml(make_switch_config(n_profiles), file)
+    with open(dbt_dir / "dbt_cloud.yml", "w") as file:
+        dump_yaml(make_cloud_config(n_projects), file)
+    settled = time.time() - 60
+    for name in ("dbt_switch.yml", "dbt_cloud.yml"):
+        os.utime(dbt_dir / name, (settled, settled))
+    return dbt_dir
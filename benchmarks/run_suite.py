@@ -0,0 +1,261 @@
+"""
+End-to-end benchmark suite with a baseline regression gate.
+
+For each size, writes a synthetic dbt_switch.yml (profiles) and
+dbt_cloud.yml (project items, capped by --cloud-projects) into a temp
+HOME, then times the handler functions in-process and the CLI commands as
+subprocesses. Results are best-of-N wall-clock milliseconds keyed as
+"<operation>@<size>".
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 10 1000 100000] [--output results.json]
+    python benchmarks/run_suite.py --baseline baseline.json [--max-regression 25]
+    python benchmarks/run_suite.py --output baseline.json   # record a baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from dbt_switch.config import cloud_handler, file_handler
+from dbt_switch.config.cache import CACHE_DIR_NAME
+from dbt_switch.config.yaml_io import YAML_BACKEND
+from dbt_switch.utils.logger import logger
+from generators import account_host, project_name, write_home
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def _best_of(func, repeat: int, setup=None) -> float:
+    """Best wall-clock time of `repeat` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def bench_in_process(dbt_dir: Path, n_profiles: int, repeat: int) -> dict:
+    """Time the handler functions against the files in dbt_dir."""
+    file_handler.CONFIG_FILE = dbt_dir / "dbt_switch.yml"
+    cloud_handler.DBT_CLOUD_FILE = dbt_dir / "dbt_cloud.yml"
+    cache_dir = dbt_dir / CACHE_DIR_NAME
+    target = project_name(n_profiles // 2)
+    new_id = n_profiles + 1
+
+    def drop_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def list_quietly():
+        with contextlib.redirect_stdout(io.StringIO()):
+            file_handler.list_all_projects()
+
+    def resolve_typo():
+        try:
+            file_handler.resolve_project(target.replace("project", "projcet"))
+        except ValueError:
+            pass
+
+    def add_new():
+        file_handler.add_config("bench-new", account_host(0), new_id)
+
+    def delete_new():
+        file_handler.delete_project_config("bench-new")
+
+    results = {
+        "get_config_cold": _best_of(file_handler.get_config, repeat, drop_cache),
+        "get_config_warm": _best_of(file_handler.get_config, repeat),
+        "read_cloud_cold": _best_of(
+            cloud_handler.read_dbt_cloud_config, repeat, drop_cache
+        ),
+        "read_cloud_warm": _best_of(cloud_handler.read_dbt_cloud_config, repeat),
+        "switch_project": _best_of(
+            lambda: cloud_handler.switch_project(target), repeat
+        ),
+        "list_all_projects": _best_of(list_quietly, repeat),
+        "resolve_typo": _best_of(resolve_typo, repeat),
+    }
+    # add and delete leave the file as they found it, so alternate them
+    add_times, delete_times = [], []
+    for _ in range(repeat):
+        add_times.append(_best_of(add_new, 1))
+        delete_times.append(_best_of(delete_new, 1))
+    results["add_config"] = min(add_times)
+    results["delete_project_config"] = min(delete_times)
+    return results
+
+
+def bench_cli(home: Path, n_profiles: int, repeat: int) -> dict:
+    """Time CLI commands end to end as subprocesses with HOME set to home."""
+    env = dict(os.environ, HOME=str(home))
+    base = [sys.executable, "-m", "dbt_switch.main"]
+
+    def run(*args, stdin=None):
+        subprocess.run(
+            base + list(args),
+            env=env,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    target = project_name(n_profiles // 2)
+    new_id = str(n_profiles + 1)
+    results = {
+        "cli_version": _best_of(lambda: run("--version"), repeat),
+        "cli_list": _best_of(lambda: run("list"), repeat),
+        "cli_switch": _best_of(lambda: run("-p", target), repeat),
+        "cli_current": _best_of(lambda: run("current"), repeat),
+    }
+    add_times = []
+    for _ in range(repeat):
+        add_times.append(
+            _best_of(
+                lambda: run(
+                    "add",
+                    "bench-cli",
+                    "--host",
+                    account_host(0),
+                    "--project-id",
+                    new_id,
+                ),
+                1,
+            )
+        )
+        run("delete", stdin="bench-cli\n")
+    results["cli_add"] = min(add_times)
+    return results
+
+
+def run_suite(sizes, cloud_projects: int, repeat: int, cli: bool = True) -> dict:
+    """
+    Run every benchmark for every size.
+    Args:
+        sizes: Profile counts for dbt_switch.yml
+        cloud_projects: Upper bound on dbt_cloud.yml project items
+        repeat: Best-of count for sizes below 10k (larger sizes run once)
+        cli: Also time the CLI as subprocesses
+    Returns:
+        dict: {"meta": {...}, "results": {"<operation>@<size>": ms}}
+    """
+    results = {}
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        for size in sizes:
+            size_repeat = 1 if size >= 10000 else repeat
+            with tempfile.TemporaryDirectory(prefix="dbt-switch-bench-") as tmp:
+                home = Path(tmp)
+                dbt_dir = write_home(home, size, min(size, cloud_projects))
+                timings = bench_in_process(dbt_dir, size, size_repeat)
+                if cli:
+                    timings.update(bench_cli(home, size, size_repeat))
+            for operation, ms in timings.items():
+                results[f"{operation}@{size}"] = round(ms, 3)
+            print(f"  {size} profiles done", file=sys.stderr)
+    finally:
+        logger.setLevel(level)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "yaml_backend": YAML_BACKEND,
+            "cloud_projects": cloud_projects,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def find_regressions(
+    current: dict, baseline: dict, max_regression: float, min_delta_ms: float
+) -> list[tuple[str, float, float]]:
+    """
+    Compare results against a baseline.
+    A measurement regresses when it is more than max_regression percent and
+    more than min_delta_ms slower than the baseline; the absolute floor keeps
+    sub-millisecond noise from failing the gate. Keys missing on either side
+    are ignored.
+    Args:
+        current: "results" mapping of this run
+        baseline: "results" mapping of the baseline run
+        max_regression: Allowed slowdown in percent
+        min_delta_ms: Allowed slowdown in milliseconds regardless of percent
+    Returns:
+        list[tuple[str, float, float]]: (key, baseline ms, current ms) per regression
+    """
+    regressions = []
+    for key, base_ms in baseline.items():
+        now_ms = current.get(key)
+        if now_ms is None:
+            continue
+        if (
+            now_ms > base_ms * (1 + max_regression / 100)
+            and now_ms - base_ms > min_delta_ms
+        ):
+            regressions.append((key, base_ms, now_ms))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cloud-projects", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-cli", action="store_true", help="Skip subprocess runs")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Baseline results JSON")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=25.0,
+        help="Allowed slowdown against the baseline, in percent",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=2.0,
+        help="Ignore slowdowns smaller than this many milliseconds",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.cloud_projects, args.repeat, not args.no_cli)
+
+    for key, ms in report["results"].items():
+        print(f"{key:<40} {ms:>12.3f} ms")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = find_regressions(
+            report["results"], baseline, args.max_regression, args.min_delta_ms
+        )
+        for key, base_ms, now_ms in regressions:
+            print(
+                f"REGRESSION {key}: {base_ms:.3f} ms -> {now_ms:.3f} ms "
+                f"(+{(now_ms / base_ms - 1) * 100:.0f}%)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,60 @@
 """
 Argument parser using Click.
+
+Only click (and the stdlib-only timing helpers) are imported at module load.
+Each command imports the handlers it needs when it runs, so
+`dbt-switch -p <name>` never pays for the modules used by other subcommands,
+and `--version` / `--help` stay cheap.
 """
 
 import click
 
-from dbt_switch.utils import logger, get_current_version
-from dbt_switch.config.file_handler import init_config
-from dbt_switch.config.input_handler import (
-    add_user_config,
-    delete_user_config,
-    switch_user_config,
-    list_projects,
-    update_user_config_non_interactive,
-    update_user_config_interactive,
-)
+from dbt_switch.utils import timing
+
+
+def _print_version(ctx, param, value):
+    """Resolve the installed version only when --version is requested."""
+    if not value or ctx.resilient_parsing:
+        return
+    from dbt_switch.utils.version_check import get_current_version
+
+    click.echo(f"dbt-switch, version {get_current_version()}")
+    ctx.exit()
 
 
 @click.group(invoke_without_command=True)
-@click.option("-p", "--project", help="Switch to the specified project")
-@click.version_option(version=get_current_version(), prog_name="dbt-switch")
+@click.option(
+    "-p",
+    "--project",
+    help="Switch to the specified project (name or project ID, or - for the "
+    "previous project)",
+)
+@click.option(
+    "--version",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_print_version,
+    help="Show the version and exit.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Print a per-phase timing breakdown to stderr.",
+)
 @click.pass_context
-def cli(ctx, project):
+def cli(ctx, project, timings):
     """dbt Cloud project and host switcher."""
+    if timings:
+        timing.enable()
+        ctx.call_on_close(timing.report)
+        with timing.phase("import handlers"):
+            import dbt_switch.config.input_handler  # noqa: F401
+
     if project:
+        from dbt_switch.utils.logger import logger
+        from dbt_switch.config.input_handler import switch_user_config
+
         try:
             switch_user_config(project)
         except Exception as e:
@@ -37,6 +69,8 @@ def cli(ctx, project):
 @cli.command()
 def init():
     """Initialize ~/.dbt/dbt_switch.yml"""
+    from dbt_switch.config.file_handler import init_config
+
     init_config()
 
 
@@ -46,18 +80,282 @@ def init():
 @click.option("--project-id", type=int, help="dbt project ID")
 def add(project_name, host, project_id):
     """Add a new project host and project_id"""
+    from dbt_switch.config.input_handler import add_user_config
+
     add_user_config("add", project_name, host, project_id)
 
 
 @cli.command("list")
-def list_projects_cmd():
+@click.option("--recent", is_flag=True, help="List recently used projects first")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "json", "jsonl", "tsv"]),
+    default="text",
+    show_default=True,
+    help="Output format; json, jsonl and tsv are meant for scripts",
+)
+@click.option("--host", help="Only list projects on this host")
+@click.option(
+    "--match",
+    metavar="PATTERN",
+    help="Only list projects whose name matches this glob (or starts with it)",
+)
+@click.option(
+    "--limit", type=click.IntRange(min=1), help="List at most this many projects"
+)
+def list_projects_cmd(recent, output_format, host, match, limit):
     """List all available projects"""
-    list_projects()
+    from dbt_switch.config.input_handler import list_projects
+
+    list_projects(recent, output_format, host, match, limit)
+
+
+@cli.command()
+@click.option(
+    "-n",
+    "--limit",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of projects to show",
+)
+def history(limit):
+    """Show the most recently used projects"""
+    from dbt_switch.config.input_handler import show_history
+
+    show_history(limit)
+
+
+@cli.command()
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["name", "host", "id"]),
+    default="name",
+    show_default=True,
+    help="What to print about the active project",
+)
+@click.pass_context
+def current(ctx, fmt):
+    """Print the active project (fast enough for a shell prompt)"""
+    from dbt_switch.config.input_handler import show_current_project
+
+    if not show_current_project(fmt):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument("project", required=False)
+@click.option(
+    "--shell",
+    type=click.Choice(["sh", "fish"]),
+    help="Statement syntax (default: fish if $SHELL is fish, otherwise sh)",
+)
+@click.option("--unset", is_flag=True, help="Print statements that clear the variables")
+@click.pass_context
+def env(ctx, project, shell, unset):
+    """Print export statements that switch only the current shell"""
+    from dbt_switch.utils.logger import logging_to_stderr
+    from dbt_switch.utils.shell import detect_shell
+    from dbt_switch.config.input_handler import print_project_env
+
+    # stdout is meant for `eval`, so keep messages out of it
+    with logging_to_stderr():
+        ok = print_project_env(project, shell or detect_shell(), unset)
+    if not ok:
+        ctx.exit(1)
+
+
+@cli.command()
+@click.pass_context
+def auto(ctx):
+    """Switch to the project of the nearest dbt_project.yml or .dbt-switch"""
+    from dbt_switch.config.input_handler import auto_switch_user_config
+
+    if not auto_switch_user_config():
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument("shell", type=click.Choice(["bash", "zsh", "fish"]))
+def hook(shell):
+    """Print a shell hook that runs `dbt-switch auto` on every cd"""
+    from dbt_switch.utils.shell import format_hook
+
+    click.echo(format_hook(shell), nl=False)
+
+
+@cli.command()
+@click.argument("shell", type=click.Choice(["bash", "zsh", "fish"]), required=False)
+@click.option("--refresh", is_flag=True, hidden=True)
+@click.pass_context
+def completion(ctx, shell, refresh):
+    """Print a tab completion script for project names and subcommands"""
+    from dbt_switch.config import file_handler
+
+    if refresh:
+        # Called by the completion scripts when dbt_switch.yml or a fragment changed
+        file_handler.refresh_completions()
+        return
+    if shell is None:
+        click.echo("Usage: dbt-switch completion bash|zsh|fish")
+        ctx.exit(1)
+
+    from dbt_switch.config.cache import completions_path
+    from dbt_switch.config.fragments import fragment_dir
+    from dbt_switch.config.history import recent_path
+    from dbt_switch.utils.shell import format_completion
+
+    script = format_completion(
+        shell,
+        cli.commands,
+        file_handler.CONFIG_FILE,
+        fragment_dir(file_handler.CONFIG_FILE),
+        completions_path(file_handler.CONFIG_FILE),
+        recent_path(file_handler.CONFIG_FILE),
+    )
+    click.echo(script, nl=False)
+
+
+@cli.command("import")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "json", "jsonl", "yaml"]),
+    help="Input format (default: detected from the file extension)",
+)
+@click.option(
+    "--on-conflict",
+    type=click.Choice(["skip", "replace", "fail"]),
+    default="fail",
+    show_default=True,
+    help="What to do when a project name or ID already exists",
+)
+@click.pass_context
+def import_cmd(ctx, file, fmt, on_conflict):
+    """Bulk import projects from a CSV, JSON, JSON Lines or YAML file"""
+    from dbt_switch.config.input_handler import import_user_config
+
+    if not import_user_config(file, fmt, on_conflict):
+        ctx.exit(1)
+
+
+@cli.command("sync-from-cloud")
+@click.pass_context
+def sync_from_cloud_cmd(ctx):
+    """Create or refresh projects from the dbt_cloud.yml projects list"""
+    from dbt_switch.config.input_handler import sync_user_config
+
+    if not sync_user_config():
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument(
+    "files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="File to write (default: ~/.dbt/dbt_cloud.yml, kept and extended)",
+)
+@click.pass_context
+def merge(ctx, files, output):
+    """Merge downloaded dbt_cloud.yml files into one"""
+    from dbt_switch.config import cloud_handler
+    from dbt_switch.config.input_handler import merge_user_config
+
+    if not merge_user_config(list(files), output or cloud_handler.DBT_CLOUD_FILE):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--timeout",
+    type=float,
+    default=10.0,
+    show_default=True,
+    help="Seconds allowed per API request",
+)
+@click.pass_context
+def discover(ctx, timeout):
+    """Add every project your dbt_cloud.yml tokens can access"""
+    from dbt_switch.config.input_handler import discover_user_config
+
+    if not discover_user_config(timeout):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.option("--probe", is_flag=True, help="Also check that every host is reachable")
+@click.option(
+    "--timeout",
+    type=float,
+    default=5.0,
+    show_default=True,
+    help="Seconds allowed per host when probing",
+)
+@click.pass_context
+def doctor(ctx, probe, timeout):
+    """Check every project against dbt_cloud.yml and report all problems"""
+    from dbt_switch.config.input_handler import doctor_user_config
+
+    if not doctor_user_config(probe, timeout):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument("file", required=False, type=click.Path(dir_okay=False))
+@click.pass_context
+def validate(ctx, file):
+    """Check dbt_switch.yml (or FILE) and report every problem with its line"""
+    from dbt_switch.config.input_handler import validate_user_config
+
+    if not validate_user_config(file):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_file",
+    type=click.Path(dir_okay=False),
+    help="Socket path (default: $DBT_SWITCH_SOCKET or ~/.dbt/.dbt_switch.sock)",
+)
+@click.option("--stop", is_flag=True, help="Stop a running daemon")
+@click.pass_context
+def serve(ctx, socket_file, stop):
+    """Run a resident daemon that answers switch and list requests"""
+    from dbt_switch.utils.logger import logger
+
+    if stop:
+        from dbt_switch.daemon.client import request
+
+        try:
+            request({"op": "shutdown"}, socket_file)
+        except OSError:
+            logger.error("No dbt-switch daemon is running")
+            ctx.exit(1)
+        logger.info("Stopped the dbt-switch daemon")
+        return
+
+    from dbt_switch.daemon.server import serve as run_server
+
+    try:
+        run_server(socket_file)
+    except (RuntimeError, OSError) as e:
+        logger.error(f"Could not start the daemon: {e}")
+        ctx.exit(1)
 
 
 @cli.command()
 def delete():
     """Delete a project entry"""
+    from dbt_switch.config.input_handler import delete_user_config
+
     delete_user_config("delete")
 
 
@@ -67,7 +365,14 @@ def delete():
 @click.option("--project-id", type=int, help="Update dbt project ID")
 def update(project_name, host, project_id):
     """Update project host or project_id"""
+    from dbt_switch.utils.logger import logger
+
     if project_name:
+        from dbt_switch.config.input_handler import (
+            update_user_config_interactive,
+            update_user_config_non_interactive,
+        )
+
         if host or project_id:
             # Non-interactive mode: update specified parameters
             update_user_config_non_interactive(project_name, host, project_id)
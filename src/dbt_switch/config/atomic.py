@@ -0,0 +1,120 @@
+"""
+Crash- and concurrency-safe writes for the config files.
+
+Every write goes to a temporary file in the target's directory, is fsynced
+and then renamed over the target, so readers only ever see the old or the
+new file. Read-modify-write cycles additionally hold an advisory `fcntl`
+lock on a hidden sidecar `.<name>.lock` file, because the rename replaces
+the target's inode and a lock on the target itself would not be shared.
+A target that is a symlink (a dotfiles checkout, say) is resolved first, so
+the link is kept and the file it points to is the one replaced and locked.
+"""
+
+import contextlib
+import os
+import stat
+import tempfile
+import time
+from pathlib import Path
+
+from dbt_switch.utils.timing import phase
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
+
+LOCK_TIMEOUT = 10.0
+_LOCK_POLL_INTERVAL = 0.01
+
+
+def lock_path_for(path: Path) -> Path:
+    """
+    Location of the sidecar lock file for a config file.
+    Args:
+        path: Config file being protected
+    Returns:
+        Path: `<dir>/.<name>.lock`
+    """
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextlib.contextmanager
+def file_lock(path: Path, timeout: float = LOCK_TIMEOUT):
+    """
+    Hold an exclusive advisory lock for a config file.
+    Locks are not re-entrant: do not nest two locks on the same path.
+    Without fcntl (Windows) or a parent directory, this is a no-op.
+    Args:
+        path: Config file being protected (a symlink locks its target)
+        timeout: Seconds to wait for the lock
+    Raises:
+        TimeoutError: If another process holds the lock for longer than timeout
+    """
+    # Lock the same file atomic_write replaces
+    path = Path(os.path.realpath(path))
+    if fcntl is None or not path.parent.is_dir():
+        # Nothing to serialize against until the directory exists
+        yield
+        return
+
+    fd = os.open(lock_path_for(path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        with phase(f"acquire lock {path.name}"):
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(
+                            f"Timed out after {timeout:g}s waiting for the lock on {path}"
+                        )
+                    time.sleep(_LOCK_POLL_INTERVAL)
+        yield
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename by syncing its directory where the OS allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_write(path: Path, newline: str | None = None):
+    """
+    Yield a text file whose contents replace `path` atomically on success.
+    The existing file's permissions are kept; new files are created 0600.
+    If the block raises, the target is left untouched.
+    Args:
+        path: File to replace; a symlink is kept and its target replaced
+        newline: Passed to open(); use "" to write line endings verbatim
+    """
+    path = Path(os.path.realpath(path))
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", newline=newline) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        with contextlib.suppress(FileNotFoundError):
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    _fsync_directory(path.parent)
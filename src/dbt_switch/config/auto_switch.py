@@ -0,0 +1,246 @@
+"""
+Directory lookup for `dbt-switch auto`.
+
+Walking up from the working directory, the nearest `.dbt-switch` marker or
+`dbt_project.yml` decides the project: a marker holds a project name or ID
+on its first line, and a dbt_project.yml is read for
+`dbt-cloud: project-id:`. The answer for each directory is memoized in
+`.dbt_switch_cache/auto.json` together with the stat keys of every
+directory walked, the file found and dbt_switch.yml. Creating or removing a
+marker changes a directory's mtime, so a memoized answer stays valid
+exactly as long as those keys match.
+
+Only the standard library (plus the stdlib-only cache helpers, context
+editor and host normalization) is imported here, so a `cd` hook that lands
+in an already-active project never loads click, pydantic or YAML.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from dbt_switch.config.cache import (
+    CACHE_DIR_NAME,
+    is_settled,
+    stat_key,
+    write_cache_file,
+)
+from dbt_switch.config.context_editor import read_context
+from dbt_switch.config.current import DBT_DIR
+from dbt_switch.config.fragments import sources_key
+from dbt_switch.validation.hosts import normalize_host
+
+MARKER_FILE = ".dbt-switch"
+DBT_PROJECT_FILE = "dbt_project.yml"
+AUTO_CACHE_NAME = "auto.json"
+# Directories remembered per dbt_cloud.yml; the oldest are dropped first
+MAX_ENTRIES = 512
+
+_DBT_CLOUD_HEADER = re.compile(r"^dbt-cloud:[ \t]*(?:#.*)?$", re.MULTILINE)
+_PROJECT_ID_LINE = re.compile(
+    r"^[ \t]+project-id:[ \t]*(?P<q>['\"]?)(?P<id>\d+)(?P=q)[ \t]*(?:#.*)?$"
+)
+
+
+def auto_cache_path(cloud_file: Path) -> Path:
+    """
+    Location of the memoized directory answers for a dbt_cloud.yml file.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+    Returns:
+        Path: `<dir>/.dbt_switch_cache/auto.json`
+    """
+    return cloud_file.parent / CACHE_DIR_NAME / AUTO_CACHE_NAME
+
+
+def _dbt_project_id(text: str) -> str | None:
+    """Find `dbt-cloud: project-id:` by scanning lines, parsing YAML only if unusual."""
+    header = _DBT_CLOUD_HEADER.search(text)
+    if header is not None:
+        for line in text[header.end() :].splitlines()[1:]:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if not line[0].isspace():
+                break
+            match = _PROJECT_ID_LINE.match(line)
+            if match:
+                return match.group("id")
+    if "dbt-cloud" not in text:
+        return None
+
+    # Flow mappings, anchors and the like: let the YAML parser decide
+    from dbt_switch.config.yaml_io import load_yaml
+
+    try:
+        data = load_yaml(text)
+        project_id = data["dbt-cloud"]["project-id"]
+    except Exception:
+        return None
+    return str(project_id) if project_id is not None else None
+
+
+def read_project_ref(path: Path) -> str | None:
+    """
+    Read the project reference from a marker or dbt_project.yml.
+    Args:
+        path: A `.dbt-switch` marker or a `dbt_project.yml`
+    Returns:
+        str | None: Project name or ID, or None if the file names no project
+    """
+    try:
+        text = path.read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if path.name != MARKER_FILE:
+        return _dbt_project_id(text)
+    for line in text.splitlines():
+        ref = line.split("#", 1)[0].strip()
+        if ref:
+            return ref
+    return None
+
+
+def locate_project(start: Path) -> dict:
+    """
+    Walk up from start to the nearest marker or dbt_project.yml.
+    In each directory a `.dbt-switch` marker wins over dbt_project.yml.
+    Args:
+        start: Absolute directory to start from
+    Returns:
+        dict: "dirs" ([path, stat key] per directory walked), "file" and
+        "file_key" of the file found (or None), and its project "ref"
+    """
+    dirs = []
+    directory = start
+    while True:
+        dirs.append([str(directory), stat_key(directory)])
+        for name in (MARKER_FILE, DBT_PROJECT_FILE):
+            candidate = directory / name
+            if candidate.is_file():
+                return {
+                    "dirs": dirs,
+                    "file": str(candidate),
+                    "file_key": stat_key(candidate),
+                    "ref": read_project_ref(candidate),
+                }
+        if directory.parent == directory:
+            return {"dirs": dirs, "file": None, "file_key": None, "ref": None}
+        directory = directory.parent
+
+
+def load_entries(cloud_file: Path) -> dict:
+    """
+    Read the memoized directory answers.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+    Returns:
+        dict: Directory path to entry; empty if missing or unreadable
+    """
+    try:
+        with open(auto_cache_path(cloud_file), "r") as file:
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def store_entry(cloud_file: Path, entries: dict, directory: str, entry: dict) -> None:
+    """
+    Remember the answer for a directory, dropping the oldest entries
+    beyond MAX_ENTRIES.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+        entries: Entries as returned by load_entries()
+        directory: Directory the answer is for
+        entry: Answer from locate_project() plus the resolved profile
+    """
+    entries.pop(directory, None)
+    entries[directory] = entry
+    while len(entries) > MAX_ENTRIES:
+        del entries[next(iter(entries))]
+    write_cache_file(auto_cache_path(cloud_file), entries)
+
+
+def _key_matches(key, path) -> bool:
+    return key is not None and is_settled(key) and stat_key(path) == key
+
+
+def entry_is_fresh(entry, switch_file: Path) -> bool:
+    """
+    Whether a memoized answer still holds: every directory walked, the file
+    found and dbt_switch.yml (with its fragments) are unchanged and outside
+    the racy window.
+    Args:
+        entry: Entry from load_entries()
+        switch_file: Path to dbt_switch.yml
+    Returns:
+        bool: True if the entry can be used as is
+    """
+    try:
+        if entry["file"] is not None and not _key_matches(
+            entry["file_key"], entry["file"]
+        ):
+            return False
+        switch_key = entry["switch_key"]
+        if entry["ref"] is not None and not (
+            switch_key is not None
+            and is_settled(switch_key)
+            and sources_key(switch_file) == switch_key
+        ):
+            return False
+        return all(_key_matches(key, path) for path, key in entry["dirs"])
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def context_matches(cloud_file: Path, host: str, project_id) -> bool:
+    """
+    Whether dbt_cloud.yml already points at host and project_id.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+        host: Host of the wanted profile
+        project_id: Project ID of the wanted profile
+    Returns:
+        bool: False if they differ or the context cannot be read cheaply
+    """
+    try:
+        with open(cloud_file, "r", newline="") as file:
+            context = read_context(file.read())
+    except OSError:
+        return False
+    return (
+        context is not None
+        and context["active-project"] == str(project_id)
+        and normalize_host(context["active-host"]) == normalize_host(host)
+    )
+
+
+def fast_auto(argv: list[str]) -> int | None:
+    """
+    Finish `dbt-switch auto` without loading the handlers when the memoized
+    answer for the working directory is no project, or the project that is
+    already active.
+    Args:
+        argv: Arguments after the program name
+    Returns:
+        int | None: Exit code, or None if the caller should run the full command
+    """
+    if argv != ["auto"]:
+        return None
+    try:
+        directory = os.getcwd()
+    except OSError:
+        return None
+    cloud_file = DBT_DIR / "dbt_cloud.yml"
+    entry = load_entries(cloud_file).get(directory)
+    if entry is None or not entry_is_fresh(entry, DBT_DIR / "dbt_switch.yml"):
+        return None
+    if entry["ref"] is None:
+        return 0
+    if entry.get("name") and context_matches(
+        cloud_file, entry["host"], entry["project_id"]
+    ):
+        return 0
+    return None
@@ -0,0 +1,344 @@
+"""
+Persistent parse cache for dbt_switch.yml and dbt_cloud.yml.
+
+Each config file gets a compact JSON snapshot of its already-validated
+contents in a `.dbt_switch_cache/` directory next to it (so
+`~/.dbt/.dbt_switch_cache/` for the default locations). Snapshots are keyed
+on the file's (st_mtime_ns, st_size, st_ino) and also record a hash of the
+exact bytes that were validated. When the key still matches, callers
+rebuild the configs without YAML parsing or validation; when only the hash
+matches (the file was touched, restored or rewritten unchanged, or was too
+recently modified for its stat to be trusted) the file is hashed instead of
+parsed and the entry is re-keyed. Any other mismatch, unreadable or
+malformed snapshot is a miss and the caller falls back to the normal parse
+path.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dbt_switch.validation.schemas import DbtCloudConfig, DbtSwitchConfig
+
+# The snapshot converters import the schemas (and so pydantic) when called,
+# keeping the stat helpers here usable from the stdlib-only `current` path.
+
+CACHE_DIR_NAME = ".dbt_switch_cache"
+CACHE_FORMAT = 2
+# Snapshots of dbt_cloud.yml contain its tokens; see write_cache_text
+CACHE_DIR_MODE = 0o700
+# Profile names, one per line, read directly by the shell completion scripts
+COMPLETIONS_FILE_NAME = "completions.txt"
+
+# Files modified this close to "now" are not snapshotted: a second write
+# within the filesystem's timestamp granularity could keep the same key.
+RACY_WINDOW_NS = 2_000_000_000
+
+_CLOUD_ITEM_FIELDS = (
+    "project_name",
+    "project_id",
+    "account_name",
+    "account_id",
+    "account_host",
+    "token_name",
+    "token_value",
+)
+
+
+def cache_path_for(path: Path, kind: str | None = None) -> Path:
+    """
+    Location of the snapshot for a config file.
+    Args:
+        path: Config file the snapshot belongs to
+        kind: Name of a secondary snapshot derived from the same file
+    Returns:
+        Path: `<dir>/.dbt_switch_cache/<name>.json`, or `<name>.<kind>.json`
+    """
+    suffix = f".{kind}.json" if kind else ".json"
+    return path.parent / CACHE_DIR_NAME / f"{path.name}{suffix}"
+
+
+def stat_key(path: Path) -> list[int] | None:
+    """
+    Build the cache key for a file from its stat.
+    Args:
+        path: File to stat
+    Returns:
+        list[int] | None: [st_mtime_ns, st_size, st_ino] or None if missing
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash of a config file's bytes, recorded with its snapshot.
+    Args:
+        data: File contents
+    Returns:
+        str: Hex digest
+    """
+    import hashlib
+
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_hash(path: Path) -> str | None:
+    """
+    Hash of a file's current contents.
+    Args:
+        path: File to read
+    Returns:
+        str | None: Hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(path, "rb") as file:
+            return content_hash(file.read())
+    except OSError:
+        return None
+
+
+def load_snapshot(
+    path: Path, key: list[int] | None, kind: str | None = None
+) -> dict | None:
+    """
+    Return the cached snapshot for a file if it matches the given key, or
+    failing that if the file's contents still hash to the recorded value.
+    Args:
+        path: Config file the snapshot belongs to
+        key: Stat key taken before the caller would read the file
+        kind: Name of a secondary snapshot (see cache_path_for)
+    Returns:
+        dict | None: Snapshot data, or None on any kind of miss
+    """
+    if key is None:
+        return None
+    try:
+        with open(cache_path_for(path, kind), "r") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get("format") != CACHE_FORMAT:
+        return None
+    data = entry.get("data")
+    if not isinstance(data, dict):
+        return None
+    if entry.get("key") == key:
+        return data
+
+    digest = entry.get("hash")
+    if not isinstance(digest, str) or file_hash(path) != digest:
+        return None
+    # Same contents under a new stat: re-key the entry so the next read is a
+    # stat comparison again, unless the file moved on while it was hashed
+    if is_settled(key) and stat_key(path) == key:
+        entry["key"] = key
+        write_cache_file(cache_path_for(path, kind), entry)
+    return data
+
+
+def is_settled(key: list[int] | None) -> bool:
+    """
+    Whether a stat key can be trusted to change on the next write.
+    A file modified within RACY_WINDOW_NS may be rewritten within the same
+    timestamp tick with the same size, which a stat comparison cannot see.
+    Args:
+        key: Stat key from stat_key()
+    Returns:
+        bool: True if the file was last modified outside the racy window
+    """
+    return key is not None and time.time_ns() - key[0] >= RACY_WINDOW_NS
+
+
+def store_snapshot(
+    path: Path,
+    key: list[int] | None,
+    data: dict,
+    kind: str | None = None,
+    digest: str | None = None,
+) -> None:
+    """
+    Persist a snapshot for a file. Failures are ignored: the cache is
+    an optimization and never a source of truth.
+    Args:
+        path: Config file the snapshot belongs to
+        key: Stat key taken before the file was read
+        data: Snapshot produced by one of the *_to_snapshot helpers
+        kind: Name of a secondary snapshot (see cache_path_for)
+        digest: content_hash() of the bytes the snapshot was built from. A
+          file inside the racy window is then stored without a stat key and
+          can only be matched by its hash
+    """
+    settled = is_settled(key)
+    if not settled and digest is None:
+        return
+
+    entry = {"format": CACHE_FORMAT, "key": key if settled else None, "data": data}
+    if digest is not None:
+        entry["hash"] = digest
+    write_cache_file(cache_path_for(path, kind), entry)
+
+
+def write_cache_file(target: Path, payload) -> None:
+    """
+    Atomically replace a JSON file in the cache directory, creating the
+    directory if needed. Failures are ignored.
+    Args:
+        target: File to write
+        payload: JSON-serializable data
+    """
+    write_cache_text(target, json.dumps(payload, separators=(",", ":")))
+
+
+def write_cache_text(target: Path, text: str) -> None:
+    """
+    Atomically replace a text file in the cache directory, creating the
+    directory if needed. Failures are ignored.
+    The directory is created 0700 and files 0600 whatever the umask:
+    dbt_cloud.yml snapshots hold its API tokens.
+    Args:
+        target: File to write
+        text: New contents
+    """
+    tmp = None
+    try:
+        target.parent.mkdir(mode=CACHE_DIR_MODE, exist_ok=True)
+        # mkstemp creates the file 0600
+        fd, tmp = tempfile.mkstemp(
+            dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as file:
+            file.write(text)
+        os.replace(tmp, target)
+    except OSError:
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+
+
+def completions_path(path: Path) -> Path:
+    """
+    Location of the profile names read by the shell completion scripts.
+    Args:
+        path: Path to dbt_switch.yml
+    Returns:
+        Path: `<dir>/.dbt_switch_cache/completions.txt`
+    """
+    return path.parent / CACHE_DIR_NAME / COMPLETIONS_FILE_NAME
+
+
+def write_completions(path: Path, names) -> None:
+    """
+    Replace the completion names for a dbt_switch.yml file. Failures are
+    ignored; the completion scripts refresh the file when it is missing or
+    older than dbt_switch.yml.
+    Args:
+        path: Path to dbt_switch.yml
+        names: Profile names
+    """
+    write_cache_text(completions_path(path), "".join(f"{name}\n" for name in names))
+
+
+def switch_config_to_snapshot(config: "DbtSwitchConfig") -> dict:
+    """Compact snapshot of a validated DbtSwitchConfig."""
+    return {
+        "profiles": {
+            name: [project.host, project.project_id]
+            for name, project in config.profiles.items()
+        }
+    }
+
+
+def switch_config_from_snapshot(
+    data: dict, read_only: bool = False
+) -> "DbtSwitchConfig | None":
+    """
+    Rebuild a DbtSwitchConfig from a snapshot without running validators.
+    Args:
+        data: Snapshot from switch_config_to_snapshot
+        read_only: Hold the profiles as ProjectRecord instead of ProjectConfig
+    Returns:
+        DbtSwitchConfig | None: None if the snapshot is malformed
+    """
+    from dbt_switch.validation.records import ProjectRecord
+    from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+    try:
+        if read_only:
+            profiles = {
+                name: ProjectRecord(host, project_id)
+                for name, (host, project_id) in data["profiles"].items()
+            }
+        else:
+            profiles = {
+                name: ProjectConfig.model_construct(host=host, project_id=project_id)
+                for name, (host, project_id) in data["profiles"].items()
+            }
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return DbtSwitchConfig.model_construct(profiles=profiles)
+
+
+def cloud_config_to_snapshot(config: "DbtCloudConfig") -> dict:
+    """Compact snapshot of a validated DbtCloudConfig."""
+    return {
+        "version": config.version,
+        "context": [config.context.active_host, config.context.active_project],
+        "projects": [
+            [getattr(item, field) for field in _CLOUD_ITEM_FIELDS]
+            for item in config.projects
+        ],
+    }
+
+
+def cloud_config_from_snapshot(
+    data: dict, read_only: bool = False
+) -> "DbtCloudConfig | None":
+    """
+    Rebuild a DbtCloudConfig from a snapshot without running validators.
+    Args:
+        data: Snapshot from cloud_config_to_snapshot
+        read_only: Hold the projects as CloudProjectRecord instead of
+          DbtCloudProjectItem
+    Returns:
+        DbtCloudConfig | None: None if the snapshot is malformed
+    """
+    from dbt_switch.validation.records import CloudProjectRecord
+    from dbt_switch.validation.schemas import (
+        DbtCloudConfig,
+        DbtCloudContext,
+        DbtCloudProjectItem,
+    )
+
+    try:
+        active_host, active_project = data["context"]
+        projects = []
+        for values in data["projects"]:
+            if len(values) != len(_CLOUD_ITEM_FIELDS):
+                return None
+            if read_only:
+                projects.append(CloudProjectRecord(*values))
+            else:
+                projects.append(
+                    DbtCloudProjectItem.model_construct(
+                        **dict(zip(_CLOUD_ITEM_FIELDS, values))
+                    )
+                )
+        return DbtCloudConfig.model_construct(
+            version=data["version"],
+            context=DbtCloudContext.model_construct(
+                active_host=active_host, active_project=active_project
+            ),
+            projects=projects,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,325 @@
+"""
+Minimal dbt Cloud Administrative API client for `dbt-switch discover`.
+
+Every distinct (account host, account ID) in dbt_cloud.yml is queried with
+the token already stored for it: the account itself and its paginated
+projects list. Requests run on a bounded thread pool and share a pool of
+keep-alive connections per host. Connection errors, 429 and 5xx responses
+are retried with exponential backoff (or the server's Retry-After), and
+responses that carried an ETag are kept in `.dbt_switch_cache/discover.json`
+so that an unchanged page costs a 304 on the next run.
+
+Only the standard library is used; http.client loads ssl, so callers import
+this module when they need it.
+"""
+
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from dbt_switch.config.cache import CACHE_DIR_NAME, write_cache_file
+
+ETAG_CACHE_NAME = "discover.json"
+PAGE_SIZE = 100
+TIMEOUT = 10.0
+RETRIES = 3
+BACKOFF = 0.5
+# Longest Retry-After honoured, in seconds
+MAX_RETRY_AFTER = 30.0
+WORKERS = 8
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def etag_cache_path(cloud_file: Path) -> Path:
+    """
+    Location of the cached API responses for a dbt_cloud.yml file.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+    Returns:
+        Path: `<dir>/.dbt_switch_cache/discover.json`
+    """
+    return cloud_file.parent / CACHE_DIR_NAME / ETAG_CACHE_NAME
+
+
+def load_etags(cloud_file: Path) -> dict:
+    """
+    Read the cached API responses.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+    Returns:
+        dict: URL to {"etag", "body"}; empty if missing or unreadable
+    """
+    try:
+        with open(etag_cache_path(cloud_file), "r") as file:
+            etags = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return etags if isinstance(etags, dict) else {}
+
+
+def store_etags(cloud_file: Path, etags: dict) -> None:
+    """
+    Persist the cached API responses. Failures are ignored.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+        etags: URL to {"etag", "body"}
+    """
+    write_cache_file(etag_cache_path(cloud_file), etags)
+
+
+def api_base(host: str) -> str:
+    """
+    Base URL of the API for an account host.
+    Args:
+        host: account-host from dbt_cloud.yml; https unless it has a scheme
+    Returns:
+        str: "scheme://host[:port]"
+    """
+    host = host.strip().rstrip("/")
+    if "://" not in host:
+        host = f"https://{host}"
+    parts = urlsplit(host)
+    return f"{parts.scheme.lower()}://{parts.netloc}"
+
+
+def _retry_after(response) -> float | None:
+    value = response.getheader("Retry-After")
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
+
+
+class ApiClient:
+    """
+    Thread-safe JSON GET client with pooled keep-alive connections,
+    retries and ETag revalidation.
+    """
+
+    def __init__(
+        self,
+        timeout: float = TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        etags: dict | None = None,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.etags = etags if etags is not None else {}
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, origin: tuple[str, str]) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                return idle.pop()
+        scheme, netloc = origin
+        if scheme == "http":
+            return http.client.HTTPConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+
+    def _release(self, origin: tuple[str, str], connection) -> None:
+        with self._lock:
+            self._idle.setdefault(origin, []).append(connection)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def get_json(self, url: str, token: str):
+        """
+        GET a JSON document, revalidating a cached copy by its ETag.
+        Args:
+            url: Absolute URL
+            token: dbt Cloud API token
+        Returns:
+            The decoded JSON body
+        Raises:
+            ValueError: If the request fails or keeps failing after retries
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        headers = {"Authorization": f"Token {token}", "Accept": "application/json"}
+        with self._lock:
+            cached = self.etags.get(url)
+        if isinstance(cached, dict) and "etag" in cached:
+            headers["If-None-Match"] = cached["etag"]
+        else:
+            cached = None
+
+        for attempt in range(self.retries + 1):
+            delay = None
+            connection = self._acquire(origin)
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                error = str(e) or type(e).__name__
+            else:
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._release(origin, connection)
+                if response.status == 304 and cached is not None:
+                    return cached["body"]
+                if 200 <= response.status < 300:
+                    try:
+                        data = json.loads(body)
+                    except ValueError as e:
+                        raise ValueError(f"{url}: invalid JSON response: {e}")
+                    etag = response.getheader("ETag")
+                    if etag:
+                        with self._lock:
+                            self.etags[url] = {"etag": etag, "body": data}
+                    return data
+                error = f"HTTP {response.status} {response.reason}".strip()
+                if response.status not in _RETRY_STATUSES:
+                    raise ValueError(f"{url}: {error}")
+                delay = _retry_after(response)
+            if attempt < self.retries:
+                time.sleep(delay if delay is not None else self.backoff * 2**attempt)
+        raise ValueError(f"{url}: {error} (after {self.retries + 1} attempts)")
+
+
+def _projects_url(base: str, account_id: str, offset: int) -> str:
+    query = urlencode({"limit": PAGE_SIZE, "offset": offset})
+    return f"{base}/api/v2/accounts/{account_id}/projects/?{query}"
+
+
+def _page(document) -> tuple[list, int | None]:
+    """Projects and total count of one page of the projects list."""
+    if not isinstance(document, dict) or not isinstance(document.get("data"), list):
+        raise ValueError("unexpected projects response")
+    pagination = (document.get("extra") or {}).get("pagination") or {}
+    total = pagination.get("total_count")
+    return document["data"], total if isinstance(total, int) else None
+
+
+def discover_accounts(
+    accounts: list[dict], client: ApiClient, workers: int = WORKERS
+) -> tuple[list[dict], list[str]]:
+    """
+    List the projects of every account.
+    The account details and first projects page of every account are
+    fetched together; the remaining pages, known from the first page's
+    total count, are then fetched together across all accounts.
+    Args:
+        accounts: {"host", "account_id", "token_name", "token_value",
+            "account_name"} per account
+        client: API client
+        workers: Maximum concurrent requests
+    Returns:
+        tuple[list[dict], list[str]]: dbt_cloud.yml project entries (with
+        hyphenated keys) for every account that answered, and one error
+        message per account that did not
+    """
+    if not accounts:
+        return [], []
+    bases = [api_base(account["host"]) for account in accounts]
+    errors = {}
+
+    def call(index: int, url: str):
+        try:
+            return client.get_json(url, accounts[index]["token_value"])
+        except ValueError as e:
+            errors.setdefault(index, str(e))
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        first = [
+            (
+                pool.submit(
+                    call, i, f"{base}/api/v2/accounts/{accounts[i]['account_id']}/"
+                ),
+                pool.submit(call, i, _projects_url(base, accounts[i]["account_id"], 0)),
+            )
+            for i, base in enumerate(bases)
+        ]
+
+        names, projects, rest = {}, {}, []
+        for i, (account_future, page_future) in enumerate(first):
+            account = account_future.result()
+            page = page_future.result()
+            if i in errors:
+                continue
+            try:
+                data, total = _page(page)
+            except ValueError as e:
+                errors[i] = f"{bases[i]}: {e}"
+                continue
+            detail = account.get("data") if isinstance(account, dict) else None
+            name = detail.get("name") if isinstance(detail, dict) else None
+            names[i] = name or accounts[i]["account_name"]
+            projects[i] = list(data)
+            if total is not None:
+                rest.extend(
+                    (i, offset) for offset in range(len(data), total, PAGE_SIZE)
+                )
+            elif len(data) >= PAGE_SIZE:
+                # No total count: walk this account's pages one by one
+                rest.append((i, None))
+
+        def fetch_rest(job):
+            i, offset = job
+            if offset is not None:
+                return _page(
+                    call(i, _projects_url(bases[i], accounts[i]["account_id"], offset))
+                )[0]
+            pages, offset = [], len(projects[i])
+            while True:
+                data, _ = _page(
+                    call(i, _projects_url(bases[i], accounts[i]["account_id"], offset))
+                )
+                pages.extend(data)
+                offset += len(data)
+                if len(data) < PAGE_SIZE:
+                    return pages
+
+        futures = [(job[0], pool.submit(fetch_rest, job)) for job in rest]
+        for i, future in futures:
+            try:
+                data = future.result()
+            except ValueError as e:
+                errors.setdefault(i, f"{bases[i]}: {e}")
+                continue
+            if i not in errors:
+                projects[i].extend(data)
+
+    entries = []
+    for i, data in projects.items():
+        if i in errors:
+            continue
+        account = accounts[i]
+        for project in data:
+            if not isinstance(project, dict) or project.get("id") is None:
+                continue
+            entries.append(
+                {
+                    "project-name": str(project.get("name") or project["id"]),
+                    "project-id": str(project["id"]),
+                    "account-name": names[i],
+                    "account-id": str(account["account_id"]),
+                    "account-host": account["host"],
+                    "token-name": account["token_name"],
+                    "token-value": account["token_value"],
+                }
+            )
+    messages = [
+        f"account {accounts[i]['account_id']} on {accounts[i]['host']}: {error}"
+        for i, error in sorted(errors.items())
+    ]
+    return entries, messages
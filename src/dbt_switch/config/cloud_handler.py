@@ -3,21 +3,50 @@ File handler for the dbt_cloud.yml file. This includes operations to read and
 modify the dbt_cloud.yml file for switching active host and project.
 """
 
-import yaml
 from pathlib import Path
 from pydantic import ValidationError
 
 from dbt_switch.utils.logger import logger
-from dbt_switch.config.file_handler import get_project_config
-from dbt_switch.validation.schemas import DbtCloudConfig
+from dbt_switch.utils.timing import phase
+from dbt_switch.config.yaml_io import load_yaml, dump_yaml
+from dbt_switch.config.atomic import atomic_write, file_lock
+from dbt_switch.config.cache import (
+    content_hash,
+    stat_key,
+    load_snapshot,
+    store_snapshot,
+    cloud_config_to_snapshot,
+    cloud_config_from_snapshot,
+)
+from dbt_switch.config import file_handler
+from dbt_switch.config.fragments import sources_key
+from dbt_switch.config.file_handler import resolve_project, sync_cloud_projects
+from dbt_switch.config.auto_switch import (
+    context_matches,
+    entry_is_fresh,
+    load_entries,
+    locate_project,
+    store_entry,
+)
+from dbt_switch.config.current import env_current, read_current, record_current
+from dbt_switch.config.history import PREVIOUS, previous_project, record_switch
+from dbt_switch.validation.hosts import normalize_host
+from dbt_switch.config.context_editor import patch_context, read_context
+from dbt_switch.validation.schemas import DbtCloudConfig, DbtCloudProjectItem
 
 
 DBT_CLOUD_FILE = Path.home() / ".dbt" / "dbt_cloud.yml"
 
 
-def read_dbt_cloud_config() -> DbtCloudConfig | None:
+def read_dbt_cloud_config(read_only: bool = False) -> DbtCloudConfig | None:
     """
     Read and parse the dbt_cloud.yml file.
+    Served from the parse cache when the file is unchanged (same stat, or
+    same content hash) since the last validated read.
+    Args:
+        read_only: For callers that never write the config back: a cached
+          read holds the projects as CloudProjectRecord, which is cheaper to
+          build than DbtCloudProjectItem. Callers that write must leave this off
     Returns:
         DbtCloudConfig | None: Parsed config or None if file doesn't exist/is invalid
     """
@@ -25,10 +54,30 @@ def read_dbt_cloud_config() -> DbtCloudConfig | None:
         logger.error(f"{DBT_CLOUD_FILE} does not exist")
         return None
 
+    with phase("cache lookup dbt_cloud.yml"):
+        key = stat_key(DBT_CLOUD_FILE)
+        snapshot = load_snapshot(DBT_CLOUD_FILE, key)
+        config = None
+        if snapshot is not None:
+            config = cloud_config_from_snapshot(snapshot, read_only)
+    if config is not None:
+        return config
+
     try:
-        with open(DBT_CLOUD_FILE, "r") as file:
-            raw_data = yaml.safe_load(file)
-        return DbtCloudConfig(**raw_data)
+        with phase("parse dbt_cloud.yml"):
+            with open(DBT_CLOUD_FILE, "rb") as file:
+                content = file.read()
+            raw_data = load_yaml(content)
+        with phase("validate dbt_cloud.yml"):
+            config = DbtCloudConfig(**raw_data)
+        with phase("cache store dbt_cloud.yml"):
+            store_snapshot(
+                DBT_CLOUD_FILE,
+                key,
+                cloud_config_to_snapshot(config),
+                digest=content_hash(content),
+            )
+        return config
     except ValidationError as e:
         logger.error(f"Error parsing {DBT_CLOUD_FILE}: {e}")
         return None
@@ -40,13 +89,15 @@ def read_dbt_cloud_config() -> DbtCloudConfig | None:
 def write_dbt_cloud_config(config: DbtCloudConfig) -> None:
     """
     Write a validated DbtCloudConfig to the YAML file.
+    The file is replaced atomically; callers doing a read-modify-write hold
+    file_lock(DBT_CLOUD_FILE) around the whole cycle.
     Args:
         config: DbtCloudConfig object
     """
     try:
-        with open(DBT_CLOUD_FILE, "w") as file:
+        with phase("write dbt_cloud.yml"), atomic_write(DBT_CLOUD_FILE) as file:
             # Use by_alias=True to preserve the original field names (with hyphens)
-            yaml.dump(config.model_dump(by_alias=True), file, default_flow_style=False)
+            dump_yaml(config.model_dump(by_alias=True), file)
     except Exception as e:
         logger.error(f"Error writing {DBT_CLOUD_FILE}: {e}")
         raise
@@ -71,34 +122,328 @@ def update_dbt_cloud_config(
     return config
 
 
+def switch_context_in_place(new_host: str, new_project_id: str) -> bool:
+    """
+    Rewrite only the active-host and active-project lines of dbt_cloud.yml.
+    The projects list is never parsed or re-serialized, so its ordering and
+    comments are preserved and the cost does not grow with the file.
+    Args:
+        new_host: New host to set as active
+        new_project_id: New project ID to set as active
+    Returns:
+        bool: False if the file is missing or too unusual to patch safely
+    """
+    try:
+        with open(DBT_CLOUD_FILE, "r", newline="") as file:
+            text = file.read()
+    except OSError:
+        return False
+
+    with phase("patch context"):
+        patched = patch_context(text, new_host, new_project_id)
+    if patched is None:
+        return False
+
+    with phase("write dbt_cloud.yml"):
+        with atomic_write(DBT_CLOUD_FILE, newline="") as file:
+            file.write(patched)
+    return True
+
+
+def set_active_context(new_host: str, new_project_id: str) -> None:
+    """
+    Point dbt_cloud.yml at a new host and project, patching the context block
+    in place when possible and falling back to a full read/validate/write.
+    The caller holds file_lock(DBT_CLOUD_FILE).
+    Args:
+        new_host: New host to set as active
+        new_project_id: New project ID to set as active
+    Raises:
+        ValueError: If dbt_cloud.yml cannot be read
+    """
+    if switch_context_in_place(new_host, new_project_id):
+        return
+
+    current_config = read_dbt_cloud_config()
+    if not current_config:
+        raise ValueError("Could not read dbt_cloud.yml file")
+
+    updated_config = update_dbt_cloud_config(current_config, new_host, new_project_id)
+
+    write_dbt_cloud_config(updated_config)
+
+
+def read_active_context() -> tuple[str, str] | None:
+    """
+    Read only the active host and project from dbt_cloud.yml.
+    The context block is scanned line by line, so the projects list is not
+    parsed; unusual layouts fall back to a full (cached) read.
+    Returns:
+        tuple[str, str] | None: (active-host, active-project), or None if the
+        file is missing or invalid
+    """
+    try:
+        with open(DBT_CLOUD_FILE, "r", newline="") as file:
+            text = file.read()
+    except OSError:
+        return None
+
+    with phase("read context"):
+        context = read_context(text)
+    if context is not None:
+        return context["active-host"], context["active-project"]
+
+    config = read_dbt_cloud_config(read_only=True)
+    if config is None:
+        return None
+    return config.context.active_host, config.context.active_project
+
+
+def get_current_project() -> dict | None:
+    """
+    Describe the active project for `dbt-switch current`.
+    A project selected for this shell with `dbt-switch env` wins; otherwise
+    the answer is served from the record written at switch time while dbt_switch.yml and
+    the active context are unchanged; otherwise derived from the configs
+    and recorded again.
+    Returns:
+        dict | None: {"name", "host", "project_id"} where name is None if no
+        profile matches the active context, or None if dbt_cloud.yml is
+        missing or invalid
+    """
+    info = env_current() or read_current(file_handler.CONFIG_FILE, DBT_CLOUD_FILE)
+    if info is not None:
+        return info
+
+    with phase("read context"):
+        context = read_active_context()
+    if context is None:
+        return None
+    host, project_id = context
+    with phase("match profile"):
+        config = file_handler.get_config(read_only=True)
+        name = config.find_profile(host, project_id) if config else None
+
+    record_current(file_handler.CONFIG_FILE, DBT_CLOUD_FILE, name, host, project_id)
+    return {"name": name, "host": host, "project_id": project_id}
+
+
+def project_env(project: str) -> dict[str, str]:
+    """
+    Environment variables that select a project for the current shell only.
+    Nothing is written: the account ID is looked up in the dbt_cloud.yml
+    projects list when that file exists.
+    Args:
+        project: Project name, project ID or unique name prefix
+    Returns:
+        dict[str, str]: Variable names and values
+    Raises:
+        ValueError: If the project is not configured
+    """
+    from dbt_switch.utils.shell import (
+        ACCOUNT_ID_VAR,
+        HOST_VAR,
+        PROJECT_ID_VAR,
+        PROJECT_VAR,
+    )
+
+    with phase("resolve project"):
+        name, project_config = resolve_project(project)
+    host = normalize_host(project_config.host)
+    project_id = str(project_config.project_id)
+    env = {PROJECT_VAR: name, HOST_VAR: host, PROJECT_ID_VAR: project_id}
+
+    cloud_config = (
+        read_dbt_cloud_config(read_only=True) if DBT_CLOUD_FILE.exists() else None
+    )
+    for item in cloud_config.projects if cloud_config else []:
+        if item.project_id == project_id and normalize_host(item.account_host) == host:
+            env[ACCOUNT_ID_VAR] = item.account_id
+            break
+    return env
+
+
 def switch_project(project_name: str) -> None:
     """
     Switch to a specific project by updating dbt_cloud.yml.
     Reads the project configuration from dbt_switch.yml and updates
-    the active-host and active-project in dbt_cloud.yml.
+    the active-host and active-project in dbt_cloud.yml, patching the
+    context block in place when possible and falling back to a full
+    read/validate/write otherwise.
 
     Args:
-        project_name: Name of the project to switch to
+        project_name: Name of the project to switch to, its project ID, a
+          unique prefix of its name, or "-" for the previously used project
     """
     try:
-        project_config = get_project_config(project_name)
-        if not project_config:
-            raise ValueError(f"Project '{project_name}' not found in dbt_switch.yml")
+        with phase("resolve project"):
+            ref = project_name
+            if ref == PREVIOUS:
+                ref = previous_project(file_handler.CONFIG_FILE)
+                if ref is None:
+                    raise ValueError("No previous project in the switch history")
+            name, project_config = resolve_project(ref)
 
-        current_config = read_dbt_cloud_config()
-        if not current_config:
-            raise ValueError("Could not read dbt_cloud.yml file")
-
-        updated_config = update_dbt_cloud_config(
-            current_config, project_config.host, str(project_config.project_id)
-        )
+        new_host = project_config.host
+        new_project_id = str(project_config.project_id)
 
-        write_dbt_cloud_config(updated_config)
+        with file_lock(DBT_CLOUD_FILE):
+            set_active_context(new_host, new_project_id)
+            record_current(
+                file_handler.CONFIG_FILE, DBT_CLOUD_FILE, name, new_host, new_project_id
+            )
+            record_switch(file_handler.CONFIG_FILE, name)
 
-        logger.info(f"Successfully switched to project '{project_name}'")
+        logger.info(f"Successfully switched to project '{name}'")
         logger.info(f"✓ Set active host: {project_config.host}")
         logger.info(f"✓ Set active project: {project_config.project_id}")
 
     except Exception as e:
         logger.error(f"Failed to switch to project '{project_name}': {e}")
         raise
+
+
+def auto_switch(directory: Path | None = None) -> dict:
+    """
+    Switch to the project of the nearest `.dbt-switch` marker or
+    dbt_project.yml above a directory, unless it is already active.
+    The directory walk and the profile it resolves to are memoized per
+    directory and reused while the files involved are unchanged.
+    Args:
+        directory: Where to start (defaults to the working directory)
+    Returns:
+        dict: "status" ("none", "active" or "switched") and the profile "name"
+    Raises:
+        ValueError: If the project named there is not in dbt_switch.yml
+    """
+    start = str(directory or Path.cwd())
+    entries = load_entries(DBT_CLOUD_FILE)
+    entry = entries.get(start)
+    if entry is None or not entry_is_fresh(entry, file_handler.CONFIG_FILE):
+        with phase("find project file"):
+            entry = locate_project(Path(start))
+        entry.update(
+            switch_key=sources_key(file_handler.CONFIG_FILE),
+            name=None,
+            host=None,
+            project_id=None,
+        )
+        if entry["ref"] is not None:
+            with phase("resolve project"):
+                config = file_handler.get_config(read_only=True)
+                name = config.resolve_profile(entry["ref"]) if config else None
+            if name is not None:
+                project_config = config.profiles[name]
+                entry.update(
+                    name=name,
+                    host=project_config.host,
+                    project_id=str(project_config.project_id),
+                )
+        store_entry(DBT_CLOUD_FILE, entries, start, entry)
+
+    if entry["ref"] is None:
+        return {"status": "none", "name": None}
+    if entry["name"] is None:
+        raise ValueError(
+            f"Project '{entry['ref']}' from {entry['file']} not found in dbt_switch.yml"
+        )
+    if context_matches(DBT_CLOUD_FILE, entry["host"], entry["project_id"]):
+        return {"status": "active", "name": entry["name"]}
+
+    switch_project(entry["name"])
+    return {"status": "switched", "name": entry["name"]}
+
+
+def sync_from_cloud() -> dict[str, list[str]]:
+    """
+    Build or refresh dbt_switch.yml profiles from the projects in dbt_cloud.yml.
+    Returns:
+        dict[str, list[str]]: Profile names that were added, updated and left
+        unchanged, plus skipped project IDs
+    Raises:
+        ValueError: If dbt_cloud.yml cannot be read
+    """
+    cloud_config = read_dbt_cloud_config(read_only=True)
+    if not cloud_config:
+        logger.error("Sync failed: could not read dbt_cloud.yml file")
+        raise ValueError("Could not read dbt_cloud.yml file")
+
+    return sync_cloud_projects(cloud_config.projects)
+
+
+def discover_from_cloud(timeout: float = 10.0) -> dict[str, list[str]]:
+    """
+    List the projects of every account in dbt_cloud.yml through the dbt
+    Cloud API, using the tokens already stored there, and merge them into
+    dbt_cloud.yml and dbt_switch.yml. The API is queried before either file
+    is locked; each file is then written at most once.
+    Args:
+        timeout: Seconds allowed per request
+    Returns:
+        dict[str, list[str]]: Project IDs added to dbt_cloud.yml ("discovered"),
+        account "errors", and the sync_cloud_projects() result for dbt_switch.yml
+    Raises:
+        ValueError: If dbt_cloud.yml cannot be read
+    """
+    # http.client loads ssl, which the other commands never need
+    from dbt_switch.config import cloud_api
+
+    cloud_config = read_dbt_cloud_config(read_only=True)
+    if not cloud_config:
+        raise ValueError("Could not read dbt_cloud.yml file")
+
+    accounts = {}
+    for item in cloud_config.projects:
+        key = (normalize_host(item.account_host), str(item.account_id).strip())
+        accounts.setdefault(
+            key,
+            {
+                "host": item.account_host,
+                "account_id": key[1],
+                "account_name": item.account_name,
+                "token_name": item.token_name,
+                "token_value": item.token_value,
+            },
+        )
+
+    client = cloud_api.ApiClient(
+        timeout=timeout, etags=cloud_api.load_etags(DBT_CLOUD_FILE)
+    )
+    try:
+        with phase("query dbt Cloud API"):
+            entries, errors = cloud_api.discover_accounts(
+                list(accounts.values()), client
+            )
+    finally:
+        client.close()
+
+    found = [DbtCloudProjectItem(**entry) for entry in entries]
+    discovered = []
+    with file_lock(DBT_CLOUD_FILE):
+        # Re-read: the file may have changed while the API was queried
+        cloud_config = read_dbt_cloud_config()
+        if not cloud_config:
+            raise ValueError("Could not read dbt_cloud.yml file")
+        # Keyed like `dbt-switch merge`: project IDs are only unique per account
+        known = {
+            (str(item.account_id).strip(), str(item.project_id).strip())
+            for item in cloud_config.projects
+        }
+        for item in found:
+            key = (item.account_id.strip(), item.project_id.strip())
+            if key not in known:
+                known.add(key)
+                cloud_config.projects.append(item)
+                discovered.append(item.project_id)
+        if discovered:
+            write_dbt_cloud_config(cloud_config)
+
+    result = sync_cloud_projects(found) if found else {}
+    # Only once both files are written: a cached page answers the next run
+    # with a 304, so responses lost to a failed write must be fetched again
+    cloud_api.store_etags(DBT_CLOUD_FILE, client.etags)
+    logger.info(
+        f"Discovered {len(found)} project(s) in {len(accounts) - len(errors)} "
+        f"account(s), {len(discovered)} new to dbt_cloud.yml"
+    )
+    return {"discovered": discovered, "errors": errors, **result}
@@ -0,0 +1,139 @@
+"""
+Streaming merge of downloaded dbt_cloud.yml files for `dbt-switch merge`.
+
+Input files are parsed one at a time and each project entry is validated
+and written straight to the output, so memory holds one input file plus a
+set of (account-id, project-id) keys rather than every project at once.
+The first entry for a key wins. The output keeps one `version` and
+`context` (from the first file that has them) and replaces the target
+atomically, so a failed merge leaves it untouched.
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+from pydantic import ValidationError
+
+from dbt_switch.config.atomic import atomic_write, file_lock
+from dbt_switch.config.yaml_io import YAMLError, dump_yaml, load_yaml
+from dbt_switch.validation.schemas import DbtCloudContext, DbtCloudProjectItem
+
+
+def _read(path: Path) -> dict:
+    """Parse one input file into its top-level mapping."""
+    try:
+        with open(path, "r") as file:
+            data = load_yaml(file)
+    except (OSError, YAMLError) as e:
+        raise ValueError(f"{path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a dbt_cloud.yml mapping")
+    return data
+
+
+def _header(data: dict) -> dict | None:
+    """The version and context of a parsed file, or None if it has no valid pair."""
+    version = data.get("version")
+    try:
+        context = DbtCloudContext.model_validate(data.get("context"))
+    except ValidationError:
+        return None
+    if version is None or not str(version).strip():
+        return None
+    return {
+        "version": str(version).strip(),
+        "context": context.model_dump(by_alias=True),
+    }
+
+
+def _first_error(e: ValidationError) -> str:
+    error = e.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def merge_cloud_files(paths: Iterable[Path], output: Path) -> dict[str, int]:
+    """
+    Merge dbt_cloud.yml files into one, de-duplicating projects on
+    (account-id, project-id). An existing output file is read first, so its
+    context and projects are kept.
+    Args:
+        paths: Input files, in priority order
+        output: File to write
+    Returns:
+        dict[str, int]: Number of "files" read, "projects" written and
+        "duplicates" dropped
+    Raises:
+        ValueError: Listing every invalid file and project entry, or if no
+        file has a version and context; the output is left untouched
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(output):
+        inputs = [Path(path) for path in paths]
+        if output.exists() and not any(
+            path.exists() and path.samefile(output) for path in inputs
+        ):
+            inputs.insert(0, output)
+
+        seen = set()
+        errors = []
+        # Entries read before a file with a context was found (normally none)
+        pending = []
+        counts = {"files": 0, "projects": 0, "duplicates": 0}
+        with atomic_write(output) as file:
+            header = None
+
+            def emit(item: DbtCloudProjectItem) -> None:
+                if counts["projects"] == 0:
+                    file.write("projects:\n")
+                file.write(dump_yaml([item.model_dump(by_alias=True)]))
+                counts["projects"] += 1
+
+            for path in inputs:
+                try:
+                    data = _read(path)
+                except ValueError as e:
+                    errors.append(str(e))
+                    continue
+                counts["files"] += 1
+                if header is None:
+                    header = _header(data)
+                    if header is not None:
+                        file.write(dump_yaml(header))
+                        for item in pending:
+                            emit(item)
+                        pending = []
+
+                projects = data.get("projects") or []
+                if not isinstance(projects, list):
+                    errors.append(f"{path}: projects must be a list")
+                    continue
+                for position, raw in enumerate(projects):
+                    try:
+                        item = DbtCloudProjectItem.model_validate(raw)
+                    except ValidationError as e:
+                        errors.append(
+                            f"{path}: projects[{position}]: {_first_error(e)}"
+                        )
+                        continue
+                    key = (item.account_id.strip(), item.project_id.strip())
+                    if key in seen:
+                        counts["duplicates"] += 1
+                        continue
+                    seen.add(key)
+                    if header is None:
+                        pending.append(item)
+                    else:
+                        emit(item)
+                # Let the parsed file go before the next one is read
+                del data, projects
+
+            if header is None:
+                errors.append("No input file has a version and context block")
+            if errors:
+                # Raising inside atomic_write leaves the output untouched
+                raise ValueError("\n".join(errors))
+            if counts["projects"] == 0:
+                file.write("projects: []\n")
+    return counts
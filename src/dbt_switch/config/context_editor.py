@@ -0,0 +1,194 @@
+"""
+Line-level editor for the `context:` block of dbt_cloud.yml.
+
+Switching projects only changes `active-host` and `active-project`, so
+instead of parsing and re-serializing the whole file (including a
+potentially very long `projects` list) these helpers locate the two lines
+in the top-level `context:` block and rewrite their values in place.
+Comments, ordering and quoting elsewhere in the file are left untouched.
+
+Anything outside the plain block layout written by dbt Cloud and by
+`yaml.dump` (flow mappings, anchors, tags, multi-line scalars, duplicate
+keys, tabs, a `#` inside a plain value) makes the helpers return None so callers can fall back to a
+full parse.
+"""
+
+import json
+import re
+
+CONTEXT_KEYS = ("active-host", "active-project")
+
+# As in YAML, `#` starts a comment only after whitespace; a plain value with
+# any other `#` (`my#host`) does not match and takes the full parse instead.
+_COMMENT = r"(?:[ \t]+#.*|[ \t]*)"
+_CONTEXT_HEADER = re.compile(r"^context:" + _COMMENT + "$")
+_KEY_LINE = re.compile(
+    r"^(?P<indent> +)(?P<key>active-host|active-project)(?P<sep>[ \t]*:[ \t]+)"
+    r"(?P<value>\"(?:[^\"\\]|\\.)*\"|'(?:[^']|'')*'|[^\s#'\"&*!|>{\[%@`][^#]*?)"
+    r"(?P<trail>" + _COMMENT + ")$"
+)
+_PLAIN_SAFE = re.compile(r"^[A-Za-z](?:[A-Za-z0-9._/:-]*[A-Za-z0-9._/-])?$")
+# Plain words YAML 1.1 (and therefore PyYAML) resolves to non-strings.
+_YAML_SPECIAL_WORDS = {"y", "n", "yes", "no", "true", "false", "on", "off", "null"}
+
+
+def _line_bounds(text: str, start: int) -> tuple[int, int]:
+    """
+    Find the line starting at `start`.
+    Returns:
+        tuple[int, int]: End of the line content (before any \r\n) and the
+        start of the next line
+    """
+    newline = text.find("\n", start)
+    if newline == -1:
+        end = next_start = len(text)
+    else:
+        end, next_start = newline, newline + 1
+    if end > start and text[end - 1] == "\r":
+        end -= 1
+    return end, next_start
+
+
+def _header_offsets(text: str) -> list[int]:
+    """Offsets of every top-level `context:` block header in the file."""
+    starts = [0] if text.startswith("context:") else []
+    newline = text.find("\ncontext:")
+    while newline != -1:
+        starts.append(newline + 1)
+        newline = text.find("\ncontext:", newline + 1)
+
+    offsets = []
+    for line_start in starts:
+        end, _ = _line_bounds(text, line_start)
+        if _CONTEXT_HEADER.match(text[line_start:end]):
+            offsets.append(line_start)
+    return offsets
+
+
+def _find_context_lines(text: str) -> dict[str, tuple[int, int, re.Match]] | None:
+    """
+    Locate the active-host/active-project lines inside the context block.
+    The header is found with plain substring search and only the lines of
+    the block itself are examined, so the cost does not grow with the
+    projects list.
+    Args:
+        text: Contents of dbt_cloud.yml
+    Returns:
+        dict | None: key -> (line start, content end, match), or None if the
+        layout is unusual
+    """
+    headers = _header_offsets(text)
+    if len(headers) != 1:
+        return None
+
+    found: dict[str, tuple[int, int, re.Match]] = {}
+    block_indent = None
+    _, position = _line_bounds(text, headers[0])
+    while position < len(text):
+        line_start = position
+        end, position = _line_bounds(text, line_start)
+        content = text[line_start:end]
+        stripped = content.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        if content[0] != " ":
+            if content[0] == "\t":
+                return None
+            break  # next top-level key ends the block
+
+        indent = len(content) - len(stripped)
+        if block_indent is None:
+            block_indent = indent
+        if indent != block_indent or stripped.startswith(("\t", "-", "?")):
+            return None
+
+        if stripped.startswith(CONTEXT_KEYS):
+            match = _KEY_LINE.match(content)
+            if match is None or match.group("key") in found:
+                return None
+            found[match.group("key")] = (line_start, end, match)
+
+    if set(found) != set(CONTEXT_KEYS):
+        return None
+    return found
+
+
+def _unquote(value: str) -> str | None:
+    """Decode a scalar written in one of the styles _KEY_LINE accepts."""
+    if value.startswith('"'):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    if value.startswith("'"):
+        return value[1:-1].replace("''", "'")
+    return value.strip()
+
+
+def _render(value: str, previous: str) -> str:
+    """Format a new value, keeping the quoting style of the value it replaces."""
+    if previous.startswith("'"):
+        return "'" + value.replace("'", "''") + "'"
+    if previous.startswith('"'):
+        return json.dumps(value)
+    if _PLAIN_SAFE.match(value) and value.lower() not in _YAML_SPECIAL_WORDS:
+        return value
+    return json.dumps(value)
+
+
+def read_context(text: str) -> dict[str, str] | None:
+    """
+    Read active-host and active-project without parsing the whole file.
+    Args:
+        text: Contents of dbt_cloud.yml
+    Returns:
+        dict | None: {"active-host": ..., "active-project": ...} or None
+    """
+    found = _find_context_lines(text)
+    if found is None:
+        return None
+
+    context = {}
+    for key, (_, _, match) in found.items():
+        value = _unquote(match.group("value"))
+        if value is None:
+            return None
+        context[key] = value
+    return context
+
+
+def patch_context(text: str, active_host: str, active_project: str) -> str | None:
+    """
+    Return the file contents with the context values replaced in place.
+    Args:
+        text: Contents of dbt_cloud.yml
+        active_host: New active-host value
+        active_project: New active-project value
+    Returns:
+        str | None: Patched contents, or None if the layout is too unusual
+    """
+    found = _find_context_lines(text)
+    if found is None:
+        return None
+
+    new_values = {"active-host": active_host, "active-project": active_project}
+    pieces = []
+    position = 0
+    for key, (line_start, end, match) in sorted(
+        found.items(), key=lambda item: item[1][0]
+    ):
+        pieces.append(text[position:line_start])
+        pieces.append(
+            match.group("indent")
+            + key
+            + match.group("sep")
+            + _render(new_values[key], match.group("value"))
+            + match.group("trail")
+        )
+        position = end  # keeps the original line ending
+    pieces.append(text[position:])
+
+    patched = "".join(pieces)
+    if read_context(patched) != new_values:
+        return None
+    return patched
@@ -0,0 +1,189 @@
+"""
+Fast answer for `dbt-switch current`, meant to run on every prompt render.
+
+`switch_project` records the active profile in a small JSON file under
+`.dbt_switch_cache/` together with the stat keys of dbt_switch.yml and
+dbt_cloud.yml. `read_current()` trusts that record while both keys still
+match; when only dbt_cloud.yml changed it re-reads just the context block
+and keeps the record if the active host and project are the same. Any
+other change is a miss, and the caller re-derives the answer from the
+parsed configs and records it again.
+
+A shell that selected its own project with `dbt-switch env` reports that
+project instead. Only the standard library (plus the stdlib-only cache
+helpers, context editor and shell helpers) is imported here, so the entry
+point can serve `current` without loading click, pydantic or YAML.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from dbt_switch.config.cache import (
+    CACHE_DIR_NAME,
+    is_settled,
+    stat_key,
+    write_cache_file,
+)
+from dbt_switch.config.context_editor import read_context
+from dbt_switch.config.fragments import sources_key
+from dbt_switch.utils.shell import HOST_VAR, PROJECT_ID_VAR, PROJECT_VAR
+
+DBT_DIR = Path.home() / ".dbt"
+CURRENT_FILE_NAME = "current.json"
+FORMATS = ("name", "host", "id")
+
+
+def current_cache_path(cloud_file: Path) -> Path:
+    """
+    Location of the recorded active profile for a dbt_cloud.yml file.
+    Args:
+        cloud_file: Path to dbt_cloud.yml
+    Returns:
+        Path: `<dir>/.dbt_switch_cache/current.json`
+    """
+    return cloud_file.parent / CACHE_DIR_NAME / CURRENT_FILE_NAME
+
+
+def record_current(
+    switch_file: Path, cloud_file: Path, name: str | None, host: str, project_id
+) -> None:
+    """
+    Record the active profile with the current stat keys of both files.
+    Failures are ignored; the next `current` simply misses.
+    Args:
+        switch_file: Path to dbt_switch.yml
+        cloud_file: Path to dbt_cloud.yml
+        name: Profile name matching the active context, or None
+        host: Active host
+        project_id: Active project ID
+    """
+    record = {
+        "switch_key": sources_key(switch_file),
+        "cloud_key": stat_key(cloud_file),
+        "name": name,
+        "host": host,
+        "project_id": str(project_id),
+    }
+    write_cache_file(current_cache_path(cloud_file), record)
+
+
+def read_current(switch_file: Path, cloud_file: Path) -> dict | None:
+    """
+    Return the recorded active profile if it still describes the files.
+    Args:
+        switch_file: Path to dbt_switch.yml
+        cloud_file: Path to dbt_cloud.yml
+    Returns:
+        dict | None: {"name", "host", "project_id"}, or None on a miss
+    """
+    try:
+        record = json.loads(current_cache_path(cloud_file).read_text())
+        switch_key = record["switch_key"]
+        cloud_key = record["cloud_key"]
+        info = {key: record[key] for key in ("name", "host", "project_id")}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    # Profile names come from dbt_switch.yml and its fragments, so any
+    # change to them is a miss
+    if switch_key is None or not is_settled(switch_key):
+        return None
+    if sources_key(switch_file) != switch_key:
+        return None
+
+    now_key = stat_key(cloud_file)
+    if now_key is None:
+        return None
+    if now_key == cloud_key and is_settled(cloud_key):
+        return info
+
+    # dbt_cloud.yml was rewritten (or too recently to trust its stat):
+    # still a hit if the active context is unchanged
+    try:
+        with open(cloud_file, "r", newline="") as file:
+            context = read_context(file.read())
+    except OSError:
+        return None
+    if context is None or (context["active-host"], context["active-project"]) != (
+        info["host"],
+        info["project_id"],
+    ):
+        return None
+    if now_key != cloud_key:
+        record_current(
+            switch_file, cloud_file, info["name"], info["host"], info["project_id"]
+        )
+    return info
+
+
+def env_current() -> dict | None:
+    """
+    The project selected for this shell by `eval "$(dbt-switch env NAME)"`,
+    which takes precedence over the shared dbt_cloud.yml context.
+    Returns:
+        dict | None: {"name", "host", "project_id"}, or None if the shell has
+        no project of its own
+    """
+    name = os.environ.get(PROJECT_VAR)
+    if not name:
+        return None
+    return {
+        "name": name,
+        "host": os.environ.get(HOST_VAR, ""),
+        "project_id": os.environ.get(PROJECT_ID_VAR, ""),
+    }
+
+
+def format_current(info: dict, fmt: str = "name") -> str | None:
+    """
+    Render the active profile for `current --format`.
+    Args:
+        info: {"name", "host", "project_id"}
+        fmt: One of "name", "host" or "id"
+    Returns:
+        str | None: The value, or None if no profile matches the active context
+    """
+    if fmt == "host":
+        return info["host"]
+    if fmt == "id":
+        return str(info["project_id"])
+    return info["name"]
+
+
+def _parse_format(argv: list[str]) -> str | None:
+    """Accept exactly `current [--format X | --format=X]`."""
+    if argv == ["current"]:
+        return "name"
+    if len(argv) == 3 and argv[:2] == ["current", "--format"]:
+        fmt = argv[2]
+    elif len(argv) == 2 and argv[0] == "current" and argv[1].startswith("--format="):
+        fmt = argv[1].split("=", 1)[1]
+    else:
+        return None
+    return fmt if fmt in FORMATS else None
+
+
+def fast_current(argv: list[str]) -> int | None:
+    """
+    Answer `dbt-switch current` from the recorded profile for the default
+    ~/.dbt files.
+    Args:
+        argv: Arguments after the program name
+    Returns:
+        int | None: Exit code, or None if the caller should run the full command
+    """
+    fmt = _parse_format(argv)
+    if fmt is None:
+        return None
+    info = env_current() or read_current(
+        DBT_DIR / "dbt_switch.yml", DBT_DIR / "dbt_cloud.yml"
+    )
+    if info is None:
+        return None
+    value = format_current(info, fmt)
+    if value is None:
+        return 1
+    sys.stdout.write(f"{value}\n")
+    return 0
@@ -0,0 +1,150 @@
+"""
+Consistency checks for `dbt-switch doctor`.
+
+Every profile in dbt_switch.yml is cross-checked against the projects list
+of dbt_cloud.yml in one pass over a project-id index, and each distinct
+host can optionally be probed over HTTPS by a bounded thread pool. All
+problems are collected and returned together rather than stopping at the
+first one.
+"""
+
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from dbt_switch.config import cloud_handler, file_handler
+from dbt_switch.validation.hosts import normalize_host
+from dbt_switch.validation.schemas import DbtCloudProjectItem, DbtSwitchConfig
+
+PROBE_TIMEOUT = 5.0
+PROBE_WORKERS = 8
+
+# A problem is a (project name, message) pair
+Problem = tuple[str, str]
+
+
+def check_profiles(
+    config: DbtSwitchConfig, cloud_projects: Iterable[DbtCloudProjectItem]
+) -> list[Problem]:
+    """
+    Cross-check every profile against the dbt_cloud.yml projects list.
+    Args:
+        config: Parsed dbt_switch.yml
+        cloud_projects: Projects from dbt_cloud.yml
+    Returns:
+        list[Problem]: Problems in profile name order
+    """
+    by_id = {}
+    cloud_hosts = set()
+    for item in cloud_projects:
+        by_id.setdefault(str(item.project_id).strip(), item)
+        cloud_hosts.add(normalize_host(item.account_host))
+
+    problems = []
+    for name in config.sorted_names():
+        project = config.profiles[name]
+        host = normalize_host(project.host)
+        item = by_id.get(str(project.project_id))
+        if item is None:
+            problems.append(
+                (name, f"project ID {project.project_id} not found in dbt_cloud.yml")
+            )
+        if host not in cloud_hosts:
+            problems.append(
+                (name, f"no project in dbt_cloud.yml uses host '{project.host}'")
+            )
+        elif item is not None and normalize_host(item.account_host) != host:
+            problems.append(
+                (
+                    name,
+                    f"host '{project.host}' does not match '{item.account_host}' "
+                    f"for project ID {project.project_id} in dbt_cloud.yml",
+                )
+            )
+    return problems
+
+
+def probe_host(host: str, timeout: float = PROBE_TIMEOUT) -> str | None:
+    """
+    Check that a host answers HTTP requests. Any response counts, since
+    the dbt Cloud API answers unauthenticated requests with an error status.
+    Args:
+        host: Host as written in dbt_switch.yml; https unless it has a scheme
+        timeout: Seconds to wait for the connection and the response
+    Returns:
+        str | None: Why the host is unreachable, or None if it answered
+    """
+    host = host.strip()
+    scheme, _, rest = host.rpartition("://")
+    address = rest.split("/", 1)[0]
+    if scheme.lower() == "http":
+        connection = http.client.HTTPConnection(address, timeout=timeout)
+    else:
+        connection = http.client.HTTPSConnection(address, timeout=timeout)
+    try:
+        connection.request("HEAD", "/")
+        connection.getresponse().read()
+    except (OSError, http.client.HTTPException) as e:
+        return str(e) or type(e).__name__
+    finally:
+        connection.close()
+    return None
+
+
+def probe_hosts(
+    config: DbtSwitchConfig,
+    timeout: float = PROBE_TIMEOUT,
+    workers: int = PROBE_WORKERS,
+) -> list[Problem]:
+    """
+    Probe each distinct host once, at most `workers` at a time, and report
+    the profiles on hosts that did not answer.
+    Args:
+        config: Parsed dbt_switch.yml
+        timeout: Seconds allowed per host
+        workers: Maximum concurrent probes
+    Returns:
+        list[Problem]: Problems in profile name order
+    """
+    hosts = {}
+    for name in config.sorted_names():
+        hosts.setdefault(normalize_host(config.profiles[name].host), []).append(name)
+    if not hosts:
+        return []
+
+    # Probe with the host as first written, so an explicit scheme is kept
+    targets = [config.profiles[names[0]].host for names in hosts.values()]
+    with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+        errors = list(pool.map(lambda host: probe_host(host, timeout), targets))
+
+    problems = []
+    for names, target, error in zip(hosts.values(), targets, errors):
+        if error is not None:
+            message = f"host '{target}' is unreachable: {error}"
+            problems.extend((name, message) for name in names)
+    return sorted(problems, key=lambda problem: problem[0])
+
+
+def diagnose(probe: bool = False, timeout: float = PROBE_TIMEOUT) -> list[Problem]:
+    """
+    Check every profile in dbt_switch.yml.
+    Args:
+        probe: Also check that each host is reachable
+        timeout: Seconds allowed per host when probing
+    Returns:
+        list[Problem]: All problems found, grouped by profile
+    Raises:
+        ValueError: If dbt_switch.yml or dbt_cloud.yml cannot be read
+    """
+    config = file_handler.get_config(read_only=True)
+    if config is None:
+        raise ValueError("Configuration file not found or invalid.")
+    cloud_config = cloud_handler.read_dbt_cloud_config(read_only=True)
+    if cloud_config is None:
+        raise ValueError("Could not read dbt_cloud.yml file")
+
+    problems = check_profiles(config, cloud_config.projects)
+    if probe:
+        problems.extend(probe_hosts(config, timeout))
+    # Stable sort: each profile's file problems stay ahead of its probe result
+    return sorted(problems, key=lambda problem: problem[0])
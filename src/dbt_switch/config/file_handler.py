@@ -3,22 +3,49 @@ File handler for the dbt_switch.yml file. This includes all operations that
 directlymodify the dbt_switch.yml file.
 """
 
+import fnmatch
+import os
+import re
+import sys
 from pathlib import Path
-import yaml
+from json.encoder import encode_basestring_ascii as encode_string
+from typing import IO, Iterable
 from pydantic import ValidationError
 
-from dbt_switch.utils.logger import logger
-from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+from dbt_switch.utils.logger import logger, logging_to_stderr
+from dbt_switch.utils.timing import phase
+from dbt_switch.config.yaml_io import load_yaml, dump_yaml
+from dbt_switch.config.atomic import atomic_write, file_lock
+from dbt_switch.config.cache import (
+    content_hash,
+    stat_key,
+    load_snapshot,
+    write_completions,
+    store_snapshot,
+    switch_config_to_snapshot,
+    switch_config_from_snapshot,
+)
+from dbt_switch.config.fragments import fragment_paths, sources_key
+from dbt_switch.validation.hosts import normalize_host
+from dbt_switch.validation.name_index import NameIndex
+from dbt_switch.validation.schemas import (
+    DbtCloudProjectItem,
+    DbtSwitchConfig,
+    ProjectConfig,
+)
 from dbt_switch.validation.helpers import (
     validate_project_name_format,
-    check_project_name_exists,
-    validate_unique_project_id,
-    validate_full_config_after_modification,
     create_validated_project_config,
+    slugify_project_name,
 )
 
 DIRECTORY = Path.home() / ".dbt"
 CONFIG_FILE = DIRECTORY / "dbt_switch.yml"
+# Cache snapshot kind for the trigram index of profile names
+NAMES_SNAPSHOT = "names"
+# Output formats of `dbt-switch list`, and rows per write when streaming
+LIST_FORMATS = ("text", "json", "jsonl", "tsv")
+LIST_CHUNK_ROWS = 1000
 
 
 def init_config() -> None:
@@ -26,45 +53,137 @@ def init_config() -> None:
     Initialize the dbt_switch.yml file in the ~/.dbt directory.
     This file contains the active project and host for the dbt Cloud project.
     """
-    if not CONFIG_FILE.exists():
-        CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(CONFIG_FILE):
+        if CONFIG_FILE.exists():
+            logger.info(f"{CONFIG_FILE} already exists")
+            return
         default_config = {"profiles": {}}
-        with open(CONFIG_FILE, "w") as file:
-            yaml.dump(default_config, file)
-        logger.info(f"Initialized {CONFIG_FILE}")
-    else:
-        logger.info(f"{CONFIG_FILE} already exists")
+        with atomic_write(CONFIG_FILE) as file:
+            dump_yaml(default_config, file)
+    logger.info(f"Initialized {CONFIG_FILE}")
 
 
-def get_config() -> DbtSwitchConfig | None:
+def get_config(read_only: bool = False) -> DbtSwitchConfig | None:
     """
-    Get the config from the dbt_switch.yml file in the ~/.dbt directory.
+    Get the config from the dbt_switch.yml file in the ~/.dbt directory,
+    with the profiles of any dbt_switch.d/*.yml fragments merged in.
+    Each file is served from its own parse cache entry when it is unchanged
+    (same stat, or same content hash) since its last validated read, so an
+    edit to one file re-parses only that file. A fragment that is invalid,
+    or whose profiles clash with dbt_switch.yml or an earlier fragment, is
+    reported on stderr and skipped (in part or in full) rather than
+    failing the load.
+    Args:
+        read_only: For callers that never save the config: a cached read
+          holds the profiles as ProjectRecord, which is cheaper to build
+          than ProjectConfig. Callers that save must leave this off
     Returns:
         DbtSwitchConfig | None
     """
     if not CONFIG_FILE.exists():
         logger.info(f"{CONFIG_FILE} does not exist")
         return None
+
+    config, parsed = _load_switch_file(CONFIG_FILE, read_only)
+    if config is None:
+        return None
+
+    # Problems in fragments are diagnostics, never command output: keep them
+    # out of stdout, which `current` and `list --format` reserve for values
+    with logging_to_stderr():
+        for path in fragment_paths(CONFIG_FILE):
+            fragment, fragment_parsed = _load_switch_file(path, read_only)
+            parsed = parsed or fragment_parsed
+            if fragment is None:
+                continue
+            with phase("merge fragments"):
+                conflicts = config.add_fragment(str(path), fragment.profiles)
+            for conflict in conflicts:
+                logger.error(f"Skipping {conflict}")
+
+    if parsed:
+        write_completions(CONFIG_FILE, config.sorted_names())
+    return config
+
+
+def _load_switch_file(
+    path: Path, read_only: bool
+) -> tuple[DbtSwitchConfig | None, bool]:
+    """
+    Load and validate one file in the dbt_switch.yml format, through its
+    parse cache entry.
+    Args:
+        path: dbt_switch.yml or a fragment
+        read_only: Rebuild cached profiles as ProjectRecord
+    Returns:
+        tuple[DbtSwitchConfig | None, bool]: The config (None if invalid),
+        and whether the file had to be parsed
+    """
+    with phase(f"cache lookup {path.name}"):
+        key = stat_key(path)
+        snapshot = load_snapshot(path, key)
+        config = None
+        if snapshot is not None:
+            config = switch_config_from_snapshot(snapshot, read_only)
+    if config is not None:
+        return config, False
+
     try:
-        with open(CONFIG_FILE, "r") as file:
-            raw_data = yaml.safe_load(file)
-        return DbtSwitchConfig(**raw_data)
+        with phase(f"parse {path.name}"):
+            with open(path, "rb") as file:
+                content = file.read()
+            raw_data = load_yaml(content)
+        with phase(f"validate {path.name}"):
+            config = DbtSwitchConfig(**raw_data)
+        with phase(f"cache store {path.name}"):
+            store_snapshot(
+                path,
+                key,
+                switch_config_to_snapshot(config),
+                digest=content_hash(content),
+            )
+        return config, True
     except ValidationError as e:
-        logger.error(f"Error parsing {CONFIG_FILE}: {e}")
-        return None
+        logger.error(f"Error parsing {path}: {e}")
+        logger.error("Run 'dbt-switch validate' to list every problem with its line.")
+        return None, True
     except Exception as e:
-        logger.error(f"Error parsing {CONFIG_FILE}: {e}")
-        return None
+        logger.error(f"Error parsing {path}: {e}")
+        return None, True
 
 
 def save_config(config: DbtSwitchConfig) -> None:
     """
     Save a validated DbtSwitchConfig to the YAML file.
+    The file is replaced atomically; callers doing a read-modify-write hold
+    file_lock(CONFIG_FILE) around the whole cycle.
     Args:
         config: DbtSwitchConfig object
     """
-    with open(CONFIG_FILE, "w") as file:
-        yaml.dump(config.model_dump(), file)
+    with phase("write dbt_switch.yml"):
+        with atomic_write(CONFIG_FILE) as file:
+            # Profiles merged from dbt_switch.d fragments stay in their files
+            profiles = config.own_profiles()
+            dump_yaml(
+                {
+                    "profiles": {
+                        name: project.model_dump() for name, project in profiles.items()
+                    }
+                },
+                file,
+            )
+        write_completions(CONFIG_FILE, config.sorted_names())
+
+
+def refresh_completions() -> None:
+    """
+    Rewrite the profile names read by the shell completion scripts, which
+    call this when dbt_switch.yml or a dbt_switch.d fragment is newer than
+    their names file.
+    """
+    config = get_config(read_only=True)
+    write_completions(CONFIG_FILE, config.sorted_names() if config else [])
 
 
 def add_config(project: str, host: str, project_id: int) -> None:
@@ -80,21 +199,18 @@ def add_config(project: str, host: str, project_id: int) -> None:
     try:
         validate_project_name_format(project)
 
-        config = get_config()
-        if config is None:
-            config = DbtSwitchConfig()
+        with file_lock(CONFIG_FILE):
+            config = get_config()
+            if config is None:
+                config = DbtSwitchConfig()
 
-        if check_project_name_exists(config, project):
-            raise ValueError(f"Project '{project}' already exists in configuration.")
+            new_project = create_validated_project_config(
+                host=host, project_id=project_id
+            )
 
-        validate_unique_project_id(config, project_id)
+            config.add_profile(project, new_project)
 
-        new_project = create_validated_project_config(host=host, project_id=project_id)
-
-        config.profiles[project] = new_project
-        validate_full_config_after_modification(config)
-
-        save_config(config)
+            save_config(config)
 
         logger.info(
             f"Added project '{project}' with host '{new_project.host}' and project_id {new_project.project_id}"
@@ -105,22 +221,313 @@ def add_config(project: str, host: str, project_id: int) -> None:
         raise
 
 
+ON_CONFLICT_CHOICES = ("skip", "replace", "fail")
+
+
+def _collect_import_records(records: Iterable[dict]) -> dict[str, tuple]:
+    """
+    Validate import records on their own, before looking at the config.
+    Args:
+        records: Dicts with name, host, project_id and an optional location
+    Returns:
+        dict[str, tuple]: name -> (location, ProjectConfig), in input order
+    Raises:
+        ValueError: Listing every invalid or duplicated record
+    """
+    errors = []
+    incoming: dict[str, tuple] = {}
+    incoming_ids: dict[int, str] = {}
+    for index, record in enumerate(records, start=1):
+        location = record.get("location") or f"record {index}"
+        name = str(record.get("name") or "").strip()
+        try:
+            validate_project_name_format(name)
+            project = create_validated_project_config(
+                host=record.get("host"), project_id=record.get("project_id")
+            )
+        except ValidationError as e:
+            messages = "; ".join(err["msg"] for err in e.errors())
+            errors.append(f"{location}: {messages}")
+            continue
+        except ValueError as e:
+            errors.append(f"{location}: {e}")
+            continue
+
+        if name in incoming:
+            errors.append(f"{location}: duplicate project name '{name}' in import")
+            continue
+        if project.project_id in incoming_ids:
+            errors.append(
+                f"{location}: project ID {project.project_id} is also used by "
+                f"'{incoming_ids[project.project_id]}' in import"
+            )
+            continue
+        incoming[name] = (location, project)
+        incoming_ids[project.project_id] = name
+
+    if errors:
+        raise ValueError(f"{len(errors)} invalid record(s):\n  " + "\n  ".join(errors))
+    return incoming
+
+
+def import_configs(
+    records: Iterable[dict], on_conflict: str = "fail"
+) -> dict[str, list[str]]:
+    """
+    Add many project configurations in a single validate-and-write pass.
+    All records are validated first, then checked against the existing
+    profiles through a project-id index, and the file is written once.
+    Args:
+        records: Dicts with name, host, project_id and an optional location
+        on_conflict: What to do when a name or project ID already exists
+          - "fail": report every conflict and change nothing
+          - "skip": keep the existing profiles and ignore those records
+          - "replace": overwrite the profile with the same name and drop any
+            other profile holding the same project ID
+    Returns:
+        dict[str, list[str]]: Project names that were added, replaced and skipped
+    Raises:
+        ValueError: If a record is invalid, or on conflicts with "fail"
+    """
+    if on_conflict not in ON_CONFLICT_CHOICES:
+        raise ValueError(
+            f"Invalid on_conflict '{on_conflict}'. "
+            f"Use one of: {', '.join(ON_CONFLICT_CHOICES)}"
+        )
+
+    try:
+        incoming = _collect_import_records(records)
+
+        with file_lock(CONFIG_FILE):
+            config = get_config()
+            if config is None:
+                config = DbtSwitchConfig()
+
+            id_index = config.project_id_index()
+            conflicts = []
+            displaced = set()
+            for name, (location, project) in incoming.items():
+                reasons = []
+                if name in config.profiles:
+                    reasons.append(f"project '{name}' already exists")
+                owner = id_index.get(project.project_id)
+                if owner is not None and owner != name:
+                    reasons.append(
+                        f"project ID {project.project_id} is used by '{owner}'"
+                    )
+                    displaced.add(owner)
+                if reasons:
+                    conflicts.append((location, name, "; ".join(reasons)))
+
+            if conflicts and on_conflict == "fail":
+                raise ValueError(
+                    f"{len(conflicts)} conflict(s):\n  "
+                    + "\n  ".join(f"{loc}: {reason}" for loc, _, reason in conflicts)
+                )
+
+            conflicting = {name for _, name, _ in conflicts}
+            result = {"added": [], "replaced": [], "skipped": []}
+            if on_conflict == "replace":
+                # Free every name and ID being replaced first, so records that
+                # swap IDs between existing profiles do not trip each other
+                for owner in displaced | (conflicting & config.profiles.keys()):
+                    config.remove_profile(owner)
+            for name, (_, project) in incoming.items():
+                if name in conflicting and on_conflict == "skip":
+                    result["skipped"].append(name)
+                    continue
+                key = "replaced" if name in conflicting else "added"
+                result[key].append(name)
+                config.add_profile(name, project)
+
+            if result["added"] or result["replaced"]:
+                save_config(config)
+
+        logger.info(
+            f"Imported {len(result['added'])} new, {len(result['replaced'])} "
+            f"replaced and {len(result['skipped'])} skipped project(s)"
+        )
+        return result
+
+    except (ValidationError, ValueError) as e:
+        logger.error(f"Import failed: {e}")
+        raise
+
+
+def _sync_name_for(item: DbtCloudProjectItem, project_id: int, taken) -> str:
+    """
+    Pick a free, slug-safe profile name for a dbt Cloud project: the slug,
+    else the slug suffixed with the project ID, else that suffixed with the
+    first free -2, -3, ... The caller adds the name to `taken`.
+    """
+    base = slugify_project_name(item.project_name) or f"project-{project_id}"
+    if base not in taken:
+        return base
+    name = f"{base}-{project_id}"
+    counter = 2
+    while name in taken:
+        name = f"{base}-{project_id}-{counter}"
+        counter += 1
+    return name
+
+
+def sync_cloud_projects(
+    projects: Iterable[DbtCloudProjectItem],
+) -> dict[str, list[str]]:
+    """
+    Create or refresh profiles from the dbt_cloud.yml projects list.
+    Existing profiles are matched by project ID, so repeated runs only touch
+    projects that are new or whose host changed; profile names chosen by the
+    user are kept. New profiles get a slug of the dbt Cloud project name,
+    suffixed with the project ID when that name is already taken. The file
+    is written at most once.
+    Args:
+        projects: Project items from DbtCloudConfig.projects
+    Returns:
+        dict[str, list[str]]: Profile names that were added, updated and left
+        unchanged, plus skipped project IDs that could not be used
+    """
+    try:
+        with file_lock(CONFIG_FILE):
+            config = get_config()
+            if config is None:
+                config = DbtSwitchConfig()
+
+            id_index = config.project_id_index()
+            result = {"added": [], "updated": [], "unchanged": [], "skipped": []}
+            seen = set()
+            for item in projects:
+                try:
+                    project = create_validated_project_config(
+                        host=item.account_host, project_id=item.project_id
+                    )
+                except ValidationError as e:
+                    logger.warning(
+                        f"Skipping dbt Cloud project '{item.project_name}' "
+                        f"({item.project_id}): {e.errors()[0]['msg']}"
+                    )
+                    result["skipped"].append(item.project_id)
+                    continue
+
+                if project.project_id in seen:
+                    # The same project listed under several tokens
+                    continue
+                seen.add(project.project_id)
+
+                name = id_index.get(project.project_id)
+                if name is None:
+                    name = _sync_name_for(item, project.project_id, config.profiles)
+                    config.add_profile(name, project)
+                    result["added"].append(name)
+                elif config.profile_source(name) is not None:
+                    # Owned by a dbt_switch.d fragment, which sync never writes
+                    result["unchanged"].append(name)
+                elif normalize_host(config.profiles[name].host) != normalize_host(
+                    project.host
+                ):
+                    config.replace_profile(name, project)
+                    result["updated"].append(name)
+                else:
+                    result["unchanged"].append(name)
+
+            if result["added"] or result["updated"]:
+                save_config(config)
+
+        logger.info(
+            f"Synced {len(result['added'])} new, {len(result['updated'])} updated "
+            f"and {len(result['unchanged'])} unchanged project(s) from dbt_cloud.yml"
+        )
+        return result
+
+    except (ValidationError, ValueError) as e:
+        logger.error(f"Sync failed: {e}")
+        raise
+
+
 def get_project_config(project: str) -> ProjectConfig | None:
     """
     Get configuration for a specific project.
     Args:
-        project: dbt project name that is used to select the host and project_id
+        project: Project name, project ID or unique name prefix, as accepted
+          by resolve_project
     Returns:
-        ProjectConfig | None
+        ProjectConfig | None: Or the equivalent ProjectRecord from a cached read
     """
-    config = get_config()
-    if config and project in config.profiles:
-        return config.profiles[project]
-    else:
-        logger.error(f"Project '{project}' not found in configuration")
+    try:
+        return resolve_project(project)[1]
+    except ValueError as e:
+        logger.error(str(e))
     return None
 
 
+def project_name_index(config: DbtSwitchConfig) -> NameIndex:
+    """
+    Trigram index of the profile names, loaded from the cache directory
+    while dbt_switch.yml and its fragments are unchanged and built (then
+    stored) otherwise.
+    Args:
+        config: Config loaded from CONFIG_FILE
+    Returns:
+        NameIndex: The index
+    """
+    key = sources_key(CONFIG_FILE)
+
+    def load_or_build(names) -> NameIndex:
+        snapshot = load_snapshot(CONFIG_FILE, key, NAMES_SNAPSHOT)
+        index = NameIndex.from_snapshot(snapshot) if snapshot is not None else None
+        if index is None or len(index.names) != len(names):
+            index = NameIndex.build(names)
+            store_snapshot(CONFIG_FILE, key, index.to_snapshot(), NAMES_SNAPSHOT)
+        return index
+
+    return config.name_index(load_or_build)
+
+
+def unknown_project_message(config: DbtSwitchConfig, project: str) -> str:
+    """
+    Explain why a project reference did not resolve: list the candidates of
+    an ambiguous prefix, or suggest the closest names.
+    Args:
+        config: Loaded dbt-switch configuration
+        project: Reference that resolve_profile(..., prefix=True) rejected
+    Returns:
+        str: Error message
+    """
+    matches = config.names_with_prefix(project, limit=6) if project else []
+    if len(matches) > 1:
+        shown = ", ".join(matches[:5]) + (", ..." if len(matches) > 5 else "")
+        return f"Project '{project}' matches several projects: {shown}"
+
+    message = f"Project '{project}' not found in dbt_switch.yml"
+    with phase("suggest names"):
+        suggestions = project_name_index(config).suggest(project)
+    if suggestions:
+        message += f". Did you mean: {', '.join(suggestions)}?"
+    return message
+
+
+def resolve_project(project: str) -> tuple[str, ProjectConfig]:
+    """
+    Resolve what the user typed for `-p`: a project name, a project ID or a
+    unique prefix of a project name.
+    Args:
+        project: Project reference
+    Returns:
+        tuple[str, ProjectConfig]: Project name and configuration (a
+        ProjectRecord from a cached read)
+    Raises:
+        ValueError: If dbt_switch.yml cannot be read or nothing (or more than
+        one project) matches
+    """
+    config = get_config(read_only=True)
+    if config is None:
+        raise ValueError("Configuration file not found or invalid.")
+    name = config.resolve_profile(project, prefix=True)
+    if name is None:
+        raise ValueError(unknown_project_message(config, project))
+    return name, config.profiles[name]
+
+
 def update_project(
     project: str, host: str | None = None, project_id: int | None = None
 ) -> None:
@@ -136,31 +543,28 @@ def update_project(
         raise ValueError("At least one of host or project_id must be provided")
 
     try:
-        config = get_config()
-        if not config:
-            raise ValueError("Configuration file not found or invalid.")
+        with file_lock(CONFIG_FILE):
+            config = get_config()
+            if not config:
+                raise ValueError("Configuration file not found or invalid.")
 
-        if project not in config.profiles:
-            raise ValueError(f"Project '{project}' not found in configuration.")
+            if project not in config.profiles:
+                raise ValueError(f"Project '{project}' not found in configuration.")
 
-        existing_project = config.profiles[project]
+            existing_project = config.profiles[project]
 
-        new_host = host if host is not None else existing_project.host
-        new_project_id = (
-            project_id if project_id is not None else existing_project.project_id
-        )
+            new_host = host if host is not None else existing_project.host
+            new_project_id = (
+                project_id if project_id is not None else existing_project.project_id
+            )
 
-        if project_id is not None:
-            validate_unique_project_id(config, project_id, exclude_project=project)
+            updated_project = create_validated_project_config(
+                host=new_host, project_id=new_project_id
+            )
 
-        updated_project = create_validated_project_config(
-            host=new_host, project_id=new_project_id
-        )
+            config.replace_profile(project, updated_project)
 
-        config.profiles[project] = updated_project
-        validate_full_config_after_modification(config)
-
-        save_config(config)
+            save_config(config)
 
         updates = []
         if host is not None:
@@ -181,7 +585,7 @@ def display_project_config(project: str) -> None:
     Args:
         project: dbt project name that is used to select the host and project_id
     """
-    config = get_config()
+    config = get_config(read_only=True)
     if not config:
         logger.error("Configuration file not found or invalid.")
         return
@@ -204,18 +608,14 @@ def delete_project_config(project: str) -> None:
         project: dbt project name that is used to select the host and project_id
     """
     try:
-        config = get_config()
-        if not config:
-            raise ValueError("Configuration file not found or invalid.")
-
-        if project not in config.profiles:
-            raise ValueError(f"Project '{project}' not found in configuration.")
-
-        del config.profiles[project]
+        with file_lock(CONFIG_FILE):
+            config = get_config()
+            if not config:
+                raise ValueError("Configuration file not found or invalid.")
 
-        validate_full_config_after_modification(config)
+            config.remove_profile(project)
 
-        save_config(config)
+            save_config(config)
         logger.info(f"Deleted project '{project}'")
 
     except (ValidationError, ValueError) as e:
@@ -223,36 +623,198 @@ def delete_project_config(project: str) -> None:
         raise
 
 
-def list_all_projects() -> None:
+def list_all_projects(
+    recent: bool = False,
+    output_format: str = "text",
+    host: str | None = None,
+    match: str | None = None,
+    limit: int | None = None,
+) -> None:
     """
     List all projects with their configuration details and mark the active one.
     Reads from dbt_switch.yml and cross-references with dbt_cloud.yml for active project.
+    Args:
+        recent: List the most recently used projects first
+        output_format: One of LIST_FORMATS; the machine-readable formats are
+          streamed to stdout through one buffered writer
+        host: Only list projects on this host, however it is written
+        match: Only list projects whose name matches this glob pattern
+          (a pattern without wildcards matches names starting with it)
+        limit: List at most this many projects
     """
-    from dbt_switch.config.cloud_handler import read_dbt_cloud_config
+    from dbt_switch.config.cloud_handler import read_active_context
 
-    config = get_config()
+    config = get_config(read_only=True)
     if not config or not config.profiles:
         logger.info(
             "No projects configured. Run 'dbt-switch init' and 'dbt-switch add' to get started."
         )
+        if output_format != "text":
+            # Still a valid (empty) document for the reading program
+            write_project_records(
+                DbtSwitchConfig(), [], None, output_format, sys.stdout
+            )
         return
 
-    cloud_config = read_dbt_cloud_config()
-    active_project = None
-    if cloud_config:
-        for project_name, project_config in config.profiles.items():
-            if (
-                project_config.host == cloud_config.context.active_host
-                and str(project_config.project_id)
-                == cloud_config.context.active_project
-            ):
-                active_project = project_name
-                break
-
-    print("Available projects:")
-    for project_name, project_config in config.profiles.items():
+    # Only the context block is needed, not the projects list
+    context = read_active_context()
+    active_project = config.find_profile(*context) if context else None
+
+    order = None
+    if recent:
+        from dbt_switch.config.history import KEEP_ENTRIES, read_recent
+
+        order = [name for _, name in read_recent(CONFIG_FILE, KEEP_ENTRIES)]
+
+    names = select_profiles(config, host, match, order, limit)
+    with phase("render list"):
+        if output_format == "text":
+            for line in format_project_list(config, active_project, names=names):
+                print(line)
+        else:
+            write_project_records(
+                config, names, active_project, output_format, sys.stdout
+            )
+
+
+def select_profiles(
+    config: DbtSwitchConfig,
+    host: str | None = None,
+    match: str | None = None,
+    order: list[str] | None = None,
+    limit: int | None = None,
+) -> list[str]:
+    """
+    Names of the profiles that pass the `list` filters.
+    A host filter is a host index lookup, and a match pattern is narrowed
+    by bisecting the sorted names on its literal prefix before the glob is
+    applied, so neither scans every profile. Filtered names come out in
+    sorted order; unfiltered names in file order.
+    Args:
+        config: Loaded dbt-switch configuration
+        host: Host or URL the profiles must be on
+        match: Glob pattern for the name; without wildcards, a name prefix
+        order: Project names to put first, in this order
+        limit: Maximum number of names
+    Returns:
+        list[str]: Selected project names
+    """
+    if match is not None:
+        literal = re.split(r"[*?\[]", match, maxsplit=1)[0]
+        names = config.names_with_prefix(literal)
+        if literal != match:
+            pattern = re.compile(fnmatch.translate(match))
+            names = [name for name in names if pattern.match(name)]
+        if host is not None:
+            on_host = config.names_for_host(host)
+            names = [name for name in names if name in on_host]
+    elif host is not None:
+        names = sorted(config.names_for_host(host))
+    else:
+        names = list(config.profiles)
+
+    if order:
+        selected = set(names)
+        first = [name for name in dict.fromkeys(order) if name in selected]
+        chosen = set(first)
+        names = first + [name for name in names if name not in chosen]
+    return names if limit is None else names[:limit]
+
+
+def write_project_records(
+    config: DbtSwitchConfig,
+    names: Iterable[str],
+    active_project: str | None,
+    output_format: str,
+    stream: IO[str],
+) -> None:
+    """
+    Stream profiles as JSON, JSON Lines or TSV.
+    Rows are joined into chunks of LIST_CHUNK_ROWS and written with one call
+    per chunk. A reader that stops early (`| head`) ends the output quietly.
+    Args:
+        config: Loaded dbt-switch configuration
+        names: Project names to write, in order
+        active_project: Name of the active project, if known
+        output_format: "json", "jsonl" or "tsv"
+        stream: Text stream to write to
+    """
+    if output_format == "tsv":
+        head = "name\thost\tproject_id\tactive\n"
+        separator, tail, empty = "\n", "\n", ""
+
+        def row(name: str, project: ProjectConfig, active: bool) -> str:
+            state = "true" if active else "false"
+            return f"{name}\t{project.host}\t{project.project_id}\t{state}"
+    else:
+        if output_format == "json":
+            head, separator, tail, empty = "[\n", ",\n", "\n]\n", "]\n"
+        else:
+            head, separator, tail, empty = "", "\n", "\n", ""
+
+        # Same text as json.dumps of the record, without building a dict
+        # and going through the general encoder for every row
+        def row(name: str, project: ProjectConfig, active: bool) -> str:
+            return (
+                f'{{"name": {encode_string(name)}, '
+                f'"host": {encode_string(project.host)}, '
+                f'"project_id": {project.project_id}, '
+                f'"active": {"true" if active else "false"}}}'
+            )
+
+    profiles = config.profiles
+    try:
+        stream.write(head)
+        chunk = []
+        written = False
+        for name in names:
+            chunk.append(row(name, profiles[name], name == active_project))
+            if len(chunk) == LIST_CHUNK_ROWS:
+                stream.write((separator if written else "") + separator.join(chunk))
+                chunk.clear()
+                written = True
+        if chunk:
+            stream.write((separator if written else "") + separator.join(chunk))
+            written = True
+        stream.write(tail if written else empty)
+        stream.flush()
+    except BrokenPipeError:
+        # Stop writing to a closed pipe, and keep the interpreter's final
+        # flush of stdout from raising again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+
+
+def format_project_list(
+    config: DbtSwitchConfig,
+    active_project: str | None,
+    order: list[str] | None = None,
+    names: Iterable[str] | None = None,
+) -> list[str]:
+    """
+    Render the `dbt-switch list` output.
+    Args:
+        config: Loaded dbt-switch configuration
+        active_project: Name of the active project, if known
+        order: Project names to list first, in this order (names that are
+          no longer configured are ignored)
+        names: Project names to list, in order, e.g. from select_profiles;
+          replaces order (default: every project)
+    Returns:
+        list[str]: Output lines
+    """
+    if names is None:
+        names = config.profiles.keys()
+        if order:
+            first = [name for name in dict.fromkeys(order) if name in config.profiles]
+            chosen = set(first)
+            names = first + [name for name in names if name not in chosen]
+
+    lines = ["Available projects:"]
+    for project_name in names:
+        project_config = config.profiles[project_name]
         active_marker = " [ACTIVE]" if project_name == active_project else ""
         prefix = "  * " if project_name == active_project else "    "
-        print(
+        lines.append(
             f"{prefix}{project_name:<12} ({project_config.host}, ID: {project_config.project_id}){active_marker}"
         )
+    return lines
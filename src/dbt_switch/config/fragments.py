@@ -0,0 +1,83 @@
+"""
+Profile fragments in a `dbt_switch.d/` directory next to dbt_switch.yml.
+
+Every `*.yml` file there holds a `profiles:` mapping in the dbt_switch.yml
+format, for example the shared profiles a platform team ships alongside
+each engineer's own dbt_switch.yml. Fragments are read in file name order
+after dbt_switch.yml and merged into one configuration; each one is parsed,
+validated and cached on its own by the config loader, so changing one
+fragment re-parses only that file.
+
+Anything derived from the merged configuration (the `current` record, the
+auto-switch memo, the name index, the daemon's copy) is keyed on
+sources_key() rather than on dbt_switch.yml's stat alone. Only the standard
+library (plus the stdlib-only cache helpers) is imported here.
+"""
+
+import os
+from pathlib import Path
+
+from dbt_switch.config.cache import stat_key
+
+FRAGMENT_DIR_NAME = "dbt_switch.d"
+FRAGMENT_SUFFIX = ".yml"
+
+
+def fragment_dir(config_file: Path) -> Path:
+    """
+    Location of the fragment directory for a dbt_switch.yml file.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        Path: `<dir>/dbt_switch.d`
+    """
+    return config_file.parent / FRAGMENT_DIR_NAME
+
+
+def fragment_paths(config_file: Path) -> list[Path]:
+    """
+    The fragment files, in the order they are merged.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        list[Path]: `dbt_switch.d/*.yml` sorted by name, hidden files
+        excluded; empty if the directory does not exist
+    """
+    try:
+        with os.scandir(fragment_dir(config_file)) as entries:
+            names = [
+                entry.name
+                for entry in entries
+                if entry.name.endswith(FRAGMENT_SUFFIX)
+                and not entry.name.startswith(".")
+                and entry.is_file()
+            ]
+    except OSError:
+        return []
+    directory = fragment_dir(config_file)
+    return [directory / name for name in sorted(names)]
+
+
+def sources_key(config_file: Path) -> list[int] | None:
+    """
+    Cache key covering dbt_switch.yml and every fragment.
+    Without a fragment directory this is stat_key(config_file), so caches
+    recorded before fragments existed stay valid. Otherwise the stat keys
+    of dbt_switch.yml, the directory (which changes when a fragment is
+    added, removed or renamed) and each fragment are concatenated behind
+    their newest mtime, which keeps is_settled() meaningful.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        list[int] | None: The key, or None if dbt_switch.yml is missing
+    """
+    key = stat_key(config_file)
+    if key is None:
+        return None
+    dir_key = stat_key(fragment_dir(config_file))
+    if dir_key is None:
+        return key
+    keys = [key, dir_key]
+    for path in fragment_paths(config_file):
+        keys.append(stat_key(path) or [0, 0, 0])
+    return [max(k[0] for k in keys)] + [value for k in keys for value in k]
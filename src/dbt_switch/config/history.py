@@ -0,0 +1,147 @@
+"""
+Switch history behind `dbt-switch -`, `dbt-switch history` and the
+most-recently-used ordering of `list --recent` and tab completion.
+
+Every switch appends one "<unix time>\t<name>" line to
+`.dbt_switch_history` next to dbt_switch.yml. Readers walk the file
+backwards in fixed-size blocks and stop as soon as they have enough
+distinct names, so finding the previous project reads the last block
+however long the history is. Once the file outgrows COMPACT_BYTES it is
+rewritten to the most recent use of each of the last KEEP_ENTRIES
+distinct names. The recent names are also written to
+`.dbt_switch_cache/recent.txt` for the completion scripts.
+
+Only the standard library (plus the stdlib-only cache helpers) is imported
+here.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from dbt_switch.config.cache import CACHE_DIR_NAME, write_cache_text
+
+HISTORY_FILE_NAME = ".dbt_switch_history"
+RECENT_FILE_NAME = "recent.txt"
+# Project reference that means "the project before the current one"
+PREVIOUS = "-"
+COMPACT_BYTES = 64 * 1024
+KEEP_ENTRIES = 200
+RECENT_NAMES = 20
+TAIL_BLOCK = 4096
+
+
+def history_path(config_file: Path) -> Path:
+    """
+    Location of the switch history for a dbt_switch.yml file.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        Path: `<dir>/.dbt_switch_history`
+    """
+    return config_file.parent / HISTORY_FILE_NAME
+
+
+def recent_path(config_file: Path) -> Path:
+    """
+    Location of the recent names read by the completion scripts.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        Path: `<dir>/.dbt_switch_cache/recent.txt`
+    """
+    return config_file.parent / CACHE_DIR_NAME / RECENT_FILE_NAME
+
+
+def _parse(line: bytes) -> tuple[int, str] | None:
+    try:
+        stamp, name = line.decode().split("\t", 1)
+        return int(stamp), name.strip()
+    except ValueError:
+        return None
+
+
+def read_recent(config_file: Path, limit: int) -> list[tuple[int, str]]:
+    """
+    The most recent use of up to `limit` distinct projects.
+    Reads backwards from the end of the history one block at a time.
+    Args:
+        config_file: Path to dbt_switch.yml
+        limit: Maximum number of projects
+    Returns:
+        list[tuple[int, str]]: (unix time, project name), newest first
+    """
+    recent = []
+    seen = set()
+    try:
+        file = open(history_path(config_file), "rb")
+    except OSError:
+        return recent
+    with file:
+        position = file.seek(0, os.SEEK_END)
+        partial = b""
+        while position > 0 and len(recent) < limit:
+            size = min(TAIL_BLOCK, position)
+            position -= size
+            file.seek(position)
+            lines = (file.read(size) + partial).split(b"\n")
+            # The first line may continue in the block before this one
+            partial = lines.pop(0) if position > 0 else b""
+            for line in reversed(lines):
+                entry = _parse(line)
+                if entry is None or entry[1] in seen:
+                    continue
+                seen.add(entry[1])
+                recent.append(entry)
+                if len(recent) == limit:
+                    break
+    return recent
+
+
+def previous_project(config_file: Path) -> str | None:
+    """
+    The project used before the most recent switch, for `dbt-switch -`.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        str | None: Project name, or None if fewer than two projects were used
+    """
+    recent = read_recent(config_file, 2)
+    return recent[1][1] if len(recent) == 2 else None
+
+
+def _compact(config_file: Path) -> None:
+    """Rewrite the history to the last use of each of the KEEP_ENTRIES newest names."""
+    path = history_path(config_file)
+    lines = [
+        f"{stamp}\t{name}\n"
+        for stamp, name in reversed(read_recent(config_file, KEEP_ENTRIES))
+    ]
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as file:
+            file.writelines(lines)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def record_switch(config_file: Path, name: str) -> None:
+    """
+    Append a switch to the history, compacting it when it has grown too
+    large. The caller holds file_lock(dbt_cloud.yml), which serializes
+    switches. Failures are ignored: history is a convenience.
+    Args:
+        config_file: Path to dbt_switch.yml
+        name: Project switched to
+    """
+    try:
+        with open(history_path(config_file), "a") as file:
+            file.write(f"{int(time.time())}\t{name}\n")
+            size = file.tell()
+    except OSError:
+        return
+    if size > COMPACT_BYTES:
+        _compact(config_file)
+    names = [name for _, name in read_recent(config_file, RECENT_NAMES)]
+    write_cache_text(recent_path(config_file), "".join(f"{name}\n" for name in names))
@@ -0,0 +1,152 @@
+"""
+Record readers for `dbt-switch import`.
+
+Each reader streams project records from a file as dicts with `name`,
+`host`, `project_id` and a `location` string ("file:line") used to point at
+the offending row in error reports. CSV and JSON Lines are read row by row;
+a JSON file is one document holding an array of records; YAML is a single
+mapping, either dbt_switch.yml-shaped (`profiles:`) or a bare
+`name: {host, project_id}` mapping.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Iterator
+
+from dbt_switch.config.yaml_io import YAMLError, load_yaml
+
+IMPORT_FORMATS = ("csv", "json", "jsonl", "yaml")
+
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "json",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+}
+_NAME_KEYS = ("name", "project", "project_name", "project-name")
+_ID_KEYS = ("project_id", "project-id")
+
+
+def detect_format(path: Path) -> str:
+    """
+    Guess the import format from a file suffix.
+    Args:
+        path: File to import
+    Returns:
+        str: One of IMPORT_FORMATS
+    Raises:
+        ValueError: If the suffix is not recognised
+    """
+    fmt = _SUFFIX_FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(
+            f"Cannot infer the format of '{path.name}'. "
+            f"Use --format with one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    return fmt
+
+
+def _first(fields: dict, keys: tuple[str, ...]):
+    """Return the first present value among alternative column names."""
+    for key in keys:
+        if fields.get(key) not in (None, ""):
+            return fields[key]
+    return None
+
+
+def _record(fields: dict, location: str) -> dict:
+    """Normalize one row into the record shape import_configs expects."""
+    if not isinstance(fields, dict):
+        raise ValueError(f"{location}: expected a mapping, got {type(fields).__name__}")
+    return {
+        "name": _first(fields, _NAME_KEYS),
+        "host": fields.get("host"),
+        "project_id": _first(fields, _ID_KEYS),
+        "location": location,
+    }
+
+
+def _read_csv(path: Path) -> Iterator[dict]:
+    with open(path, "r", newline="") as file:
+        reader = csv.DictReader(file)
+        try:
+            for row in reader:
+                yield _record(row, f"{path.name}:{reader.line_num}")
+        except csv.Error as e:
+            raise ValueError(f"{path.name}:{reader.line_num}: {e}") from e
+
+
+def _read_jsonl(path: Path) -> Iterator[dict]:
+    with open(path, "r") as file:
+        for line_num, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            location = f"{path.name}:{line_num}"
+            try:
+                fields = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{location}: invalid JSON: {e}") from e
+            yield _record(fields, location)
+
+
+def _read_json(path: Path) -> Iterator[dict]:
+    with open(path, "r") as file:
+        try:
+            data = json.load(file)
+        except ValueError as e:
+            raise ValueError(f"{path.name}: invalid JSON: {e}") from e
+    if not isinstance(data, list):
+        raise ValueError(
+            f"{path.name}: expected an array of projects "
+            "(use --format jsonl for one object per line)"
+        )
+    for index, fields in enumerate(data):
+        yield _record(fields, f"{path.name}:[{index}]")
+
+
+def _read_yaml(path: Path) -> Iterator[dict]:
+    with open(path, "r") as file:
+        try:
+            data = load_yaml(file) or {}
+        except YAMLError as e:
+            raise ValueError(f"{path.name}: invalid YAML: {e}") from e
+    if isinstance(data, dict) and isinstance(data.get("profiles"), dict):
+        data = data["profiles"]
+    if not isinstance(data, dict):
+        raise ValueError(f"{path.name}: expected a mapping of project names")
+
+    for name, fields in data.items():
+        record = _record(fields, f"{path.name}:{name}")
+        record["name"] = name
+        yield record
+
+
+_READERS = {
+    "csv": _read_csv,
+    "json": _read_json,
+    "jsonl": _read_jsonl,
+    "yaml": _read_yaml,
+}
+
+
+def iter_import_records(path: Path, fmt: str | None = None) -> Iterator[dict]:
+    """
+    Stream project records from an import file.
+    Args:
+        path: CSV, JSON, JSON Lines or YAML file
+        fmt: Explicit format, otherwise detected from the suffix
+    Returns:
+        Iterator[dict]: Records with name, host, project_id and location
+    Raises:
+        ValueError: If the format is unknown or a row cannot be decoded
+    """
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt not in _READERS:
+        raise ValueError(
+            f"Unknown import format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    return _READERS[fmt](path)
@@ -3,15 +3,32 @@ Input handler for the dbt_switch.yml file. This includes all operations that
 take input from the user which leads to some action on the dbt_switch.yml file.
 """
 
-from dbt_switch.utils.logger import logger
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from dbt_switch.utils.logger import logger, logging_to_stderr
+from dbt_switch.config import file_handler
 from dbt_switch.config.file_handler import (
     add_config,
+    import_configs,
     update_project,
     delete_project_config,
     list_all_projects,
     display_project_config,
 )
-from dbt_switch.config.cloud_handler import switch_project
+from dbt_switch.config.cloud_handler import (
+    auto_switch,
+    discover_from_cloud,
+    get_current_project,
+    project_env,
+    switch_project,
+    sync_from_cloud,
+)
+
+# Modules used by a single subcommand (merge, current, env, history, import)
+# are imported inside its handler, so `-p`, `add` and `list` don't load them.
 
 
 def add_user_config(
@@ -79,6 +96,231 @@ def add_user_config(
             raise
 
 
+def import_user_config(
+    path: str, fmt: str | None = None, on_conflict: str = "fail"
+) -> bool:
+    """
+    Bulk import project configurations from a CSV, JSON, JSON Lines or YAML file.
+    Args:
+        path: File to import
+        fmt: Explicit format (csv, json, jsonl, yaml); detected from the suffix
+          if None
+        on_conflict: skip, replace or fail when a name or project ID exists
+    Returns:
+        bool: True if the import was applied
+    """
+    from dbt_switch.config.import_reader import iter_import_records
+
+    try:
+        records = iter_import_records(path, fmt)
+    except ValueError as e:
+        logger.error(f"Import failed: {e}")
+        return False
+
+    try:
+        import_configs(records, on_conflict=on_conflict)
+    except ValueError:
+        # import_configs has already logged the full report
+        return False
+    except OSError as e:
+        logger.error(f"Could not read '{path}': {e}")
+        return False
+    return True
+
+
+def sync_user_config() -> bool:
+    """
+    Create or refresh dbt_switch.yml profiles from the dbt_cloud.yml projects list.
+    Returns:
+        bool: True if the sync completed
+    """
+    try:
+        sync_from_cloud()
+    except (ValueError, ValidationError):
+        # The handlers have already logged the reason
+        return False
+    return True
+
+
+def merge_user_config(files: list[str], output: Path) -> bool:
+    """
+    Merge downloaded dbt_cloud.yml files into one.
+    Args:
+        files: Input files, in priority order
+        output: File to write (kept and extended if it exists)
+    Returns:
+        bool: True if the output was written
+    """
+    from dbt_switch.config.cloud_merge import merge_cloud_files
+
+    try:
+        counts = merge_cloud_files([Path(file) for file in files], output)
+    except ValueError as e:
+        logger.error(f"Merge failed:\n{e}")
+        return False
+    logger.info(
+        f"Merged {counts['projects']} project(s) from {counts['files']} file(s) "
+        f"into {output} ({counts['duplicates']} duplicate(s) dropped)"
+    )
+    return True
+
+
+def discover_user_config(timeout: float = 10.0) -> bool:
+    """
+    Add every project the dbt_cloud.yml tokens can see to dbt_cloud.yml and
+    dbt_switch.yml.
+    Args:
+        timeout: Seconds allowed per API request
+    Returns:
+        bool: True if every account could be queried
+    """
+    try:
+        result = discover_from_cloud(timeout)
+    except (ValueError, ValidationError) as e:
+        logger.error(f"Discover failed: {e}")
+        return False
+    for error in result["errors"]:
+        logger.error(f"✗ {error}")
+    return not result["errors"]
+
+
+def show_current_project(fmt: str = "name") -> bool:
+    """
+    Print the active project's name, host or project ID.
+    Nothing is printed when no profile matches the active context, so the
+    output can be embedded in a shell prompt as is.
+    Args:
+        fmt: One of "name", "host" or "id"
+    Returns:
+        bool: True if a value was printed
+    """
+    from dbt_switch.config.current import format_current
+
+    info = get_current_project()
+    if info is None:
+        logger.error("Could not read dbt_cloud.yml file")
+        return False
+    value = format_current(info, fmt)
+    if value is None:
+        return False
+    print(value)
+    return True
+
+
+def print_project_env(project: str | None, shell: str, unset: bool = False) -> bool:
+    """
+    Print shell statements that select a project for the current shell,
+    or that drop the selection again with unset=True.
+    Args:
+        project: Project name or project ID (ignored with unset)
+        shell: "sh" or "fish"
+        unset: Print statements that remove the variables instead
+    Returns:
+        bool: True if statements were printed
+    """
+    from dbt_switch.utils.shell import ENV_VARS, format_exports, format_unsets
+
+    if unset:
+        print(format_unsets(ENV_VARS, shell), end="")
+        return True
+    if not project:
+        logger.error("Must specify a project name or ID")
+        return False
+
+    try:
+        env = project_env(project.strip())
+    except ValueError as e:
+        logger.error(str(e))
+        return False
+    # Clear any account ID left over from a previously selected project
+    stale = [name for name in ENV_VARS if name not in env]
+    if stale:
+        print(format_unsets(stale, shell), end="")
+    print(format_exports(env, shell), end="")
+    return True
+
+
+def auto_switch_user_config() -> bool:
+    """
+    Switch to the project that the working directory belongs to, if any.
+    Silent when there is nothing to do, so it can run from a `cd` hook.
+    Returns:
+        bool: False if the directory names a project that is not configured
+        or the switch failed
+    """
+    try:
+        auto_switch()
+    except ValueError as e:
+        logger.error(f"dbt-switch auto: {e}")
+        return False
+    return True
+
+
+def doctor_user_config(probe: bool = False, timeout: float = 5.0) -> bool:
+    """
+    Report every profile that does not match dbt_cloud.yml and, with probe,
+    every profile on a host that does not answer.
+    Args:
+        probe: Also check that each host is reachable
+        timeout: Seconds allowed per host when probing
+    Returns:
+        bool: True if no problems were found
+    """
+    # http.client loads ssl, which the other commands never need
+    from dbt_switch.config.doctor import diagnose
+
+    try:
+        problems = diagnose(probe, timeout)
+    except ValueError as e:
+        logger.error(str(e))
+        return False
+    if not problems:
+        logger.info("✓ All projects match dbt_cloud.yml")
+        return True
+    for project, message in problems:
+        logger.error(f"✗ {project}: {message}")
+    projects = len({project for project, _ in problems})
+    logger.error(f"Found {len(problems)} problem(s) in {projects} project(s)")
+    return False
+
+
+def validate_user_config(path: Path | None = None) -> bool:
+    """
+    Report every problem in a dbt_switch.yml file, with line numbers.
+    Without a path, the configured dbt_switch.yml and its dbt_switch.d
+    fragments are checked, including profiles that clash across files.
+    Args:
+        path: File to check (default: the configured dbt_switch.yml)
+    Returns:
+        bool: True if every file is valid
+    """
+    from dbt_switch.config.validate import (
+        validate_switch_file,
+        validate_switch_sources,
+    )
+
+    try:
+        if path is not None:
+            results = [(Path(path), validate_switch_file(Path(path)))]
+        else:
+            results = validate_switch_sources(file_handler.CONFIG_FILE)
+    except ValueError as e:
+        logger.error(str(e))
+        return False
+
+    valid = True
+    for path, problems in results:
+        if not problems:
+            logger.info(f"✓ {path} is valid")
+            continue
+        valid = False
+        for line, location, message in problems:
+            where = f"{path}:{line}" if line is not None else str(path)
+            logger.error(f"✗ {where}: {location + ': ' if location else ''}{message}")
+        logger.error(f"Found {len(problems)} problem(s) in {path}")
+    return valid
+
+
 def update_user_config(arg: str):
     """
     Update a project host or project_id in the dbt_switch.yml file.
@@ -151,12 +393,49 @@ def switch_user_config(project_name: str):
         raise
 
 
-def list_projects():
+def list_projects(
+    recent: bool = False,
+    output_format: str = "text",
+    host: str | None = None,
+    match: str | None = None,
+    limit: int | None = None,
+):
     """
     Wrapper function to list all projects. This is done to fit the
     module architecture and to keep the import in file_handler.py consistent.
+    Args:
+        recent: List the most recently used projects first
+        output_format: "text", "json", "jsonl" or "tsv"
+        host: Only list projects on this host
+        match: Only list projects whose name matches this glob or prefix
+        limit: List at most this many projects
+    """
+    if output_format == "text":
+        list_all_projects(recent, output_format, host, match, limit)
+        return
+    # stdout is meant for another program, so keep messages out of it
+    with logging_to_stderr():
+        list_all_projects(recent, output_format, host, match, limit)
+
+
+def show_history(limit: int = 10) -> bool:
+    """
+    Print the most recently used projects, newest first.
+    Args:
+        limit: Maximum number of projects
+    Returns:
+        bool: True if there was any history to print
     """
-    list_all_projects()
+    from dbt_switch.config.history import read_recent
+
+    entries = read_recent(file_handler.CONFIG_FILE, limit)
+    if not entries:
+        logger.info("No switch history yet. Switch with 'dbt-switch -p PROJECT'.")
+        return False
+    for position, (stamp, name) in enumerate(entries, start=1):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(stamp))
+        print(f"{position:>3}  {name:<20} {when}")
+    return True
 
 
 def update_user_config_interactive(project_name: str):
@@ -0,0 +1,249 @@
+"""
+Whole-file validation of dbt_switch.yml for `dbt-switch validate`.
+
+Loading a config stops at the first failing validator, which is right for
+commands but slow to work through on a large hand-edited file. Here the
+YAML is composed once, keeping the line of every key and value, and each
+rule then runs once over the whole file: every name against the precompiled
+PROJECT_NAME_PATTERN, every host and project_id in a single pydantic
+validation of the profiles mapping (which collects all field errors), and
+every project ID through one dict keyed on the ID. Names repeated in the
+YAML, which the loader would silently collapse into one profile, are found
+from the mapping's nodes. The work is linear in the size of the file.
+
+validate_switch_sources() runs the same checks over dbt_switch.yml and each
+dbt_switch.d fragment, then carries one name index and one project ID index
+across the valid files, in the order the loader merges them, to report the
+profiles that the loader would skip as clashes.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Dict
+
+from pydantic import TypeAdapter, ValidationError
+from yaml.nodes import MappingNode, Node, ScalarNode
+
+from dbt_switch.config.fragments import fragment_paths
+from dbt_switch.config.yaml_io import YAMLError, compose_yaml
+from dbt_switch.validation.schemas import (
+    ProjectConfig,
+    duplicate_project_ids,
+    invalid_name_message,
+    invalid_project_names,
+)
+
+# A problem is a (1-based line or None, location, message) triple
+Problem = tuple[int | None, str, str]
+
+_PROFILES = TypeAdapter(Dict[str, ProjectConfig])
+
+
+def _line(node: Node | None) -> int | None:
+    return node.start_mark.line + 1 if node is not None else None
+
+
+def _key_node(mapping: Node, key: str) -> tuple[Node, Node] | None:
+    """Last (key node, value node) pair for a scalar key, as YAML resolves it."""
+    found = None
+    if isinstance(mapping, MappingNode):
+        for key_node, value_node in mapping.value:
+            if isinstance(key_node, ScalarNode) and key_node.value == key:
+                found = (key_node, value_node)
+    return found
+
+
+def _project_id(value) -> int | None:
+    """The project ID pydantic would accept for a raw value, if any."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _no_line(name, field=None) -> None:
+    return None
+
+
+def _check_text(text: str | bytes) -> tuple[list[Problem], dict, Callable]:
+    """
+    Problems of one document, its raw profiles mapping, and a function
+    giving the line of a profile (or of one of its fields).
+    """
+    try:
+        root, data = compose_yaml(text)
+    except YAMLError as e:
+        mark = getattr(e, "problem_mark", None)
+        reason = getattr(e, "problem", None) or str(e)
+        problem = (mark.line + 1 if mark else None, "", f"Invalid YAML: {reason}")
+        return [problem], {}, _no_line
+    if root is None:
+        problem = (None, "", "File is empty; expected a 'profiles' mapping")
+        return [problem], {}, _no_line
+    if not isinstance(data, dict):
+        problem = (_line(root), "", "Expected a mapping with a 'profiles' key")
+        return [problem], {}, _no_line
+    if "profiles" not in data:
+        return [], {}, _no_line
+
+    profiles_key, profiles_node = _key_node(root, "profiles")
+    profiles = data["profiles"]
+    if not isinstance(profiles, dict):
+        problem = (_line(profiles_node), "profiles", "Expected a mapping of projects")
+        return [problem], {}, _no_line
+
+    problems = []
+    # Lines of each profile key and of each of its fields
+    name_lines = {}
+    field_lines = {}
+    for key_node, value_node in profiles_node.value:
+        name = key_node.value if isinstance(key_node, ScalarNode) else None
+        line = _line(key_node)
+        if name is not None and name in name_lines:
+            problems.append(
+                (
+                    line,
+                    f"profiles.{name}",
+                    f"Project '{name}' is defined more than once "
+                    f"(also on line {name_lines[name]}); only the last one is used",
+                )
+            )
+        name_lines[name] = line
+        if isinstance(value_node, MappingNode):
+            for field_node, field_value in value_node.value:
+                if isinstance(field_node, ScalarNode):
+                    field_lines[(name, field_node.value)] = _line(field_value)
+
+    def line_of(name, field=None) -> int | None:
+        key = str(name) if name is not None else None
+        if field is not None and (key, field) in field_lines:
+            return field_lines[(key, field)]
+        return name_lines.get(key, _line(profiles_key))
+
+    for name in invalid_project_names(profiles):
+        if not isinstance(name, str) or not name.strip():
+            message = "Project name must be a non-empty string."
+        else:
+            message = invalid_name_message(name)
+        problems.append((line_of(name), f"profiles.{name}", message))
+
+    try:
+        _PROFILES.validate_python(profiles)
+    except ValidationError as e:
+        for error in e.errors():
+            loc = error["loc"]
+            if "[key]" in loc:
+                # Names are reported by the pass above
+                continue
+            name = loc[0]
+            field = str(loc[1]) if len(loc) > 1 else None
+            location = f"profiles.{name}" + (f".{field}" if field else "")
+            message = error["msg"].removeprefix("Value error, ")
+            problems.append((line_of(name, field), location, message))
+
+    ids = []
+    for name, project in profiles.items():
+        project_id = (
+            _project_id(project.get("project_id"))
+            if isinstance(project, dict)
+            else None
+        )
+        if project_id is not None:
+            ids.append((name, project_id))
+    for project_id, names in duplicate_project_ids(ids).items():
+        for name in names[1:]:
+            problems.append(
+                (
+                    line_of(name, "project_id"),
+                    f"profiles.{name}.project_id",
+                    f"Project ID {project_id} is already used by '{names[0]}' "
+                    f"(line {line_of(names[0], 'project_id')})",
+                )
+            )
+
+    problems.sort(key=lambda problem: problem[0] or 0)
+    return problems, profiles, line_of
+
+
+def validate_switch_text(text: str | bytes) -> list[Problem]:
+    """
+    Check a dbt_switch.yml document and report every problem in it.
+    Args:
+        text: File contents
+    Returns:
+        list[Problem]: All problems, in line order; empty if the file is valid
+    """
+    return _check_text(text)[0]
+
+
+def _read(path: Path) -> bytes:
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError as e:
+        raise ValueError(f"Could not read {path}: {e.strerror or e}") from e
+
+
+def validate_switch_file(path: Path) -> list[Problem]:
+    """
+    Check a dbt_switch.yml file and report every problem in it.
+    Args:
+        path: File to check
+    Returns:
+        list[Problem]: All problems, in line order; empty if the file is valid
+    Raises:
+        ValueError: If the file cannot be read
+    """
+    return validate_switch_text(_read(path))
+
+
+def validate_switch_sources(config_file: Path) -> list[tuple[Path, list[Problem]]]:
+    """
+    Check dbt_switch.yml and every dbt_switch.d fragment, including the
+    profiles of a valid fragment that clash with an earlier file.
+    Args:
+        config_file: Path to dbt_switch.yml
+    Returns:
+        list[tuple[Path, list[Problem]]]: Each file with its problems, in
+        merge order
+    Raises:
+        ValueError: If a file cannot be read
+    """
+    results = []
+    # Name -> file, and project ID -> (name, file), over the files merged so far
+    names = {}
+    ids = {}
+    for path in [config_file, *fragment_paths(config_file)]:
+        problems, profiles, line_of = _check_text(_read(path))
+        results.append((path, problems))
+        if problems:
+            # The loader skips an invalid file as a whole
+            continue
+        for name, project in profiles.items():
+            name = str(name)
+            project_id = _project_id(project.get("project_id"))
+            if name in names:
+                problems.append(
+                    (
+                        line_of(name),
+                        f"profiles.{name}",
+                        f"Project '{name}' is already defined in {names[name]}",
+                    )
+                )
+            elif project_id in ids:
+                owner, owner_path = ids[project_id]
+                problems.append(
+                    (
+                        line_of(name, "project_id"),
+                        f"profiles.{name}.project_id",
+                        f"Project ID {project_id} is already used by '{owner}' "
+                        f"in {owner_path}",
+                    )
+                )
+            else:
+                names[name] = path
+                ids[project_id] = (name, path)
+    return results
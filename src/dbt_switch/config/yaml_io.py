@@ -0,0 +1,67 @@
+"""
+YAML I/O layer shared by every config read and write path.
+
+Uses PyYAML's libyaml-backed CSafeLoader/CSafeDumper when PyYAML was built
+with libyaml, and the pure-Python SafeLoader/SafeDumper otherwise. Both
+backends are called with the same options so they produce identical output.
+"""
+
+import yaml
+from yaml import YAMLError
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    YAML_BACKEND = "python"
+
+__all__ = ["YAML_BACKEND", "YAMLError", "compose_yaml", "dump_yaml", "load_yaml"]
+
+
+def load_yaml(stream, loader=None):
+    """
+    Parse a YAML document with the safe loader.
+    Args:
+        stream: File object or string
+        loader: Loader class override (defaults to the fastest safe loader)
+    Returns:
+        The parsed Python object
+    """
+    return yaml.load(stream, Loader=loader or SafeLoader)
+
+
+def compose_yaml(stream, loader=None):
+    """
+    Parse a YAML document with the safe loader, keeping its node graph.
+    The nodes carry the position of every key and value, for error messages.
+    Args:
+        stream: File object, string or bytes
+        loader: Loader class override (defaults to the fastest safe loader)
+    Returns:
+        tuple: (root node, parsed Python object); (None, None) if empty
+    """
+    parser = (loader or SafeLoader)(stream)
+    try:
+        root = parser.get_single_node()
+        return root, parser.construct_document(root) if root is not None else None
+    finally:
+        parser.dispose()
+
+
+def dump_yaml(data, stream=None, dumper=None):
+    """
+    Serialize data as block-style YAML with the safe dumper.
+    Args:
+        data: Plain Python data (dicts, lists, str, int)
+        stream: File object to write to; returns a string when omitted
+        dumper: Dumper class override (defaults to the fastest safe dumper)
+    Returns:
+        str | None: The YAML text when no stream is given
+    """
+    return yaml.dump(
+        data, stream, Dumper=dumper or SafeDumper, default_flow_style=False
+    )
@@ -0,0 +1,8 @@
+"""
+Optional resident daemon (`dbt-switch serve`) and its thin client.
+
+The server keeps dbt_switch.yml parsed and indexed in memory and answers
+JSON-lines requests over a Unix domain socket. The client is imported by the
+entry point before click, so forwarding a request costs little more than
+interpreter startup.
+"""
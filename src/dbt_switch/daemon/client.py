@@ -0,0 +1,94 @@
+"""
+Thin client for the dbt-switch daemon.
+
+`forward()` is called by the entry point before click is imported. It
+recognizes the commands the daemon can answer, sends them over the socket,
+and returns an exit code; in every other case (no socket, stale socket,
+unsupported command, DBT_SWITCH_NO_DAEMON set) it returns None and the
+normal in-process path runs instead.
+"""
+
+import os
+import socket
+import sys
+
+from dbt_switch.daemon.protocol import (
+    NO_DAEMON_ENV_VAR,
+    decode,
+    encode,
+    socket_path,
+)
+
+CONNECT_TIMEOUT = 2.0
+
+
+def request(message: dict, path=None, timeout: float = CONNECT_TIMEOUT) -> dict:
+    """
+    Send one request to the daemon and wait for its response.
+    Args:
+        message: Request object with an "op"
+        path: Socket path (defaults to socket_path())
+        timeout: Seconds to wait for the connection and the reply
+    Returns:
+        dict: The response object
+    Raises:
+        OSError: If the daemon is not reachable or closes the connection
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path or socket_path()))
+        sock.sendall(encode(message))
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("dbt-switch daemon closed the connection")
+    return decode(line)
+
+
+def parse_argv(argv: list[str]) -> dict | None:
+    """
+    Map a command line onto a daemon request, if the daemon can answer it.
+    Args:
+        argv: Arguments after the program name
+    Returns:
+        dict | None: The request, or None to run the command in-process
+    """
+    if len(argv) == 2 and argv[0] in ("-p", "--project"):
+        return {"op": "switch", "project": argv[1]}
+    if len(argv) == 1 and argv[0].startswith("--project="):
+        return {"op": "switch", "project": argv[0].split("=", 1)[1]}
+    if argv == ["list"]:
+        return {"op": "list"}
+    return None
+
+
+def forward(argv: list[str]) -> int | None:
+    """
+    Run a command through the daemon when one is listening.
+    Args:
+        argv: Arguments after the program name
+    Returns:
+        int | None: Exit code, or None if the caller should run the command itself
+    """
+    if os.environ.get(NO_DAEMON_ENV_VAR):
+        return None
+    message = parse_argv(argv)
+    if message is None:
+        return None
+    path = socket_path()
+    if not path.exists():
+        return None
+
+    try:
+        response = request(message, path)
+    except (OSError, ValueError):
+        # Stale socket or a daemon that went away: use the normal path
+        return None
+
+    if response.get("output"):
+        sys.stdout.write(response["output"])
+    if not response.get("ok"):
+        # Same stream as the logger on the in-process path
+        sys.stdout.write(f"{response.get('error', 'dbt-switch daemon error')}\n")
+        return 1
+    return 0
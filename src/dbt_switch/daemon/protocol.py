@@ -0,0 +1,49 @@
+"""
+Wire format shared by the daemon and its clients.
+
+One JSON object per line in each direction. Requests carry an "op" and its
+arguments; responses carry "ok", and either "output" (text for stdout) and
+optional "data", or "error". Only the standard library is imported here.
+
+    -> {"op": "switch", "project": "prod"}
+    <- {"ok": true, "output": "Successfully switched to project 'prod'\\n..."}
+"""
+
+import json
+import os
+from pathlib import Path
+
+SOCKET_ENV_VAR = "DBT_SWITCH_SOCKET"
+NO_DAEMON_ENV_VAR = "DBT_SWITCH_NO_DAEMON"
+SOCKET_NAME = ".dbt_switch.sock"
+
+OPS = ("ping", "switch", "list", "current", "lookup", "shutdown")
+
+
+def socket_path() -> Path:
+    """
+    Where the daemon listens: $DBT_SWITCH_SOCKET, else ~/.dbt/.dbt_switch.sock.
+    Returns:
+        Path: Socket path
+    """
+    override = os.environ.get(SOCKET_ENV_VAR)
+    if override:
+        return Path(override)
+    return Path.home() / ".dbt" / SOCKET_NAME
+
+
+def encode(message: dict) -> bytes:
+    """Serialize one message as a newline-terminated JSON line."""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    """
+    Parse one JSON line.
+    Raises:
+        ValueError: If the line is not a JSON object
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Expected a JSON object")
+    return message
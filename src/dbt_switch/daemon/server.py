@@ -0,0 +1,274 @@
+"""
+Resident dbt-switch server.
+
+Keeps dbt_switch.yml parsed (with its lookup indexes and dbt_switch.d
+fragments) and the active context of dbt_cloud.yml in memory. The files are
+re-stat'ed on every request and reloaded only when their (mtime, size, inode)
+changed, so edits made by hand
+or by the regular CLI are picked up without a file watcher. Writes go
+through the same locks and in-place context patch as the CLI.
+"""
+
+import os
+import signal
+import socket
+import socketserver
+import threading
+from pathlib import Path
+
+from dbt_switch.utils.logger import logger
+from dbt_switch.config import cloud_handler, file_handler
+from dbt_switch.config.atomic import file_lock
+from dbt_switch.config.cache import is_settled, stat_key
+from dbt_switch.config.current import record_current
+from dbt_switch.config.fragments import sources_key
+from dbt_switch.config.history import PREVIOUS, previous_project, record_switch
+from dbt_switch.daemon.protocol import OPS, decode, encode, socket_path
+
+
+class _Watched:
+    """
+    A value derived from files, reloaded when their stat key changes.
+    Files modified within the cache's racy window are reloaded on every
+    request, since a same-size rewrite in the same timestamp tick would
+    otherwise go unnoticed.
+    """
+
+    _UNSETTLED = object()
+
+    def __init__(self, key_getter, loader):
+        self._key_getter = key_getter
+        self._loader = loader
+        self.key = None
+        self.value = None
+
+    def _remember(self, key) -> None:
+        self.key = key if key is None or is_settled(key) else self._UNSETTLED
+
+    def get(self):
+        key = self._key_getter()
+        if key is None or key != self.key:
+            self.value = self._loader() if key is not None else None
+            self._remember(key)
+        return self.value
+
+    def set(self, value) -> None:
+        """Record a value this process just wrote, with the file's new stat."""
+        self.value = value
+        self._remember(self._key_getter())
+
+
+class DaemonState:
+    """In-memory configs and the request handlers that use them."""
+
+    def __init__(self):
+        self.switch_config = _Watched(
+            lambda: sources_key(file_handler.CONFIG_FILE),
+            lambda: file_handler.get_config(read_only=True),
+        )
+        self.context = _Watched(
+            lambda: stat_key(cloud_handler.DBT_CLOUD_FILE),
+            cloud_handler.read_active_context,
+        )
+        self._lock = threading.Lock()
+
+    def handle(self, message: dict) -> dict:
+        """
+        Answer one request.
+        Args:
+            message: Request object with an "op"
+        Returns:
+            dict: Response object
+        """
+        op = message.get("op")
+        if op not in OPS:
+            return {"ok": False, "error": f"Unknown op '{op}'"}
+        try:
+            with self._lock:
+                return getattr(self, f"_op_{op}")(message)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def _config(self):
+        config = self.switch_config.get()
+        if config is None:
+            raise ValueError("Configuration file not found or invalid.")
+        return config
+
+    def _active_project(self, config) -> str | None:
+        context = self.context.get()
+        if context is None:
+            return None
+        return config.find_profile(*context)
+
+    def _op_ping(self, message: dict) -> dict:
+        return {"ok": True, "data": {"pid": os.getpid()}}
+
+    def _op_shutdown(self, message: dict) -> dict:
+        return {"ok": True, "shutdown": True}
+
+    def _op_lookup(self, message: dict) -> dict:
+        config = self._config()
+        ref = str(message.get("project", ""))
+        name = config.resolve_profile(ref)
+        if name is None:
+            return {"ok": False, "error": f"Project '{ref}' not found in configuration"}
+        project = config.profiles[name]
+        return {
+            "ok": True,
+            "data": {
+                "name": name,
+                "host": project.host,
+                "project_id": project.project_id,
+            },
+        }
+
+    def _op_current(self, message: dict) -> dict:
+        config = self._config()
+        context = self.context.get()
+        if context is None:
+            return {"ok": False, "error": "Could not read dbt_cloud.yml file"}
+        name = config.find_profile(*context)
+        host, project_id = context
+        return {
+            "ok": True,
+            "output": f"{name}\n" if name else "",
+            "data": {"name": name, "host": host, "project_id": project_id},
+        }
+
+    def _op_list(self, message: dict) -> dict:
+        config = self._config()
+        if not config.profiles:
+            return {
+                "ok": True,
+                "output": "No projects configured. Run 'dbt-switch init' and "
+                "'dbt-switch add' to get started.\n",
+            }
+        lines = file_handler.format_project_list(config, self._active_project(config))
+        return {"ok": True, "output": "\n".join(lines) + "\n"}
+
+    def _op_switch(self, message: dict) -> dict:
+        ref = str(message.get("project", ""))
+        config = self._config()
+        if ref == PREVIOUS:
+            name = previous_project(file_handler.CONFIG_FILE)
+            if name is None:
+                return {
+                    "ok": False,
+                    "error": "Failed to switch to the previous project: "
+                    "No previous project in the switch history",
+                }
+            ref = name
+        name = config.resolve_profile(ref, prefix=True)
+        if name is None:
+            return {
+                "ok": False,
+                "error": f"Failed to switch to project '{ref}': "
+                f"{file_handler.unknown_project_message(config, ref)}",
+            }
+
+        project = config.profiles[name]
+        with file_lock(cloud_handler.DBT_CLOUD_FILE):
+            cloud_handler.set_active_context(project.host, str(project.project_id))
+            self.context.set((project.host, str(project.project_id)))
+            # Lets the next `current` answer without loading either file
+            record_current(
+                file_handler.CONFIG_FILE,
+                cloud_handler.DBT_CLOUD_FILE,
+                name,
+                project.host,
+                project.project_id,
+            )
+            record_switch(file_handler.CONFIG_FILE, name)
+
+        return {
+            "ok": True,
+            "output": (
+                f"Successfully switched to project '{name}'\n"
+                f"✓ Set active host: {project.host}\n"
+                f"✓ Set active project: {project.project_id}\n"
+            ),
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serve JSON-lines requests until the client closes the connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                message = decode(line)
+            except ValueError as e:
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            else:
+                response = self.server.state.handle(message)
+            self.wfile.write(encode(response))
+            self.wfile.flush()
+            if response.get("shutdown"):
+                # shutdown() blocks until serve_forever returns, so not here
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server sharing one DaemonState across connections."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, state: DaemonState | None = None):
+        self.path = Path(path)
+        self.state = state or DaemonState()
+        _claim_socket(self.path)
+        old_umask = os.umask(0o177)  # socket readable by the owner only
+        try:
+            super().__init__(str(self.path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _claim_socket(path: Path) -> None:
+    """
+    Remove a stale socket left by a daemon that died, but refuse to start
+    when another daemon is still answering on it.
+    Raises:
+        RuntimeError: If a daemon is already listening on path
+    """
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        path.unlink()
+    else:
+        raise RuntimeError(f"A dbt-switch daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: Path | None = None) -> None:
+    """
+    Run the daemon in the foreground until interrupted or asked to shut down.
+    Args:
+        path: Socket path (defaults to socket_path())
+    """
+    path = Path(path or socket_path())
+    # Stop cleanly (removing the socket) on `kill` as well as Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with DaemonServer(path) as server:
+        logger.info(f"dbt-switch daemon listening on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    logger.info("dbt-switch daemon stopped")
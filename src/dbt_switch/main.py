@@ -2,11 +2,42 @@
 Main entry point for dbt-switch.
 """
 
-from dbt_switch.cli.parser import cli
+import os
+import sys
 
 
 def main():
-    cli()
+    if sys.argv[1:] == ["-"]:
+        # `dbt-switch -` is shorthand for `dbt-switch -p -`
+        sys.argv[1:] = ["-p", "-"]
+
+    # `current` runs on every prompt render and `auto` on every cd; answer
+    # them from their caches without importing anything heavy.
+    from dbt_switch.config.auto_switch import fast_auto
+    from dbt_switch.config.current import fast_current
+
+    for fast_path in (fast_current, fast_auto):
+        exit_code = fast_path(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    # Hand the command to a running `dbt-switch serve` daemon before paying
+    # for click and the handlers; fall through when there is none.
+    from dbt_switch.daemon.client import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from dbt_switch.cli.parser import cli
+    from dbt_switch.utils.timing import PROFILE_ENV_VAR, run_profiled
+
+    profile_path = os.environ.get(PROFILE_ENV_VAR)
+    if profile_path:
+        # e.g. DBT_SWITCH_PROFILE=switch.prof dbt-switch -p prod
+        run_profiled(cli, profile_path)
+    else:
+        cli()
 
 
 if __name__ == "__main__":
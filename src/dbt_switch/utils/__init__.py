@@ -1,4 +1,15 @@
-from .logger import logger
-from .version_check import get_current_version
-
 __all__ = ["logger", "get_current_version"]
+
+
+def __getattr__(name):
+    # Resolved on first access so importing a utils submodule does not
+    # configure logging or load importlib.metadata as a side effect.
+    if name == "logger":
+        from .logger import logger
+
+        return logger
+    if name == "get_current_version":
+        from .version_check import get_current_version
+
+        return get_current_version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,28 +1,35 @@
 """
 Basic logger for CLI STDOUT output.
+
+Configured with a plain StreamHandler rather than logging.config.dictConfig,
+which pulls in a sizeable import graph. This module is only imported by the
+handlers that actually log, so commands such as `--version` never load it.
 """
 
-import logging.config
+import logging
 import sys
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
 
-logging_config = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "standard": {"format": "%(message)s"},
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "stream": sys.stdout,
-            "formatter": "standard",
-        }
-    },
-    "loggers": {
-        __name__: {"handlers": ["console"], "level": "INFO", "propagate": True}
-    },
-}
+if not logger.handlers:
+    _console = logging.StreamHandler(sys.stdout)
+    _console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_console)
+    logger.setLevel(logging.INFO)
 
-logging.config.dictConfig(logging_config)
 
-logger = logging.getLogger(__name__)
+@contextmanager
+def logging_to_stderr():
+    """
+    Send log output to stderr for the duration of the block, for commands
+    whose stdout is meant to be evaluated by the shell.
+    """
+    handlers = [h for h in logger.handlers if type(h) is logging.StreamHandler]
+    previous = [h.setStream(sys.stderr) for h in handlers]
+    try:
+        yield
+    finally:
+        for handler, stream in zip(handlers, previous):
+            if stream is not None:
+                handler.setStream(stream)
@@ -0,0 +1,237 @@
+"""
+Shell statements for `dbt-switch env`, and the `dbt-switch hook` and
+`dbt-switch completion` scripts.
+
+The variables below describe a project for the current shell only: the dbt
+Cloud CLI reads the DBT_CLOUD_* variables in preference to the context block
+of dbt_cloud.yml, and dbt-switch itself reads DBT_SWITCH_PROJECT for
+`current`. Only the standard library is imported here.
+"""
+
+import os
+import shlex
+
+PROJECT_VAR = "DBT_SWITCH_PROJECT"
+HOST_VAR = "DBT_CLOUD_HOST"
+PROJECT_ID_VAR = "DBT_CLOUD_PROJECT_ID"
+ACCOUNT_ID_VAR = "DBT_CLOUD_ACCOUNT_ID"
+ENV_VARS = (PROJECT_VAR, HOST_VAR, PROJECT_ID_VAR, ACCOUNT_ID_VAR)
+
+_HOOKS = {
+    "bash": """_dbt_switch_auto() {
+  if [ "$PWD" != "${_DBT_SWITCH_LAST_PWD:-}" ]; then
+    _DBT_SWITCH_LAST_PWD="$PWD"
+    dbt-switch auto
+  fi
+}
+case ";${PROMPT_COMMAND:-};" in
+  *";_dbt_switch_auto;"*) ;;
+  *) PROMPT_COMMAND="_dbt_switch_auto${PROMPT_COMMAND:+;$PROMPT_COMMAND}" ;;
+esac
+""",
+    "zsh": """_dbt_switch_auto() { dbt-switch auto }
+autoload -Uz add-zsh-hook
+add-zsh-hook chpwd _dbt_switch_auto
+_dbt_switch_auto
+""",
+    "fish": """function _dbt_switch_auto --on-variable PWD
+    dbt-switch auto
+end
+_dbt_switch_auto
+""",
+}
+
+# Completion scripts read profile names straight from the names file in the
+# cache directory, and only start dbt-switch (`completion --refresh`) when
+# dbt_switch.yml, the dbt_switch.d directory or one of its fragments is
+# newer than that file, or the file does not exist yet.
+# Recently used names (the recent file) that still exist are offered first,
+# and every name once. The bash script sticks to bash 3.2 (macOS /bin/bash):
+# no associative arrays, and compopt only where it exists.
+_COMPLETIONS = {
+    "bash": """_dbt_switch_refresh() {
+  local source
+  for source in @CONFIG@ @FRAGMENTS@ @FRAGMENTS@/*.yml; do
+    if [ "$source" -nt @NAMES@ ]; then
+      dbt-switch completion --refresh 2>/dev/null
+      break
+    fi
+  done
+}
+_dbt_switch_complete_names() {
+  local matches recent="" live name
+  _dbt_switch_refresh
+  [ -r @NAMES@ ] || return
+  matches="$(compgen -W "$(<@NAMES@)" -- "$cur")"
+  [ -r @RECENT@ ] && recent="$(<@RECENT@)"
+  if [ -z "$recent" ] || [ -z "$matches" ]; then
+    COMPREPLY=($matches)
+    return
+  fi
+  # Recent names that still exist, most recent first, then the rest
+  live=$'\\n'"$(printf '%s\\n' "$matches" | grep -xF -- "$recent")"$'\\n'
+  for name in $recent; do
+    case "$live" in
+      *$'\\n'"$name"$'\\n'*) COMPREPLY+=("$name") ;;
+    esac
+  done
+  COMPREPLY+=($(printf '%s\\n' "$matches" | grep -vxF -- "$recent"))
+  # Keep that order (bash 4.4+)
+  type compopt >/dev/null 2>&1 && compopt -o nosort 2>/dev/null
+}
+_dbt_switch_complete() {
+  local cur="${COMP_WORDS[COMP_CWORD]}" prev="${COMP_WORDS[COMP_CWORD-1]}"
+  COMPREPLY=()
+  case "$prev" in
+    -p|--project|update|env)
+      _dbt_switch_complete_names
+      return ;;
+    hook|completion)
+      COMPREPLY=($(compgen -W "bash zsh fish" -- "$cur"))
+      return ;;
+  esac
+  if [ "$COMP_CWORD" -eq 1 ]; then
+    COMPREPLY=($(compgen -W "@COMMANDS@ @OPTIONS@" -- "$cur"))
+  fi
+}
+complete -F _dbt_switch_complete dbt-switch
+""",
+    "zsh": """_dbt_switch() {
+  case "${words[CURRENT-1]}" in
+    -p|--project|update|env)
+      local source
+      for source in @CONFIG@ @FRAGMENTS@ @FRAGMENTS@/*.yml(N); do
+        if [[ $source -nt @NAMES@ ]]; then
+          dbt-switch completion --refresh 2>/dev/null
+          break
+        fi
+      done
+      local -a recent names
+      [[ -r @RECENT@ ]] && recent=(${(f)"$(<@RECENT@)"})
+      [[ -r @NAMES@ ]] && names=(${(f)"$(<@NAMES@)"})
+      recent=(${recent:*names})
+      compadd -V recent -- $recent
+      compadd -- ${names:|recent}
+      return ;;
+    hook|completion)
+      compadd bash zsh fish
+      return ;;
+  esac
+  (( CURRENT == 2 )) && compadd -- @COMMANDS@ @OPTIONS@
+}
+compdef _dbt_switch dbt-switch
+""",
+    "fish": """function __dbt_switch_names
+    for source in @CONFIG@ @FRAGMENTS@ @FRAGMENTS@/*.yml
+        if test $source -nt @NAMES@
+            dbt-switch completion --refresh 2>/dev/null
+            break
+        end
+    end
+    test -r @NAMES@; or return
+    set -l names (string trim < @NAMES@)
+    set -l recent
+    if test -r @RECENT@
+        for name in (string trim < @RECENT@)
+            contains -- $name $names; and set -a recent $name
+        end
+    end
+    set -q recent[1]; and printf '%s\\n' $recent
+    if set -q recent[1]
+        string match -rv -- '^('(string join '|' $recent)')$' $names
+    else
+        printf '%s\\n' $names
+    end
+end
+complete -c dbt-switch -f
+complete -c dbt-switch -s p -l project -x -k -a '(__dbt_switch_names)'
+complete -c dbt-switch -n __fish_use_subcommand -a '@COMMANDS@'
+complete -c dbt-switch -n '__fish_seen_subcommand_from update env' -k -a '(__dbt_switch_names)'
+complete -c dbt-switch -n '__fish_seen_subcommand_from hook completion' -a 'bash zsh fish'
+""",
+}
+_COMPLETION_OPTIONS = "-p --project --version --timings --help"
+
+
+def detect_shell() -> str:
+    """
+    Guess the statement syntax from $SHELL.
+    Returns:
+        str: "fish" for fish, "sh" for everything else (bash, zsh, ...)
+    """
+    return "fish" if os.path.basename(os.environ.get("SHELL", "")) == "fish" else "sh"
+
+
+def _fish_quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def format_exports(env: dict[str, str], shell: str = "sh") -> str:
+    """
+    Render variables as statements to `eval` in the given shell.
+    Args:
+        env: Variable names and values
+        shell: "sh" (bash, zsh, dash) or "fish"
+    Returns:
+        str: One statement per line
+    """
+    if shell == "fish":
+        lines = [f"set -gx {name} {_fish_quote(value)};" for name, value in env.items()]
+    else:
+        lines = [f"export {name}={shlex.quote(value)};" for name, value in env.items()]
+    return "\n".join(lines) + "\n"
+
+
+def format_unsets(names, shell: str = "sh") -> str:
+    """
+    Render statements that remove variables from the shell.
+    Args:
+        names: Variable names
+        shell: "sh" (bash, zsh, dash) or "fish"
+    Returns:
+        str: One statement per line
+    """
+    if shell == "fish":
+        lines = [f"set -e {name};" for name in names]
+    else:
+        lines = [f"unset {name};" for name in names]
+    return "\n".join(lines) + "\n"
+
+
+def format_hook(shell: str) -> str:
+    """
+    Shell code that runs `dbt-switch auto` whenever the directory changes.
+    Args:
+        shell: "bash", "zsh" or "fish"
+    Returns:
+        str: Code to `eval` from the shell's startup file
+    """
+    return _HOOKS[shell]
+
+
+def format_completion(
+    shell: str, commands, config_file, fragments_dir, names_file, recent_file
+) -> str:
+    """
+    Tab completion script for subcommands and profile names.
+    Args:
+        shell: "bash", "zsh" or "fish"
+        commands: Subcommand names
+        config_file: Path to dbt_switch.yml
+        fragments_dir: Path to the dbt_switch.d fragment directory
+        names_file: Path to the profile names file kept by dbt-switch
+        recent_file: Path to the recently used names kept by dbt-switch
+    Returns:
+        str: Code to `eval` (bash, zsh) or `source` (fish) from the shell's
+        startup file
+    """
+    quote = _fish_quote if shell == "fish" else shlex.quote
+    return (
+        _COMPLETIONS[shell]
+        .replace("@COMMANDS@", " ".join(sorted(commands)))
+        .replace("@OPTIONS@", _COMPLETION_OPTIONS)
+        .replace("@CONFIG@", quote(str(config_file)))
+        .replace("@FRAGMENTS@", quote(str(fragments_dir)))
+        .replace("@NAMES@", quote(str(names_file)))
+        .replace("@RECENT@", quote(str(recent_file)))
+    )
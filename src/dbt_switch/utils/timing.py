@@ -0,0 +1,117 @@
+"""
+Per-phase timing and profiling for diagnosing slow commands.
+
+`phase(name)` marks a section of work inside the handlers. It does nothing
+until `enable()` is called (by the `--timings` flag), after which each phase
+is recorded with its nesting depth and `report()` prints the breakdown to
+stderr. `run_profiled()` wraps a whole command in cProfile for the
+DBT_SWITCH_PROFILE environment variable.
+
+Only the standard library is imported here so the CLI can load it eagerly.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+PROFILE_ENV_VAR = "DBT_SWITCH_PROFILE"
+DEFAULT_PROFILE_PATH = "dbt-switch.prof"
+
+_records: list | None = None
+_depth = 0
+_started = 0.0
+
+
+def enable() -> None:
+    """Start recording phases; the total is measured from this call."""
+    global _records, _depth, _started
+    _records = []
+    _depth = 0
+    _started = time.perf_counter()
+
+
+def disable() -> None:
+    """Stop recording and drop anything recorded so far."""
+    global _records
+    _records = None
+
+
+def is_enabled() -> bool:
+    return _records is not None
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Time the enclosed block as a named phase when timings are enabled.
+    Phases may nest; the report indents children under their parent.
+    Args:
+        name: Label shown in the report
+    """
+    global _depth
+    if _records is None:
+        yield
+        return
+
+    record = [name, _depth, 0.0]
+    _records.append(record)
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record[2] = time.perf_counter() - start
+        _depth -= 1
+
+
+def phases() -> list[tuple[str, int, float]]:
+    """
+    Recorded phases in start order.
+    Returns:
+        list[tuple[str, int, float]]: (name, depth, seconds) per phase
+    """
+    return [tuple(record) for record in _records or []]
+
+
+def report(stream=None) -> None:
+    """
+    Print the phase breakdown in milliseconds and stop recording.
+    Args:
+        stream: Where to write (defaults to stderr)
+    """
+    if _records is None:
+        return
+    stream = stream or sys.stderr
+    total = time.perf_counter() - _started
+
+    lines = ["dbt-switch timings (ms):"]
+    for name, depth, seconds in phases():
+        lines.append(f"{seconds * 1e3:>9.2f}  {'  ' * depth}{name}")
+    lines.append(f"{total * 1e3:>9.2f}  total")
+    print("\n".join(lines), file=stream)
+    disable()
+
+
+def run_profiled(func, path: str):
+    """
+    Run func under cProfile and write the stats to path, even if func exits
+    through SystemExit as click commands do.
+    Args:
+        func: Callable to profile
+        path: Output .prof file ("1" or "true" selects dbt-switch.prof)
+    Returns:
+        Whatever func returns
+    """
+    import cProfile
+
+    if path.strip().lower() in ("1", "true", "yes"):
+        path = DEFAULT_PROFILE_PATH
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Wrote profile to {path}", file=sys.stderr)
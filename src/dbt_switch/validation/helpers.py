@@ -3,8 +3,9 @@ Validation helper functions for dbt-switch configuration.
 """
 
 import re
+import unicodedata
 from pydantic import ValidationError
-from .schemas import DbtSwitchConfig, ProjectConfig
+from .schemas import DbtSwitchConfig, ProjectConfig, PROJECT_NAME_PATTERN
 
 
 def validate_project_name_format(name: str) -> None:
@@ -19,7 +20,7 @@ def validate_project_name_format(name: str) -> None:
         raise ValueError("Project name must be a non-empty string.")
 
     name = name.strip()
-    if not re.match(r"^[a-zA-Z0-9_-]+$", name):
+    if not PROJECT_NAME_PATTERN.match(name):
         raise ValueError(
             f"Project name '{name}' contains invalid characters. "
             "Only letters, numbers, underscores, and hyphens are allowed."
@@ -50,13 +51,8 @@ def validate_unique_project_id(
     Raises:
         ValueError: If project ID is not unique
     """
-    existing_project_ids = []
-    for project_name, project_config in config.profiles.items():
-        if exclude_project and project_name == exclude_project:
-            continue
-        existing_project_ids.append(project_config.project_id)
-
-    if new_project_id in existing_project_ids:
+    owner = config.project_id_index().get(new_project_id)
+    if owner is not None and not (exclude_project and owner == exclude_project):
         raise ValueError(
             f"Project ID {new_project_id} is already in use by another project."
         )
@@ -92,3 +88,22 @@ def create_validated_project_config(host: str, project_id: int) -> ProjectConfig
         ValidationError: If configuration is invalid
     """
     return ProjectConfig(host=host, project_id=project_id)
+
+
+def slugify_project_name(name: str) -> str:
+    """
+    Turn a free-form dbt Cloud project name into a dbt-switch project name.
+    Accents are stripped and runs of any other characters outside letters,
+    numbers, underscores and hyphens collapse to a single hyphen,
+    e.g. "Finance (EU) Models" -> "finance-eu-models".
+    Args:
+        name: Project name as shown in dbt Cloud
+    Returns:
+        str: A lowercase name that passes validate_project_name_format, or an
+        empty string if nothing usable is left
+    """
+    ascii_name = (
+        unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    )
+    slug = re.sub(r"[^a-z0-9_-]+", "-", ascii_name.strip().lower())
+    return re.sub(r"-{2,}", "-", slug).strip("-_")
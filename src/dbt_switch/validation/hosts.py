@@ -0,0 +1,25 @@
+"""
+Canonical form of dbt Cloud hosts, so that the same host written with or
+without a scheme, trailing slash or different case compares equal.
+"""
+
+import re
+
+_SCHEME = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+
+
+def normalize_host(host: str) -> str:
+    """
+    Reduce a host or URL to a lowercase hostname[:port] for comparisons.
+    "https://Cloud.getdbt.com/", "cloud.getdbt.com" and
+    "cloud.getdbt.com:443" all become "cloud.getdbt.com".
+    Args:
+        host: Host as written in dbt_switch.yml or dbt_cloud.yml
+    Returns:
+        str: The canonical host
+    """
+    host = _SCHEME.sub("", host.strip(), count=1)
+    host = host.split("/", 1)[0].split("?", 1)[0].rstrip(".").lower()
+    if host.endswith(":443"):
+        host = host[: -len(":443")]
+    return host
@@ -0,0 +1,116 @@
+"""
+Trigram index over project names for "did you mean" suggestions.
+
+Each name is split into the overlapping three-character windows of its
+lowercased, padded form ("  alpha " -> "  a", " al", "alp", ...), and each
+trigram maps to the names containing it. A query counts shared trigrams
+using the postings of its rarest trigrams only, so the work is bounded by a
+fixed budget rather than by the number of names.
+
+Postings are kept as space-separated positions in the sorted name list.
+That keeps the snapshot written to the cache directory cheap to load, and
+only the postings a query touches are ever split into integers.
+"""
+
+from collections import Counter
+
+# Minimum Dice similarity (2 * shared / (grams_a + grams_b)) for a suggestion
+MIN_SIMILARITY = 0.4
+# Characters of postings read per query (about 6000 positions at 100k
+# names), and how many of the best-counted candidates are then scored
+POSTINGS_BUDGET = 40000
+CANDIDATES = 50
+
+
+def name_trigrams(name: str) -> set[str]:
+    """
+    Trigrams of a name, padded so that short names and prefixes count.
+    Args:
+        name: Project name or query
+    Returns:
+        set[str]: Three-character windows of "  <name> " (lowercased)
+    """
+    padded = f"  {name.lower()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Immutable trigram index over a set of project names."""
+
+    def __init__(self, names: list[str], postings: dict[str, str]):
+        self.names = names
+        self._postings = postings
+
+    @classmethod
+    def build(cls, names) -> "NameIndex":
+        """
+        Index a collection of names.
+        Args:
+            names: Project names
+        Returns:
+            NameIndex: The index
+        """
+        names = sorted(names)
+        positions = {}
+        for position, name in enumerate(names):
+            for gram in name_trigrams(name):
+                positions.setdefault(gram, []).append(position)
+        return cls(
+            names,
+            {gram: " ".join(map(str, ids)) for gram, ids in positions.items()},
+        )
+
+    def to_snapshot(self) -> dict:
+        """JSON-serializable form for the cache directory."""
+        return {"names": self.names, "postings": self._postings}
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> "NameIndex | None":
+        """
+        Rebuild an index from to_snapshot() output.
+        Returns:
+            NameIndex | None: None if the snapshot is malformed
+        """
+        names = data.get("names") if isinstance(data, dict) else None
+        postings = data.get("postings") if isinstance(data, dict) else None
+        if not isinstance(names, list) or not isinstance(postings, dict):
+            return None
+        return cls(names, postings)
+
+    def suggest(
+        self, query: str, limit: int = 3, min_similarity: float = MIN_SIMILARITY
+    ) -> list[str]:
+        """
+        Names most similar to query by trigram overlap.
+        Postings are read rarest first until POSTINGS_BUDGET characters have
+        been read, so common trigrams ("pro", "-de") shared by most names
+        cost nothing; the best-counted candidates are then scored exactly.
+        Args:
+            query: The name that was not found
+            limit: Maximum number of suggestions
+            min_similarity: Minimum Dice similarity to be suggested
+        Returns:
+            list[str]: Suggestions, most similar first
+        """
+        query_grams = name_trigrams(query)
+        known = sorted(
+            (self._postings[gram] for gram in query_grams if gram in self._postings),
+            key=len,
+        )
+        counts = Counter()
+        budget = POSTINGS_BUDGET
+        for postings in known:
+            budget -= len(postings)
+            if budget < 0:
+                break
+            counts.update(postings.split())
+
+        scored = []
+        for position, _ in counts.most_common(CANDIDATES):
+            name = self.names[int(position)]
+            grams = name_trigrams(name)
+            score = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+            if score >= min_similarity:
+                scored.append((-score, name))
+        scored.sort()
+        return [name for _, name in scored[:limit]]
@@ -0,0 +1,64 @@
+"""
+Plain read-only records for configs that have already passed validation.
+
+When a config file's parse cache entry is trusted (its stat key or content
+hash matches what was validated), read-only commands rebuild the profiles
+and dbt_cloud.yml project items as these `__slots__` records instead of
+pydantic models. They have the same attributes as ProjectConfig and
+DbtCloudProjectItem but no validators, no per-instance __dict__ and no
+pydantic bookkeeping, which makes them several times cheaper to create and
+hold for large files. Anything that writes a config loads real models.
+"""
+
+
+class ProjectRecord:
+    """Validated dbt_switch.yml profile; the read-only twin of ProjectConfig."""
+
+    __slots__ = ("host", "project_id")
+
+    def __init__(self, host: str, project_id: int):
+        self.host = host
+        self.project_id = project_id
+
+    def __repr__(self) -> str:
+        return f"ProjectRecord(host={self.host!r}, project_id={self.project_id!r})"
+
+
+class CloudProjectRecord:
+    """Validated dbt_cloud.yml project item; the read-only twin of DbtCloudProjectItem."""
+
+    __slots__ = (
+        "project_name",
+        "project_id",
+        "account_name",
+        "account_id",
+        "account_host",
+        "token_name",
+        "token_value",
+    )
+
+    def __init__(
+        self,
+        project_name: str,
+        project_id: str,
+        account_name: str,
+        account_id: str,
+        account_host: str,
+        token_name: str,
+        token_value: str,
+    ):
+        self.project_name = project_name
+        self.project_id = project_id
+        self.account_name = account_name
+        self.account_id = account_id
+        self.account_host = account_host
+        self.token_name = token_name
+        self.token_value = token_value
+
+    def __repr__(self) -> str:
+        # The token is left out so records are safe to log
+        return (
+            f"CloudProjectRecord(project_name={self.project_name!r}, "
+            f"project_id={self.project_id!r}, account_id={self.account_id!r}, "
+            f"account_host={self.account_host!r})"
+        )
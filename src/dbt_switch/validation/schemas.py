@@ -1,7 +1,65 @@
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
-from typing import Dict, List
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    field_validator,
+    model_validator,
+    ConfigDict,
+)
+from typing import Dict, Iterable, List, Set
+import bisect
 import re
 
+from .hosts import normalize_host
+from .name_index import NameIndex
+
+PROJECT_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+
+
+def invalid_name_message(name: str) -> str:
+    """Error message for a profile name that fails PROJECT_NAME_PATTERN."""
+    return (
+        f"Project name '{name}' contains invalid characters. "
+        "Only letters, numbers, underscores, and hyphens are allowed."
+    )
+
+
+def invalid_project_names(names: Iterable) -> list:
+    """
+    Every name that is not a valid profile name, in one pass.
+    Args:
+        names: Profile names (anything YAML produced as a mapping key)
+    Returns:
+        list: The invalid names, in order
+    """
+    match = PROJECT_NAME_PATTERN.match
+    return [
+        name
+        for name in names
+        if not isinstance(name, str) or not name.strip() or not match(name.strip())
+    ]
+
+
+def duplicate_project_ids(profiles: Iterable[tuple[str, int]]) -> Dict[int, List[str]]:
+    """
+    Every project ID held by more than one profile, in one hashing pass.
+    Args:
+        profiles: (profile name, project ID) pairs
+    Returns:
+        Dict[int, List[str]]: project ID -> names holding it, in order
+    """
+    holders = {}
+    for name, project_id in profiles:
+        holders.setdefault(project_id, []).append(name)
+    return {pid: names for pid, names in holders.items() if len(names) > 1}
+
+
+def _duplicate_ids_message(duplicates: Dict[int, List[str]]) -> str:
+    clashes = "; ".join(
+        f"{pid} is used by {', '.join(names)}" for pid, names in duplicates.items()
+    )
+    return f"Each project must have a unique project ID. Project ID {clashes}."
+
 
 class ProjectConfig(BaseModel):
     """Config for a single dbt Cloud project."""
@@ -26,22 +84,332 @@ class ProjectConfig(BaseModel):
 
 
 class DbtSwitchConfig(BaseModel):
-    """Main config file for dbt-switch."""
+    """
+    Main config file for dbt-switch.
+
+    The validators run once, when the file is loaded. After that, profiles
+    should be changed through add_profile, replace_profile and remove_profile,
+    which keep the invariants (valid names, unique project IDs) in O(1) per
+    change using a project-id -> name index built on first use. Profile names
+    are the dict keys, so name uniqueness is a key lookup. A host -> names
+    index, keyed on normalize_host, is likewise built on first use and kept
+    current by the same methods. A sorted name list serves prefix lookups by
+    bisection, and a trigram NameIndex (rebuilt after changes) serves "did
+    you mean" suggestions. Profiles of dbt_switch.d fragments are merged in
+    with add_fragment, remember their source file, and are read-only here.
+    """
 
     profiles: Dict[str, ProjectConfig] = {}
 
+    _id_index: Dict[int, str] | None = PrivateAttr(default=None)
+    _host_index: Dict[str, Set[str]] | None = PrivateAttr(default=None)
+    _sorted_names: List[str] | None = PrivateAttr(default=None)
+    _name_index: NameIndex | None = PrivateAttr(default=None)
+    # Profile name -> fragment file it was merged from (see add_fragment)
+    _sources: Dict[str, str] | None = PrivateAttr(default=None)
+
+    def project_id_index(self) -> Dict[int, str]:
+        """
+        Map each project ID to the name of the profile that holds it.
+        Built lazily and then kept current by the profile methods.
+        Returns:
+            Dict[int, str]: project_id -> project name
+        """
+        if self._id_index is None:
+            self._id_index = {
+                project.project_id: name for name, project in self.profiles.items()
+            }
+        return self._id_index
+
+    def host_index(self) -> Dict[str, Set[str]]:
+        """
+        Map each normalized host to the names of the profiles on it.
+        Built lazily and then kept current by the profile methods.
+        Returns:
+            Dict[str, Set[str]]: normalized host -> project names
+        """
+        if self._host_index is None:
+            index = {}
+            for name, project in self.profiles.items():
+                index.setdefault(normalize_host(project.host), set()).add(name)
+            self._host_index = index
+        return self._host_index
+
+    def names_for_host(self, host: str) -> Set[str]:
+        """
+        Names of the profiles on a host, however the host is written.
+        Args:
+            host: Host or URL
+        Returns:
+            Set[str]: Matching project names (empty if none)
+        """
+        return set(self.host_index().get(normalize_host(host), ()))
+
+    def find_profile(self, host: str, project_id: int | str) -> str | None:
+        """
+        Find the profile for a (host, project_id) pair, e.g. the active
+        context of dbt_cloud.yml. Project IDs are unique, so this is an id
+        index lookup followed by a normalized host comparison.
+        Args:
+            host: Host or URL
+            project_id: Project ID as an int or numeric string
+        Returns:
+            str | None: The project name, or None if no profile matches
+        """
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            return None
+        name = self.project_id_index().get(project_id)
+        if name is not None and normalize_host(
+            self.profiles[name].host
+        ) == normalize_host(host):
+            return name
+        return None
+
+    def resolve_profile(self, ref: str, prefix: bool = False) -> str | None:
+        """
+        Resolve a project name, or failing that a numeric project ID, to a
+        profile name. With prefix=True a unique name prefix also resolves.
+        Args:
+            ref: Project name or project ID
+            prefix: Accept the start of exactly one project name
+        Returns:
+            str | None: The project name, or None if nothing matches
+        """
+        if ref in self.profiles:
+            return ref
+        if isinstance(ref, str) and ref.strip().isdigit():
+            name = self.project_id_index().get(int(ref))
+            if name is not None:
+                return name
+        if prefix and isinstance(ref, str) and ref:
+            matches = self.names_with_prefix(ref, limit=2)
+            if len(matches) == 1:
+                return matches[0]
+        return None
+
+    def _index_host(self, name: str, project: ProjectConfig) -> None:
+        if self._host_index is not None:
+            self._host_index.setdefault(normalize_host(project.host), set()).add(name)
+
+    def _index_name(self, name: str) -> None:
+        if self._sorted_names is not None:
+            bisect.insort(self._sorted_names, name)
+        self._name_index = None
+
+    def _unindex_name(self, name: str) -> None:
+        if self._sorted_names is not None:
+            position = bisect.bisect_left(self._sorted_names, name)
+            del self._sorted_names[position]
+        self._name_index = None
+
+    def _unindex_host(self, name: str, project: ProjectConfig) -> None:
+        if self._host_index is not None:
+            host = normalize_host(project.host)
+            names = self._host_index.get(host, set())
+            names.discard(name)
+            if not names:
+                self._host_index.pop(host, None)
+
+    def sorted_names(self) -> List[str]:
+        """
+        Profile names in sorted order.
+        Built lazily and then kept current by the profile methods.
+        Returns:
+            List[str]: Sorted project names
+        """
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.profiles)
+        return self._sorted_names
+
+    def names_with_prefix(self, prefix: str, limit: int | None = None) -> List[str]:
+        """
+        Profile names starting with prefix, by bisecting the sorted names.
+        Args:
+            prefix: Start of a project name
+            limit: Stop after this many names
+        Returns:
+            List[str]: Matching project names in sorted order
+        """
+        names = self.sorted_names()
+        matches = []
+        for i in range(bisect.bisect_left(names, prefix), len(names)):
+            if not names[i].startswith(prefix) or len(matches) == limit:
+                break
+            matches.append(names[i])
+        return matches
+
+    def name_index(self, builder=None) -> NameIndex:
+        """
+        Trigram index of the profile names, built on first use and dropped
+        whenever a profile is added or removed.
+        Args:
+            builder: Called instead of NameIndex.build on first use, e.g. to
+              load a persisted index
+        Returns:
+            NameIndex: The index
+        """
+        if self._name_index is None:
+            self._name_index = (builder or NameIndex.build)(self.profiles)
+        return self._name_index
+
+    def profile_source(self, name: str) -> str | None:
+        """
+        The fragment file a profile was merged from.
+        Args:
+            name: Project name
+        Returns:
+            str | None: Fragment path, or None for profiles of dbt_switch.yml itself
+        """
+        return self._sources.get(name) if self._sources else None
+
+    def own_profiles(self) -> Dict[str, ProjectConfig]:
+        """
+        The profiles that belong in dbt_switch.yml itself, without those
+        merged from fragments.
+        Returns:
+            Dict[str, ProjectConfig]: project name -> configuration
+        """
+        if not self._sources:
+            return self.profiles
+        return {
+            name: project
+            for name, project in self.profiles.items()
+            if name not in self._sources
+        }
+
+    def add_fragment(
+        self, source: str, profiles: Dict[str, ProjectConfig]
+    ) -> List[str]:
+        """
+        Merge the profiles of a separately validated fragment file. Names
+        and project IDs are checked against everything merged so far
+        through the name dict and project-id index, so the cost is that of
+        the fragment, not of the whole configuration. A conflicting profile
+        is skipped: dbt_switch.yml and earlier fragments win.
+        Args:
+            source: Fragment path, reported in messages and by profile_source
+            profiles: The fragment's profiles
+        Returns:
+            List[str]: One message per skipped profile
+        """
+        index = self.project_id_index()
+        if self._sources is None:
+            self._sources = {}
+        conflicts = []
+        for name, project in profiles.items():
+            if name in self.profiles:
+                owner = self._sources.get(name, "dbt_switch.yml")
+                conflicts.append(
+                    f"{source}: project '{name}' is already defined in {owner}"
+                )
+                continue
+            owner = index.get(project.project_id)
+            if owner is not None:
+                conflicts.append(
+                    f"{source}: project ID {project.project_id} of '{name}' "
+                    f"is already used by '{owner}'"
+                )
+                continue
+            self.profiles[name] = project
+            index[project.project_id] = name
+            self._sources[name] = source
+            self._index_host(name, project)
+            self._index_name(name)
+        return conflicts
+
+    def _check_own(self, name: str) -> None:
+        source = self.profile_source(name)
+        if source is not None:
+            raise ValueError(
+                f"Project '{name}' is defined in {source}; edit that file instead."
+            )
+
+    def add_profile(self, name: str, project: ProjectConfig) -> None:
+        """
+        Add a new profile, checking only what the change can break.
+        Args:
+            name: New project name
+            project: Validated project configuration
+        Raises:
+            ValueError: If the name is invalid or taken, or the project ID is in use
+        """
+        if not PROJECT_NAME_PATTERN.match(name):
+            raise ValueError(invalid_name_message(name))
+        if name in self.profiles:
+            raise ValueError(f"Project '{name}' already exists in configuration.")
+        index = self.project_id_index()
+        if project.project_id in index:
+            raise ValueError(
+                f"Project ID {project.project_id} is already in use by another project."
+            )
+        self.profiles[name] = project
+        index[project.project_id] = name
+        self._index_host(name, project)
+        self._index_name(name)
+
+    def replace_profile(self, name: str, project: ProjectConfig) -> None:
+        """
+        Replace the configuration of an existing profile.
+        Args:
+            name: Existing project name
+            project: Validated project configuration
+        Raises:
+            ValueError: If the profile does not exist or comes from a fragment,
+            or the new project ID is held by another profile
+        """
+        if name not in self.profiles:
+            raise ValueError(f"Project '{name}' not found in configuration.")
+        self._check_own(name)
+        index = self.project_id_index()
+        owner = index.get(project.project_id)
+        if owner is not None and owner != name:
+            raise ValueError(
+                f"Project ID {project.project_id} is already in use by another project."
+            )
+        previous = self.profiles[name]
+        del index[previous.project_id]
+        self._unindex_host(name, previous)
+        self.profiles[name] = project
+        index[project.project_id] = name
+        self._index_host(name, project)
+
+    def remove_profile(self, name: str) -> ProjectConfig:
+        """
+        Remove a profile.
+        Args:
+            name: Existing project name
+        Returns:
+            ProjectConfig: The removed configuration
+        Raises:
+            ValueError: If the profile does not exist or comes from a fragment
+        """
+        if name not in self.profiles:
+            raise ValueError(f"Project '{name}' not found in configuration.")
+        self._check_own(name)
+        project = self.profiles.pop(name)
+        if self._id_index is not None:
+            del self._id_index[project.project_id]
+        self._unindex_host(name, project)
+        self._unindex_name(name)
+        return project
+
     @field_validator("profiles")
     def validate_project_names(cls, v):
-        """Validate project names are properly formatted."""
-        for project_name in v.keys():
-            if not isinstance(project_name, str) or not project_name.strip():
-                raise ValueError("Project name must be a non-empty string.")
-
-            if not re.match(r"^[a-zA-Z0-9_-]+$", project_name.strip()):
-                raise ValueError(
-                    f"Project name '{project_name}' contains invalid characters. Only letters, numbers, underscores, and hyphens are allowed."
-                )
-        return v
+        """Validate project names are properly formatted, naming every bad one."""
+        invalid = invalid_project_names(v.keys())
+        if not invalid:
+            return v
+        if any(not isinstance(name, str) or not name.strip() for name in invalid):
+            raise ValueError("Project name must be a non-empty string.")
+        if len(invalid) == 1:
+            raise ValueError(invalid_name_message(invalid[0]))
+        names = ", ".join(f"'{name}'" for name in invalid)
+        raise ValueError(
+            f"Project names {names} contain invalid characters. "
+            "Only letters, numbers, underscores, and hyphens are allowed."
+        )
 
     @model_validator(mode="after")
     def validate_unique_constraints(cls, values):
@@ -51,10 +419,12 @@ class DbtSwitchConfig(BaseModel):
         else:
             profiles = values.get("profiles", {})
 
-        # Check unique project IDs
-        project_ids = [config.project_id for config in profiles.values()]
-        if len(project_ids) != len(set(project_ids)):
-            raise ValueError("Each project must have a unique project ID.")
+        # Check unique project IDs, naming every clash
+        duplicates = duplicate_project_ids(
+            (name, config.project_id) for name, config in profiles.items()
+        )
+        if duplicates:
+            raise ValueError(_duplicate_ids_message(duplicates))
 
         # Check unique project names (lowkey redundant since they're dict keys BUT explicit is better)
         project_names = list(profiles.keys())
@@ -9,6 +9,23 @@ from unittest.mock import patch
 from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
 
 
+@pytest.fixture(autouse=True)
+def isolated_config_paths(tmp_path, monkeypatch):
+    """
+    Point the module-level config paths at a temp directory so that no test
+    can read, write or lock anything under the real ~/.dbt.
+    """
+    dbt_dir = tmp_path / "isolated_dbt"
+    dbt_dir.mkdir()
+    monkeypatch.setattr(
+        "dbt_switch.config.file_handler.CONFIG_FILE", dbt_dir / "dbt_switch.yml"
+    )
+    monkeypatch.setattr(
+        "dbt_switch.config.cloud_handler.DBT_CLOUD_FILE", dbt_dir / "dbt_cloud.yml"
+    )
+    return dbt_dir
+
+
 @pytest.fixture
 def temp_home_dir(tmp_path):
     """Create a temporary home directory for testing."""
@@ -0,0 +1,44 @@
+"""
+Smoke test for the benchmark suite and its regression gate, so that the
+scripts under benchmarks/ keep working as the handlers change.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).resolve().parents[2] / "benchmarks"
+
+
+def _run_suite(*args):
+    return subprocess.run(
+        [sys.executable, str(BENCHMARKS / "run_suite.py"), *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_suite_writes_results_and_gates_on_baseline(tmp_path):
+    output = tmp_path / "results.json"
+
+    result = _run_suite("--sizes", "10", "--repeat", "1", "--output", str(output))
+
+    assert result.returncode == 0, result.stderr
+    report = json.loads(output.read_text())
+    for key in ("get_config_cold@10", "switch_project@10", "cli_switch@10"):
+        assert report["results"][key] > 0
+
+    # A baseline that is impossibly fast must trip the gate
+    fast = {key: 0.001 for key in report["results"]}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"meta": {}, "results": fast}))
+
+    result = _run_suite(
+        "--sizes", "10", "--repeat", "1", "--no-cli",
+        "--baseline", str(baseline), "--min-delta-ms", "0",
+    )  # fmt: skip
+
+    assert result.returncode == 1
+    assert "REGRESSION get_config_cold@10" in result.stderr
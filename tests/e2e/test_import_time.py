@@ -0,0 +1,144 @@
+"""
+End-to-end import-time budget for the CLI entry point.
+
+Parses `python -X importtime` output so that the lazy startup path can't
+silently regress back to importing pydantic, PyYAML or the handlers, and
+that a real switch doesn't load the modules of other subcommands.
+"""
+
+import os
+import pytest
+import subprocess
+import sys
+
+
+HEAVY_MODULES = (
+    "pydantic",
+    "yaml",
+    "logging.config",
+    "dbt_switch.config.input_handler",
+    "dbt_switch.config.file_handler",
+    "dbt_switch.config.cloud_handler",
+    "dbt_switch.validation.schemas",
+)
+
+# Modules that only other subcommands need, never `dbt-switch -p NAME`.
+# (csv itself can't be listed: pydantic loads it through importlib.metadata.)
+SWITCH_SKIPPED_MODULES = (
+    "urllib.request",
+    "dbt_switch.config.cloud_api",
+    "dbt_switch.config.cloud_merge",
+    "dbt_switch.config.doctor",
+    "dbt_switch.config.import_reader",
+    "dbt_switch.config.validate",
+    "dbt_switch.daemon.server",
+)
+
+# Total import time of a switch through the click path, in microseconds.
+# Measured at roughly 0.4s under -X importtime; the budget leaves room for
+# slow CI machines but not for loading another dependency tree.
+SWITCH_IMPORT_BUDGET_US = 1_500_000
+
+SWITCH_YAML = """profiles:
+  alpha:
+    host: a.getdbt.com
+    project_id: 1
+  beta:
+    host: b.getdbt.com
+    project_id: 2
+"""
+
+CLOUD_YAML = """version: "1"
+context:
+  active-host: "b.getdbt.com"
+  active-project: "2"
+projects: []
+"""
+
+
+def _run_importtime(*args, env=None):
+    """Run Python with -X importtime and return the completed process."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env=env,
+    )
+
+
+def _import_profile(*args, env=None):
+    """Return {module: cumulative_us} for a Python run with -X importtime."""
+    result = _run_importtime(*args, env=env)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def _total_import_us(stderr: str) -> int:
+    """Sum of the self times of every import in -X importtime output."""
+    total = 0
+    for line in stderr.splitlines():
+        if line.startswith("import time:"):
+            own = line.split("|")[0].split(":")[1].strip()
+            if own.isdigit():
+                total += int(own)
+    return total
+
+
+@pytest.mark.e2e
+class TestImportTime:
+    """Guard the cold-start cost of `dbt-switch`."""
+
+    def test_entry_point_skips_heavy_modules(self):
+        """Importing the entry point must not load handlers or their deps."""
+        profile = _import_profile("-c", "import dbt_switch.main")
+
+        assert "dbt_switch.main" in profile
+        for module in HEAVY_MODULES + ("importlib.metadata",):
+            assert module not in profile, f"{module} imported at startup"
+
+    def test_help_skips_heavy_modules(self):
+        """`--help` only needs click."""
+        profile = _import_profile("-m", "dbt_switch.main", "--help")
+
+        for module in HEAVY_MODULES:
+            assert module not in profile, f"{module} imported for --help"
+
+    def test_version_resolved_lazily(self):
+        """`--version` resolves metadata without touching the handlers."""
+        profile = _import_profile("-m", "dbt_switch.main", "--version")
+
+        assert "dbt_switch.utils.version_check" in profile
+        for module in HEAVY_MODULES:
+            assert module not in profile, f"{module} imported for --version"
+
+    def test_switch_import_budget(self, tmp_path):
+        """A real `-p NAME` switch loads only what switching needs."""
+        dbt_dir = tmp_path / ".dbt"
+        dbt_dir.mkdir()
+        (dbt_dir / "dbt_switch.yml").write_text(SWITCH_YAML)
+        cloud_file = dbt_dir / "dbt_cloud.yml"
+        cloud_file.write_text(CLOUD_YAML)
+        env = dict(os.environ, HOME=str(tmp_path), DBT_SWITCH_NO_DAEMON="1")
+        env.pop("DBT_SWITCH_SOCKET", None)
+
+        result = _run_importtime("-m", "dbt_switch.main", "-p", "alpha", env=env)
+        profile = _import_profile("-m", "dbt_switch.main", "-p", "beta", env=env)
+        total = _total_import_us(result.stderr)
+
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert 'active-project: "2"' in cloud_file.read_text()
+        # The switch really took the full path through the handlers
+        assert "dbt_switch.config.cloud_handler" in profile
+        for module in SWITCH_SKIPPED_MODULES:
+            assert module not in profile, f"{module} imported for -p"
+        assert total < SWITCH_IMPORT_BUDGET_US, (
+            f"-p imports took {total}us (budget {SWITCH_IMPORT_BUDGET_US}us)"
+        )
@@ -15,9 +15,9 @@ class TestCliParser:
     @pytest.mark.parametrize(
         "command,mock_path,expected_call",
         [
-            ("init", "dbt_switch.cli.parser.init_config", None),
-            ("list", "dbt_switch.cli.parser.list_projects", None),
-            ("delete", "dbt_switch.cli.parser.delete_user_config", "delete"),
+            ("init", "dbt_switch.config.file_handler.init_config", None),
+            ("list", "dbt_switch.config.input_handler.list_projects", None),
+            ("delete", "dbt_switch.config.input_handler.delete_user_config", "delete"),
         ],
     )
     def test_parser_commands(self, command, mock_path, expected_call):
@@ -31,7 +31,7 @@ class TestCliParser:
             else:
                 mock_func.assert_called_once_with(expected_call)
 
-    @patch("dbt_switch.cli.parser.add_user_config")
+    @patch("dbt_switch.config.input_handler.add_user_config")
     def test_add_command_interactive(self, mock_add):
         """Test add command in interactive mode (no arguments)."""
         runner = CliRunner()
@@ -39,7 +39,7 @@ class TestCliParser:
         assert result.exit_code == 0
         mock_add.assert_called_once_with("add", None, None, None)
 
-    @patch("dbt_switch.cli.parser.add_user_config")
+    @patch("dbt_switch.config.input_handler.add_user_config")
     def test_add_command_non_interactive(self, mock_add):
         """Test add command in non-interactive mode (all arguments provided)."""
         runner = CliRunner()
@@ -59,7 +59,7 @@ class TestCliParser:
             "add", "test-project", "https://cloud.getdbt.com", 12345
         )
 
-    @patch("dbt_switch.cli.parser.add_user_config")
+    @patch("dbt_switch.config.input_handler.add_user_config")
     def test_add_command_partial_arguments(self, mock_add):
         """Test add command with partial arguments (should trigger error handling)."""
         runner = CliRunner()
@@ -83,8 +83,192 @@ class TestCliParser:
         assert result.exit_code == 0
         mock_add.assert_called_once_with("add", None, None, 12345)
 
-    @patch("dbt_switch.cli.parser.update_user_config_non_interactive")
-    @patch("dbt_switch.cli.parser.update_user_config_interactive")
+    @patch("dbt_switch.config.input_handler.import_user_config")
+    def test_import_command(self, mock_import, tmp_path):
+        """Test import command options and exit code."""
+        path = tmp_path / "projects.csv"
+        path.write_text("name,host,project_id\n")
+        runner = CliRunner()
+
+        mock_import.return_value = True
+        result = runner.invoke(cli, ["import", str(path), "--on-conflict", "skip"])
+        assert result.exit_code == 0
+        mock_import.assert_called_once_with(str(path), None, "skip")
+
+        mock_import.return_value = False
+        result = runner.invoke(cli, ["import", str(path), "--format", "csv"])
+        assert result.exit_code == 1
+        mock_import.assert_called_with(str(path), "csv", "fail")
+
+    @patch("dbt_switch.config.input_handler.list_projects")
+    def test_timings_flag(self, mock_list):
+        """--timings prints the phase breakdown to stderr after the command."""
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["--timings", "list"])
+
+        assert result.exit_code == 0
+        mock_list.assert_called_once()
+        assert "dbt-switch timings (ms):" in result.stderr
+        assert "import handlers" in result.stderr
+        assert "dbt-switch timings" not in result.stdout
+
+    @patch("dbt_switch.config.input_handler.sync_user_config")
+    def test_sync_from_cloud_command(self, mock_sync):
+        """Test sync-from-cloud exit codes."""
+        runner = CliRunner()
+
+        mock_sync.return_value = True
+        assert runner.invoke(cli, ["sync-from-cloud"]).exit_code == 0
+
+        mock_sync.return_value = False
+        assert runner.invoke(cli, ["sync-from-cloud"]).exit_code == 1
+
+    @patch("dbt_switch.config.input_handler.show_current_project")
+    def test_current_command(self, mock_show):
+        """Test current --format routing and exit codes."""
+        runner = CliRunner()
+
+        mock_show.return_value = True
+        assert runner.invoke(cli, ["current"]).exit_code == 0
+        mock_show.assert_called_with("name")
+        assert runner.invoke(cli, ["current", "--format", "id"]).exit_code == 0
+        mock_show.assert_called_with("id")
+
+        mock_show.return_value = False
+        assert runner.invoke(cli, ["current"]).exit_code == 1
+        assert runner.invoke(cli, ["current", "--format", "url"]).exit_code == 2
+
+    @patch("dbt_switch.config.input_handler.print_project_env")
+    def test_env_command(self, mock_env, monkeypatch):
+        """Test env shell selection and exit codes."""
+        runner = CliRunner()
+        monkeypatch.setenv("SHELL", "/usr/bin/fish")
+
+        mock_env.return_value = True
+        assert runner.invoke(cli, ["env", "prod"]).exit_code == 0
+        mock_env.assert_called_with("prod", "fish", False)
+        assert runner.invoke(cli, ["env", "--unset", "--shell", "sh"]).exit_code == 0
+        mock_env.assert_called_with(None, "sh", True)
+
+        mock_env.return_value = False
+        assert runner.invoke(cli, ["env", "nope"]).exit_code == 1
+
+    @patch("dbt_switch.config.input_handler.auto_switch_user_config")
+    def test_auto_and_hook_commands(self, mock_auto):
+        """Test auto exit codes and hook output."""
+        runner = CliRunner()
+
+        mock_auto.return_value = True
+        assert runner.invoke(cli, ["auto"]).exit_code == 0
+        mock_auto.return_value = False
+        assert runner.invoke(cli, ["auto"]).exit_code == 1
+
+        result = runner.invoke(cli, ["hook", "zsh"])
+        assert result.exit_code == 0
+        assert "add-zsh-hook chpwd" in result.output
+        assert runner.invoke(cli, ["hook", "tcsh"]).exit_code == 2
+
+    @patch("dbt_switch.config.input_handler.show_history")
+    @patch("dbt_switch.config.input_handler.switch_user_config")
+    @patch("dbt_switch.config.input_handler.list_projects")
+    def test_history_commands(self, mock_list, mock_switch, mock_history):
+        """Test -p -, history and list --recent."""
+        runner = CliRunner()
+
+        assert runner.invoke(cli, ["-p", "-"]).exit_code == 0
+        mock_switch.assert_called_once_with("-")
+
+        assert runner.invoke(cli, ["history", "-n", "3"]).exit_code == 0
+        mock_history.assert_called_once_with(3)
+        assert runner.invoke(cli, ["history", "-n", "0"]).exit_code == 2
+
+        assert runner.invoke(cli, ["list", "--recent"]).exit_code == 0
+        mock_list.assert_called_once_with(True, "text", None, None, None)
+
+    @patch("dbt_switch.config.input_handler.list_projects")
+    def test_list_format_and_filters(self, mock_list):
+        """Test list --format with the --host, --match and --limit filters."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "list",
+                "--format",
+                "jsonl",
+                "--host",
+                "cloud.getdbt.com",
+                "--match",
+                "analytics-*",
+                "--limit",
+                "5",
+            ],
+        )
+        assert result.exit_code == 0
+        mock_list.assert_called_once_with(
+            False, "jsonl", "cloud.getdbt.com", "analytics-*", 5
+        )
+        assert runner.invoke(cli, ["list", "--format", "xml"]).exit_code == 2
+        assert runner.invoke(cli, ["list", "--limit", "0"]).exit_code == 2
+
+    @patch("dbt_switch.config.input_handler.validate_user_config")
+    def test_validate_command(self, mock_validate):
+        """Test validate with and without a file, and its exit status."""
+        runner = CliRunner()
+        mock_validate.return_value = True
+        assert runner.invoke(cli, ["validate"]).exit_code == 0
+        mock_validate.assert_called_with(None)
+
+        mock_validate.return_value = False
+        assert runner.invoke(cli, ["validate", "other.yml"]).exit_code == 1
+        mock_validate.assert_called_with("other.yml")
+
+    @patch("dbt_switch.config.input_handler.merge_user_config")
+    def test_merge_command(self, mock_merge, tmp_path):
+        """Test merge arguments and exit codes."""
+        runner = CliRunner()
+        a, b = tmp_path / "a.yml", tmp_path / "b.yml"
+        a.write_text("")
+        b.write_text("")
+
+        mock_merge.return_value = True
+        result = runner.invoke(cli, ["merge", str(a), str(b), "-o", "out.yml"])
+        assert result.exit_code == 0
+        mock_merge.assert_called_with([str(a), str(b)], "out.yml")
+
+        mock_merge.return_value = False
+        assert runner.invoke(cli, ["merge", str(a)]).exit_code == 1
+        assert runner.invoke(cli, ["merge"]).exit_code == 2
+
+    @patch("dbt_switch.config.input_handler.discover_user_config")
+    def test_discover_command(self, mock_discover):
+        """Test discover options and exit codes."""
+        runner = CliRunner()
+
+        mock_discover.return_value = True
+        assert runner.invoke(cli, ["discover"]).exit_code == 0
+        mock_discover.assert_called_with(10.0)
+
+        mock_discover.return_value = False
+        assert runner.invoke(cli, ["discover", "--timeout", "3"]).exit_code == 1
+        mock_discover.assert_called_with(3.0)
+
+    @patch("dbt_switch.config.input_handler.doctor_user_config")
+    def test_doctor_command(self, mock_doctor):
+        """Test doctor options and exit codes."""
+        runner = CliRunner()
+
+        mock_doctor.return_value = True
+        assert runner.invoke(cli, ["doctor"]).exit_code == 0
+        mock_doctor.assert_called_with(False, 5.0)
+
+        mock_doctor.return_value = False
+        result = runner.invoke(cli, ["doctor", "--probe", "--timeout", "1.5"])
+        assert result.exit_code == 1
+        mock_doctor.assert_called_with(True, 1.5)
+
+    @patch("dbt_switch.config.input_handler.update_user_config_non_interactive")
+    @patch("dbt_switch.config.input_handler.update_user_config_interactive")
     def test_parser_update_commands(self, mock_interactive, mock_non_interactive):
         """Test update command variants."""
         runner = CliRunner()
@@ -140,7 +324,9 @@ class TestCliParser:
     def test_list_command_execution(self):
         """Test that list command executes without errors."""
         runner = CliRunner()
-        with patch("dbt_switch.cli.parser.list_projects") as mock_list_projects:
+        with patch(
+            "dbt_switch.config.input_handler.list_projects"
+        ) as mock_list_projects:
             result = runner.invoke(cli, ["list"])
             assert result.exit_code == 0
             mock_list_projects.assert_called_once()
@@ -0,0 +1,87 @@
+"""
+Stress test for concurrent add/switch invocations.
+
+Many processes add profiles and switch between them against the same HOME.
+Without locking, read-modify-write cycles lose each other's updates and
+interleaved writes leave truncated YAML behind.
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+import yaml
+
+from dbt_switch.validation.schemas import DbtCloudConfig, DbtSwitchConfig
+
+WORKERS = 8
+ADDS_PER_WORKER = 5
+
+WORKER_SCRIPT = """
+import sys
+from dbt_switch.config.file_handler import add_config
+from dbt_switch.config.cloud_handler import switch_project
+
+worker = int(sys.argv[1])
+for i in range(int(sys.argv[2])):
+    name = f"w{worker}-p{i}"
+    add_config(name, f"host{worker}.getdbt.com", worker * 1000 + i + 1)
+    switch_project(name)
+"""
+
+CLOUD_YAML = """version: "1"
+context:
+  active-host: "start.getdbt.com"
+  active-project: "1"
+projects:
+  - project-name: "Keep Me"
+    project-id: "1"
+    account-name: "Acme"
+    account-id: "1"
+    account-host: "start.getdbt.com"
+    token-name: "cli"
+    token-value: "dbtu_token"
+"""
+
+
+@pytest.mark.slow
+def test_parallel_add_and_switch_loses_nothing(tmp_path):
+    """Every add survives and both files stay valid."""
+    home = tmp_path / "home"
+    dbt_dir = home / ".dbt"
+    dbt_dir.mkdir(parents=True)
+    (dbt_dir / "dbt_switch.yml").write_text("profiles: {}\n")
+    (dbt_dir / "dbt_cloud.yml").write_text(CLOUD_YAML)
+
+    env = {**os.environ, "HOME": str(home)}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER_SCRIPT, str(w), str(ADDS_PER_WORKER)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for w in range(1, WORKERS + 1)
+    ]
+    for proc in workers:
+        _, stderr = proc.communicate(timeout=120)
+        assert proc.returncode == 0, stderr
+
+    switch_config = DbtSwitchConfig(
+        **yaml.safe_load((dbt_dir / "dbt_switch.yml").read_text())
+    )
+    expected = {
+        f"w{w}-p{i}" for w in range(1, WORKERS + 1) for i in range(ADDS_PER_WORKER)
+    }
+    assert set(switch_config.profiles) == expected
+
+    cloud_config = DbtCloudConfig(
+        **yaml.safe_load((dbt_dir / "dbt_cloud.yml").read_text())
+    )
+    active_ids = {str(p.project_id) for p in switch_config.profiles.values()}
+    assert cloud_config.context.active_project in active_ids
+    assert [p.project_name for p in cloud_config.projects] == ["Keep Me"]
+
+    leftovers = [name for name in os.listdir(dbt_dir) if name.endswith(".tmp")]
+    assert leftovers == []
@@ -0,0 +1,166 @@
+"""
+Integration tests for the resident daemon and its client.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import pytest
+from pathlib import Path
+
+from dbt_switch.config.current import current_cache_path
+from dbt_switch.config.file_handler import add_config, save_config
+from dbt_switch.daemon import client
+from dbt_switch.daemon.client import forward, parse_argv, request
+from dbt_switch.daemon.server import DaemonServer
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork") or os.name != "posix", reason="Unix sockets only"
+)
+
+CLOUD_YAML = """version: "1"
+context:
+  active-host: "prod.getdbt.com"
+  active-project: "11111"
+projects: []
+"""
+
+
+@pytest.fixture
+def seeded(isolated_config_paths):
+    save_config(
+        DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="prod.getdbt.com", project_id=11111),
+                "dev": ProjectConfig(host="dev.getdbt.com", project_id=22222),
+            }
+        )
+    )
+    cloud_file = isolated_config_paths / "dbt_cloud.yml"
+    cloud_file.write_text(CLOUD_YAML)
+    return cloud_file
+
+
+@pytest.fixture
+def daemon(seeded, monkeypatch):
+    """Run a daemon in a background thread on a short socket path."""
+    with tempfile.TemporaryDirectory(prefix="dbts") as tmp:
+        path = Path(tmp) / "d.sock"
+        monkeypatch.setenv("DBT_SWITCH_SOCKET", str(path))
+        server = DaemonServer(path)
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        thread.start()
+        yield path
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+class TestClientParsing:
+    """Test which command lines are forwarded."""
+
+    @pytest.mark.parametrize(
+        "argv, expected",
+        [
+            (["-p", "prod"], {"op": "switch", "project": "prod"}),
+            (["--project=prod"], {"op": "switch", "project": "prod"}),
+            (["list"], {"op": "list"}),
+            (["add", "x"], None),
+            (["--timings", "-p", "prod"], None),
+        ],
+    )
+    def test_parse_argv(self, argv, expected):
+        assert parse_argv(argv) == expected
+
+    def test_forward_without_daemon(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DBT_SWITCH_SOCKET", str(tmp_path / "none.sock"))
+
+        assert forward(["-p", "prod"]) is None
+
+    def test_forward_with_stale_socket(self, tmp_path, monkeypatch):
+        stale = tmp_path / "stale.sock"
+        stale.write_text("")
+        monkeypatch.setenv("DBT_SWITCH_SOCKET", str(stale))
+
+        assert forward(["list"]) is None
+
+
+class TestDaemon:
+    """Test requests answered by a running daemon."""
+
+    def test_switch(self, daemon, seeded, capsys):
+        assert forward(["-p", "dev"]) == 0
+
+        assert "Successfully switched to project 'dev'" in capsys.readouterr().out
+        text = seeded.read_text()
+        assert 'active-host: "dev.getdbt.com"' in text
+        assert 'active-project: "22222"' in text
+
+    def test_switch_records_current(self, daemon, seeded):
+        assert forward(["-p", "dev"]) == 0
+
+        record = json.loads(current_cache_path(seeded).read_text())
+        assert (record["name"], record["host"], record["project_id"]) == (
+            "dev",
+            "dev.getdbt.com",
+            "22222",
+        )
+
+    def test_switch_unknown_project(self, daemon, capsys):
+        assert forward(["-p", "nope"]) == 1
+
+        assert "Project 'nope' not found" in capsys.readouterr().out
+
+    def test_switch_back(self, daemon, seeded, capsys):
+        assert forward(["-p", "-"]) == 1
+        assert "No previous project" in capsys.readouterr().out
+
+        assert forward(["-p", "dev"]) == 0
+        assert forward(["-p", "prod"]) == 0
+        assert forward(["-p", "-"]) == 0
+        assert 'active-project: "22222"' in seeded.read_text()
+
+    def test_list_marks_active(self, daemon, capsys):
+        assert forward(["list"]) == 0
+
+        out = capsys.readouterr().out
+        assert "  * prod" in out
+        assert "    dev " in out
+
+    def test_current_and_lookup(self, daemon):
+        current = request({"op": "current"})
+        assert current["data"]["name"] == "prod"
+
+        lookup = request({"op": "lookup", "project": "22222"})
+        assert lookup["data"] == {
+            "name": "dev",
+            "host": "dev.getdbt.com",
+            "project_id": 22222,
+        }
+
+    def test_sees_changes_made_outside(self, daemon, seeded):
+        """Edits by the regular CLI are picked up on the next request."""
+        request({"op": "list"})
+        add_config("qa", "qa.getdbt.com", 33333)
+        seeded.write_text(
+            CLOUD_YAML.replace("11111", "33333").replace("prod.getdbt", "qa.getdbt")
+        )
+
+        assert request({"op": "current"})["data"]["name"] == "qa"
+
+    def test_bad_requests(self, daemon):
+        assert request({"op": "explode"})["ok"] is False
+        assert request({"op": "lookup", "project": "missing"})["ok"] is False
+
+    def test_refuses_second_daemon(self, daemon):
+        with pytest.raises(RuntimeError, match="already listening"):
+            DaemonServer(daemon)
+
+    def test_no_daemon_env_var(self, daemon, monkeypatch):
+        monkeypatch.setenv("DBT_SWITCH_NO_DAEMON", "1")
+
+        assert client.forward(["list"]) is None
@@ -0,0 +1,124 @@
+"""
+Unit tests for atomic writes and advisory locking.
+"""
+
+import os
+import stat
+import pytest
+
+from dbt_switch.config.atomic import atomic_write, file_lock, lock_path_for
+
+
+@pytest.fixture
+def work_dir(tmp_path):
+    path = tmp_path / "work"
+    path.mkdir()
+    return path
+
+
+class TestAtomicWrite:
+    """Test temp-file-and-rename writes."""
+
+    def test_replaces_contents(self, work_dir):
+        target = work_dir / "dbt_cloud.yml"
+        target.write_text("old\n")
+
+        with atomic_write(target) as file:
+            file.write("new\n")
+
+        assert target.read_text() == "new\n"
+        assert os.listdir(work_dir) == ["dbt_cloud.yml"]
+
+    def test_failure_keeps_original(self, work_dir):
+        """An exception inside the block leaves the target untouched."""
+        target = work_dir / "dbt_cloud.yml"
+        target.write_text("old\n")
+
+        with pytest.raises(RuntimeError):
+            with atomic_write(target) as file:
+                file.write("half")
+                raise RuntimeError("boom")
+
+        assert target.read_text() == "old\n"
+        assert os.listdir(work_dir) == ["dbt_cloud.yml"]
+
+    def test_preserves_permissions(self, work_dir):
+        target = work_dir / "dbt_switch.yml"
+        target.write_text("old\n")
+        target.chmod(0o640)
+
+        with atomic_write(target) as file:
+            file.write("new\n")
+
+        assert stat.S_IMODE(target.stat().st_mode) == 0o640
+
+    def test_newline_passthrough(self, work_dir):
+        target = work_dir / "dbt_cloud.yml"
+
+        with atomic_write(target, newline="") as file:
+            file.write("a\r\nb\r\n")
+
+        assert target.read_bytes() == b"a\r\nb\r\n"
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="no symlinks")
+    def test_writes_through_symlink(self, work_dir):
+        dotfiles = work_dir / "dotfiles"
+        dotfiles.mkdir()
+        real = dotfiles / "dbt_cloud.yml"
+        real.write_text("old\n")
+        os.chmod(real, 0o600)
+        link = work_dir / "dbt_cloud.yml"
+        link.symlink_to(real)
+
+        with atomic_write(link) as file:
+            file.write("new\n")
+
+        assert link.is_symlink()
+        assert os.readlink(link) == str(real)
+        assert real.read_text() == "new\n"
+        assert stat.S_IMODE(real.stat().st_mode) == 0o600
+        assert sorted(os.listdir(dotfiles)) == ["dbt_cloud.yml"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="fcntl locks are POSIX only")
+class TestFileLock:
+    """Test the advisory lock used around read-modify-write cycles."""
+
+    def test_lock_times_out_while_held(self, work_dir):
+        target = work_dir / "dbt_switch.yml"
+
+        with file_lock(target):
+            with pytest.raises(TimeoutError, match="waiting for the lock"):
+                with file_lock(target, timeout=0.05):
+                    pass
+
+        assert lock_path_for(target).exists()
+
+    def test_lock_released_after_block(self, work_dir):
+        target = work_dir / "dbt_switch.yml"
+
+        with file_lock(target):
+            pass
+        with file_lock(target, timeout=0.05):
+            pass
+
+    def test_symlink_locks_its_target(self, work_dir):
+        real = work_dir / "real.yml"
+        real.write_text("")
+        link = work_dir / "dbt_switch.yml"
+        link.symlink_to(real)
+
+        with file_lock(real):
+            with pytest.raises(TimeoutError):
+                with file_lock(link, timeout=0.05):
+                    pass
+
+        assert not lock_path_for(link).exists()
+
+    def test_missing_directory_is_noop(self, work_dir):
+        target = work_dir / "missing" / "dbt_switch.yml"
+
+        with file_lock(target):
+            pass
+
+        assert not target.parent.exists()
@@ -0,0 +1,195 @@
+"""
+Unit tests for directory-aware switching with `dbt-switch auto`.
+"""
+
+import subprocess
+
+import pytest
+
+from dbt_switch.config import auto_switch as auto_module
+from dbt_switch.config import cloud_handler
+from dbt_switch.config.auto_switch import (
+    fast_auto,
+    load_entries,
+    locate_project,
+    read_project_ref,
+)
+from dbt_switch.config.cloud_handler import auto_switch, read_active_context
+from dbt_switch.config.file_handler import save_config
+from dbt_switch.config.input_handler import auto_switch_user_config
+from dbt_switch.utils.shell import format_hook
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+CLOUD_YAML = """version: "1"
+context:
+  active-host: "prod.getdbt.com"
+  active-project: "11111"
+projects: []
+"""
+
+
+@pytest.fixture
+def settled(monkeypatch):
+    """Trust every stat key, as if all files were written long ago."""
+    monkeypatch.setattr(auto_module, "is_settled", lambda key: key is not None)
+
+
+@pytest.fixture
+def home(isolated_config_paths):
+    save_config(
+        DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="prod.getdbt.com", project_id=11111),
+                "dev": ProjectConfig(host="dev.getdbt.com", project_id=22222),
+            }
+        )
+    )
+    (isolated_config_paths / "dbt_cloud.yml").write_text(CLOUD_YAML)
+    return isolated_config_paths
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A monorepo with one dbt project per directory."""
+    root = tmp_path / "repo"
+    (root / "dev_project" / "models" / "staging").mkdir(parents=True)
+    (root / "dev_project" / "dbt_project.yml").write_text(
+        "name: dev\ndbt-cloud:\n  project-id: 22222  # dev\n"
+    )
+    (root / "prod_project").mkdir()
+    (root / "prod_project" / ".dbt-switch").write_text("# owned by data-eng\nprod\n")
+    return root
+
+
+class TestReadProjectRef:
+    """Test reading the project from markers and dbt_project.yml."""
+
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            ("name: a\ndbt-cloud:\n  project-id: 123\n", "123"),
+            ("dbt-cloud:\n  defer-env-id: 9\n  project-id: '456'\nname: a\n", "456"),
+            ("name: a\ndbt-cloud: {project-id: 789}\n", "789"),
+            ("name: a\nmodels:\n  a:\n    +materialized: view\n", None),
+            ("dbt-cloud:\n  defer-env-id: 9\nvars:\n  project-id: 5\n", None),
+        ],
+    )
+    def test_dbt_project(self, tmp_path, content, expected):
+        path = tmp_path / "dbt_project.yml"
+        path.write_text(content)
+
+        assert read_project_ref(path) == expected
+
+    def test_marker(self, tmp_path):
+        path = tmp_path / ".dbt-switch"
+        path.write_text("\n# comment\n  prod  # the prod project\n")
+
+        assert read_project_ref(path) == "prod"
+
+
+class TestLocateProject:
+    """Test the upward directory walk."""
+
+    def test_nearest_dbt_project(self, repo):
+        found = locate_project(repo / "dev_project" / "models" / "staging")
+
+        assert found["file"] == str(repo / "dev_project" / "dbt_project.yml")
+        assert found["ref"] == "22222"
+        assert len(found["dirs"]) == 3
+
+    def test_marker_wins_in_same_directory(self, repo):
+        (repo / "dev_project" / ".dbt-switch").write_text("prod\n")
+
+        assert locate_project(repo / "dev_project")["ref"] == "prod"
+
+    def test_nothing_found(self, tmp_path):
+        found = locate_project(tmp_path)
+
+        assert found["file"] is None and found["ref"] is None
+
+
+class TestAutoSwitch:
+    """Test switching and memoization."""
+
+    def test_switches_then_skips(self, home, repo):
+        start = repo / "dev_project" / "models"
+
+        assert auto_switch(start) == {"status": "switched", "name": "dev"}
+        assert read_active_context() == ("dev.getdbt.com", "22222")
+
+        cloud_file = home / "dbt_cloud.yml"
+        before = cloud_file.stat().st_mtime_ns
+        assert auto_switch(start) == {"status": "active", "name": "dev"}
+        assert cloud_file.stat().st_mtime_ns == before
+
+    def test_marker_by_name(self, home, repo):
+        assert auto_switch(repo / "prod_project")["status"] == "active"
+
+    def test_outside_any_project(self, home, tmp_path):
+        assert auto_switch(tmp_path)["status"] == "none"
+
+    def test_unknown_project(self, home, repo, monkeypatch):
+        (repo / "prod_project" / ".dbt-switch").write_text("staging\n")
+
+        with pytest.raises(ValueError, match="'staging'"):
+            auto_switch(repo / "prod_project")
+        monkeypatch.chdir(repo / "prod_project")
+        assert auto_switch_user_config() is False
+
+    def test_memoized_walk(self, home, repo, settled, monkeypatch):
+        start = repo / "dev_project" / "models" / "staging"
+        auto_switch(start)
+        assert str(start) in load_entries(home / "dbt_cloud.yml")
+
+        monkeypatch.setattr(
+            cloud_handler,
+            "locate_project",
+            lambda _: pytest.fail("directory walked again"),
+        )
+        assert auto_switch(start)["status"] == "active"
+
+    def test_new_marker_invalidates(self, home, repo, settled):
+        start = repo / "dev_project" / "models"
+        auto_switch(start)
+
+        (start / ".dbt-switch").write_text("prod\n")
+
+        assert auto_switch(start) == {"status": "switched", "name": "prod"}
+
+
+class TestFastAuto:
+    """Test the entry-point fast path."""
+
+    @pytest.fixture
+    def cwd(self, home, repo, settled, monkeypatch):
+        monkeypatch.setattr(auto_module, "DBT_DIR", home)
+        start = repo / "dev_project"
+        monkeypatch.chdir(start)
+        return start
+
+    def test_active_project(self, cwd):
+        auto_switch(cwd)
+
+        assert fast_auto(["auto"]) == 0
+
+    def test_needs_switch(self, cwd, home):
+        auto_switch(cwd)
+        cloud_handler.switch_project("prod")
+
+        assert fast_auto(["auto"]) is None
+
+    def test_not_memoized(self, cwd):
+        assert fast_auto(["auto"]) is None
+        assert fast_auto(["list"]) is None
+
+
+@pytest.mark.parametrize("shell", ["bash", "zsh"])
+def test_hook_syntax(shell):
+    """The generated hooks parse in their shell."""
+    try:
+        result = subprocess.run(
+            [shell, "-n"], input=format_hook(shell), capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        pytest.skip(f"{shell} is not installed")
+    assert result.returncode == 0, result.stderr
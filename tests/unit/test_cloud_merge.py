@@ -0,0 +1,129 @@
+"""
+Unit tests for merging downloaded dbt_cloud.yml files.
+"""
+
+import tracemalloc
+
+import pytest
+
+from dbt_switch.config.cloud_merge import merge_cloud_files
+from dbt_switch.config.input_handler import merge_user_config
+from dbt_switch.config.yaml_io import load_yaml
+from dbt_switch.validation.schemas import DbtCloudConfig
+
+
+def _project(account_id, project_id, token="tok"):
+    return (
+        f'  - project-name: "P{project_id}"\n'
+        f'    project-id: "{project_id}"\n'
+        f'    account-name: "A{account_id}"\n'
+        f'    account-id: "{account_id}"\n'
+        f'    account-host: "cloud.getdbt.com"\n'
+        f'    token-name: "cli"\n'
+        f'    token-value: "{token}"\n'
+    )
+
+
+def _export(path, account_id, project_ids, active=None, token="tok"):
+    text = ""
+    if active is not None:
+        text += (
+            f'version: "1"\ncontext:\n  active-host: "cloud.getdbt.com"\n'
+            f'  active-project: "{active}"\n'
+        )
+    text += "projects:\n" + "".join(
+        _project(account_id, pid, token) for pid in project_ids
+    )
+    path.write_text(text)
+    return path
+
+
+def _load(path):
+    return DbtCloudConfig(**load_yaml(path.read_text()))
+
+
+class TestMergeCloudFiles:
+    """Test de-duplication, headers and error handling."""
+
+    def test_merges_and_dedupes(self, tmp_path):
+        a = _export(tmp_path / "a.yml", 1, [10, 11], active=10, token="first")
+        b = _export(tmp_path / "b.yml", 1, [11, 12], active=12, token="second")
+        # Same project ID in another account is a different project
+        c = _export(tmp_path / "c.yml", 2, [11])
+        output = tmp_path / "out" / "dbt_cloud.yml"
+
+        counts = merge_cloud_files([a, b, c], output)
+
+        assert counts == {"files": 3, "projects": 4, "duplicates": 1}
+        merged = _load(output)
+        assert merged.context.active_project == "10"
+        assert [(p.account_id, p.project_id) for p in merged.projects] == [
+            ("1", "10"),
+            ("1", "11"),
+            ("1", "12"),
+            ("2", "11"),
+        ]
+        assert merged.projects[1].token_value == "first"
+
+    def test_existing_output_is_kept(self, tmp_path):
+        output = _export(tmp_path / "dbt_cloud.yml", 1, [10], active=10)
+        new = _export(tmp_path / "new.yml", 2, [20, 10], active=20)
+
+        merge_cloud_files([new], output)
+
+        merged = _load(output)
+        assert merged.context.active_project == "10"
+        assert len(merged.projects) == 3
+
+    def test_header_from_later_file(self, tmp_path):
+        a = _export(tmp_path / "a.yml", 1, [10])
+        b = _export(tmp_path / "b.yml", 1, [11], active=11)
+        output = tmp_path / "dbt_cloud.yml"
+        merge_cloud_files([a, b], output)
+        assert [p.project_id for p in _load(output).projects] == ["10", "11"]
+
+    def test_errors_leave_output_untouched(self, tmp_path):
+        output = _export(tmp_path / "dbt_cloud.yml", 1, [10], active=10)
+        before = output.read_text()
+        bad = tmp_path / "bad.yml"
+        bad.write_text(
+            'projects:\n  - project-name: "x"\n    project-id: "1"\n  - not a mapping\n'
+        )
+        broken = tmp_path / "broken.yml"
+        broken.write_text("projects: [\n")
+
+        with pytest.raises(ValueError) as excinfo:
+            merge_cloud_files([bad, broken], output)
+
+        message = str(excinfo.value)
+        assert "bad.yml: projects[0]: account-name: Field required" in message
+        assert "bad.yml: projects[1]" in message
+        assert "broken.yml" in message
+        assert output.read_text() == before
+
+    def test_no_context(self, tmp_path):
+        a = _export(tmp_path / "a.yml", 1, [10])
+        with pytest.raises(ValueError, match="version and context"):
+            merge_cloud_files([a], tmp_path / "dbt_cloud.yml")
+
+    def test_memory_flat_in_number_of_files(self, tmp_path):
+        def peak(count):
+            files = [
+                _export(tmp_path / f"{count}-{i}.yml", 1, range(100, 150), active=100)
+                for i in range(count)
+            ]
+            tracemalloc.start()
+            merge_cloud_files(files, tmp_path / f"out-{count}.yml")
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        assert peak(60) < 1.5 * peak(5)
+
+    def test_user_wrapper(self, tmp_path, caplog):
+        a = _export(tmp_path / "a.yml", 1, [10, 10], active=10)
+        output = tmp_path / "dbt_cloud.yml"
+        assert merge_user_config([str(a)], output) is True
+        assert "Merged 1 project(s) from 1 file(s)" in caplog.text
+        assert "(1 duplicate(s) dropped)" in caplog.text
+        assert merge_user_config([str(tmp_path / "missing.yml")], output) is False
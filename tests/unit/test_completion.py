@@ -0,0 +1,208 @@
+"""
+Unit tests for the shell completion scripts and their profile names file.
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from dbt_switch.cli.parser import cli
+from dbt_switch.config import file_handler
+from dbt_switch.config.cache import completions_path
+from dbt_switch.config.file_handler import (
+    add_config,
+    delete_project_config,
+    get_config,
+    import_configs,
+    refresh_completions,
+    update_project,
+)
+from dbt_switch.config.fragments import fragment_dir
+from dbt_switch.config.history import record_switch, recent_path
+from dbt_switch.utils.shell import format_completion
+
+
+def _names(config_file):
+    return completions_path(config_file).read_text().splitlines()
+
+
+class TestNamesFile:
+    """Test that every write to dbt_switch.yml refreshes the names file."""
+
+    def test_add_update_delete(self, isolated_config_paths):
+        config_file = isolated_config_paths / "dbt_switch.yml"
+        add_config("beta", "b.getdbt.com", 2)
+        add_config("alpha", "a.getdbt.com", 1)
+        assert _names(config_file) == ["alpha", "beta"]
+
+        completions_path(config_file).unlink()
+        update_project("alpha", host="c.getdbt.com")
+        assert _names(config_file) == ["alpha", "beta"]
+
+        delete_project_config("beta")
+        assert _names(config_file) == ["alpha"]
+
+    def test_bulk_import(self, isolated_config_paths):
+        import_configs(
+            [
+                {"name": name, "host": "a.getdbt.com", "project_id": pid}
+                for name, pid in (("two", 2), ("one", 1))
+            ]
+        )
+        assert _names(isolated_config_paths / "dbt_switch.yml") == ["one", "two"]
+
+    def test_hand_edit_picked_up_on_parse(self, isolated_config_paths):
+        config_file = isolated_config_paths / "dbt_switch.yml"
+        config_file.write_text(
+            "profiles:\n  edited:\n    host: a.getdbt.com\n    project_id: 1\n"
+        )
+        assert get_config() is not None
+        assert _names(config_file) == ["edited"]
+
+    def test_refresh_without_config(self, isolated_config_paths):
+        refresh_completions()
+        assert _names(isolated_config_paths / "dbt_switch.yml") == []
+
+
+class TestScripts:
+    """Test the generated completion scripts."""
+
+    @pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+    def test_paths_and_commands_substituted(self, shell):
+        script = format_completion(
+            shell,
+            ["list", "add"],
+            "/tmp/my dir/dbt_switch.yml",
+            "/tmp/my dir/dbt_switch.d",
+            "/tmp/names.txt",
+            "/tmp/recent.txt",
+        )
+        for placeholder in (
+            "@COMMANDS@",
+            "@OPTIONS@",
+            "@CONFIG@",
+            "@FRAGMENTS@",
+            "@NAMES@",
+            "@RECENT@",
+        ):
+            assert placeholder not in script
+        assert "add list" in script
+        assert "my dir/dbt_switch.yml'" in script
+        assert "dbt-switch completion --refresh" in script
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash not installed")
+    def test_bash_completes_names_without_python(self, isolated_config_paths):
+        config_file = isolated_config_paths / "dbt_switch.yml"
+        add_config("prod", "a.getdbt.com", 1)
+        add_config("preview", "a.getdbt.com", 2)
+        add_config("other", "a.getdbt.com", 3)
+        record_switch(config_file, "prod")
+        script = format_completion(
+            "bash",
+            ["list"],
+            config_file,
+            fragment_dir(config_file),
+            completions_path(config_file),
+            recent_path(config_file),
+        )
+        # A refresh would have to start dbt-switch; fail loudly if it does
+        script += "dbt-switch() { echo CALLED; }\n"
+        script += (
+            "COMP_WORDS=(dbt-switch -p pr); COMP_CWORD=2; _dbt_switch_complete\n"
+            'echo "${COMPREPLY[@]}"\n'
+        )
+        result = subprocess.run(
+            ["bash", "--norc", "-c", script],
+            capture_output=True,
+            text=True,
+            env={"PATH": os.environ["PATH"]},
+        )
+        assert result.returncode == 0, result.stderr
+        # Recently used first, each name once
+        assert result.stdout.split() == ["prod", "preview"]
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash not installed")
+    def test_bash_skips_deleted_recent_names(self, isolated_config_paths):
+        config_file = isolated_config_paths / "dbt_switch.yml"
+        add_config("prod", "a.getdbt.com", 1)
+        add_config("preview", "a.getdbt.com", 2)
+        add_config("pricing", "a.getdbt.com", 3)
+        record_switch(config_file, "pricing")
+        record_switch(config_file, "preview")
+        delete_project_config("preview")
+        script = format_completion(
+            "bash",
+            ["list"],
+            config_file,
+            fragment_dir(config_file),
+            completions_path(config_file),
+            recent_path(config_file),
+        )
+        script += "dbt-switch() { echo CALLED; }\n"
+        script += (
+            "COMP_WORDS=(dbt-switch -p pr); COMP_CWORD=2; _dbt_switch_complete\n"
+            'echo "${COMPREPLY[@]}"\n'
+        )
+        result = subprocess.run(
+            ["bash", "--norc", "-c", script],
+            capture_output=True,
+            text=True,
+            env={"PATH": os.environ["PATH"]},
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ["pricing", "prod"]
+
+    def test_bash_script_avoids_bash4_features(self):
+        """macOS still ships bash 3.2 as /bin/bash."""
+        script = format_completion("bash", ["list"], "c", "d", "n", "r")
+        assert "local -A" not in script
+        assert "declare -A" not in script
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash not installed")
+    def test_bash_refreshes_when_fragment_is_newer(self, isolated_config_paths):
+        config_file = isolated_config_paths / "dbt_switch.yml"
+        add_config("prod", "a.getdbt.com", 1)
+        names_file = completions_path(config_file)
+        fragment = fragment_dir(config_file) / "team.yml"
+        fragment.parent.mkdir()
+        fragment.write_text("profiles: {}\n")
+        stamp = names_file.stat().st_mtime
+        os.utime(fragment.parent, (stamp - 10, stamp - 10))
+        os.utime(fragment, (stamp + 10, stamp + 10))
+        script = format_completion(
+            "bash",
+            ["list"],
+            config_file,
+            fragment_dir(config_file),
+            names_file,
+            recent_path(config_file),
+        )
+        script += "dbt-switch() { echo CALLED; }\n_dbt_switch_refresh\n"
+        result = subprocess.run(
+            ["bash", "--norc", "-c", script],
+            capture_output=True,
+            text=True,
+            env={"PATH": os.environ["PATH"]},
+        )
+        assert result.returncode == 0, result.stderr
+        assert "CALLED" in result.stdout
+
+
+class TestCompletionCommand:
+    """Test the completion subcommand."""
+
+    def test_prints_script(self):
+        result = CliRunner().invoke(cli, ["completion", "bash"])
+        assert result.exit_code == 0
+        assert "complete -F _dbt_switch_complete dbt-switch" in result.output
+        assert " update " in result.output
+        assert str(completions_path(file_handler.CONFIG_FILE)) in result.output
+
+    def test_refresh_and_usage(self, isolated_config_paths):
+        runner = CliRunner()
+        assert runner.invoke(cli, ["completion", "--refresh"]).exit_code == 0
+        assert completions_path(isolated_config_paths / "dbt_switch.yml").exists()
+        assert runner.invoke(cli, ["completion"]).exit_code == 1
@@ -0,0 +1,228 @@
+"""
+Unit tests for the persistent parse cache.
+"""
+
+import json
+import os
+import stat
+import time
+import pytest
+from unittest.mock import patch
+
+from dbt_switch.config import file_handler, cloud_handler
+from dbt_switch.config.cache import (
+    cache_path_for,
+    content_hash,
+    load_snapshot,
+    stat_key,
+    store_snapshot,
+)
+from dbt_switch.validation.records import CloudProjectRecord, ProjectRecord
+from dbt_switch.validation.schemas import ProjectConfig
+
+SWITCH_YAML = """
+profiles:
+  prod:
+    host: prod.getdbt.com
+    project_id: 11111
+  dev:
+    host: dev.getdbt.com
+    project_id: 22222
+"""
+
+CLOUD_YAML = """
+version: "1"
+context:
+  active-host: "prod.getdbt.com"
+  active-project: "11111"
+projects:
+  - project-name: "Prod"
+    project-id: "11111"
+    account-name: "Acme"
+    account-id: "1"
+    account-host: "prod.getdbt.com"
+    token-name: "cli"
+    token-value: "dbtu_token"
+"""
+
+
+def _write_settled(path, content, age_seconds=10):
+    """Write a file and push its mtime outside the racy window."""
+    path.write_text(content)
+    past = time.time() - age_seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def switch_file(tmp_path, monkeypatch):
+    path = tmp_path / "dbt_switch.yml"
+    monkeypatch.setattr(file_handler, "CONFIG_FILE", path)
+    return path
+
+
+@pytest.fixture
+def cloud_file(tmp_path, monkeypatch):
+    path = tmp_path / "dbt_cloud.yml"
+    monkeypatch.setattr(cloud_handler, "DBT_CLOUD_FILE", path)
+    return path
+
+
+class TestSwitchConfigCache:
+    """Cache behaviour for dbt_switch.yml."""
+
+    def test_repeat_read_skips_yaml(self, switch_file):
+        """A second read of an unchanged file is served from the snapshot."""
+        _write_settled(switch_file, SWITCH_YAML)
+
+        first = file_handler.get_config()
+        assert cache_path_for(switch_file).exists()
+
+        with patch.object(
+            file_handler, "load_yaml", side_effect=AssertionError("parsed")
+        ):
+            second = file_handler.get_config()
+
+        assert second.model_dump() == first.model_dump()
+
+    def test_hand_edit_invalidates(self, switch_file):
+        """Editing the YAML changes the stat key and forces a re-parse."""
+        _write_settled(switch_file, SWITCH_YAML)
+        file_handler.get_config()
+
+        _write_settled(
+            switch_file, SWITCH_YAML.replace("11111", "33333"), age_seconds=5
+        )
+        config = file_handler.get_config()
+
+        assert config.profiles["prod"].project_id == 33333
+
+    @pytest.mark.parametrize(
+        "garbage",
+        ["not json", '{"format": 1}', '{"format": 1, "key": null, "data": []}'],
+    )
+    def test_corrupt_cache_falls_back(self, switch_file, garbage):
+        """Unreadable snapshots are treated as a miss."""
+        _write_settled(switch_file, SWITCH_YAML)
+        file_handler.get_config()
+        cache_path_for(switch_file).write_text(garbage)
+
+        config = file_handler.get_config()
+
+        assert set(config.profiles) == {"prod", "dev"}
+
+    def test_malformed_snapshot_data_falls_back(self, switch_file):
+        """A snapshot with the right key but wrong shape is ignored."""
+        _write_settled(switch_file, SWITCH_YAML)
+        store_snapshot(switch_file, stat_key(switch_file), {"profiles": {"x": [1]}})
+
+        config = file_handler.get_config()
+
+        assert set(config.profiles) == {"prod", "dev"}
+
+    def test_recently_modified_file_cached_by_hash(self, switch_file):
+        """Files inside the racy window are only matched by content hash."""
+        switch_file.write_text(SWITCH_YAML)
+
+        file_handler.get_config()
+
+        entry = json.loads(cache_path_for(switch_file).read_text())
+        assert entry["key"] is None
+        assert entry["hash"] == content_hash(SWITCH_YAML.encode())
+        with patch.object(
+            file_handler, "load_yaml", side_effect=AssertionError("parsed")
+        ):
+            assert set(file_handler.get_config().profiles) == {"prod", "dev"}
+
+        # A same-size edit in the same timestamp tick is still seen
+        switch_file.write_text(SWITCH_YAML.replace("11111", "33333"))
+        assert file_handler.get_config().profiles["prod"].project_id == 33333
+
+    def test_unchanged_content_is_rekeyed(self, switch_file):
+        """A touched but unchanged file is hashed once, not re-validated."""
+        _write_settled(switch_file, SWITCH_YAML, age_seconds=20)
+        file_handler.get_config()
+        os.utime(switch_file, (time.time() - 10, time.time() - 10))
+        key = stat_key(switch_file)
+
+        with patch.object(
+            file_handler, "DbtSwitchConfig", side_effect=AssertionError("validated")
+        ):
+            config = file_handler.get_config()
+
+        assert config.profiles["prod"].project_id == 11111
+        assert json.loads(cache_path_for(switch_file).read_text())["key"] == key
+
+    def test_read_only_records(self, switch_file):
+        """Read-only cached reads hold slotted records, not models."""
+        _write_settled(switch_file, SWITCH_YAML)
+        file_handler.get_config()
+
+        config = file_handler.get_config(read_only=True)
+
+        prod = config.profiles["prod"]
+        assert isinstance(prod, ProjectRecord)
+        assert (prod.host, prod.project_id) == ("prod.getdbt.com", 11111)
+        assert not hasattr(prod, "__dict__")
+        assert config.resolve_profile("22222") == "dev"
+        assert config.find_profile("https://prod.getdbt.com/", "11111") == "prod"
+        # Callers that save still get models
+        assert isinstance(file_handler.get_config().profiles["prod"], ProjectConfig)
+
+    def test_missing_file_has_no_key(self, tmp_path):
+        """Missing files produce no key and never hit."""
+        missing = tmp_path / "missing.yml"
+        assert stat_key(missing) is None
+        assert load_snapshot(missing, None) is None
+
+
+class TestCloudConfigCache:
+    """Cache behaviour for dbt_cloud.yml."""
+
+    def test_snapshot_round_trip(self, cloud_file):
+        """A cached read reproduces the validated config exactly."""
+        _write_settled(cloud_file, CLOUD_YAML)
+
+        first = cloud_handler.read_dbt_cloud_config()
+        with patch.object(
+            cloud_handler, "load_yaml", side_effect=AssertionError("parsed")
+        ):
+            second = cloud_handler.read_dbt_cloud_config()
+
+        assert second.model_dump(by_alias=True) == first.model_dump(by_alias=True)
+
+    def test_read_only_records(self, cloud_file):
+        """Read-only cached reads hold slotted records for the projects."""
+        _write_settled(cloud_file, CLOUD_YAML)
+        first = cloud_handler.read_dbt_cloud_config()
+
+        second = cloud_handler.read_dbt_cloud_config(read_only=True)
+
+        item = second.projects[0]
+        assert isinstance(item, CloudProjectRecord)
+        assert "dbtu_token" not in repr(item)
+        assert [getattr(item, field) for field in vars(first.projects[0])] == [
+            getattr(first.projects[0], field) for field in vars(first.projects[0])
+        ]
+        assert second.context.active_project == "11111"
+
+    def test_snapshot_private_to_user(self, cloud_file):
+        """The snapshot holds the tokens, so only the owner may read it."""
+        _write_settled(cloud_file, CLOUD_YAML)
+        old_umask = os.umask(0o022)
+        try:
+            cloud_handler.read_dbt_cloud_config()
+        finally:
+            os.umask(old_umask)
+
+        snapshot = cache_path_for(cloud_file)
+        assert "dbtu_token" in snapshot.read_text()
+        assert stat.S_IMODE(snapshot.stat().st_mode) == 0o600
+        assert stat.S_IMODE(snapshot.parent.stat().st_mode) == 0o700
+        assert [p.name for p in snapshot.parent.iterdir()] == [snapshot.name]
+
+    def test_invalid_file_not_cached(self, cloud_file):
+        """Files that fail validation never produce a snapshot."""
+        _write_settled(cloud_file, 'version: "1"\n')
+
+        assert cloud_handler.read_dbt_cloud_config() is None
+        assert not cache_path_for(cloud_file).exists()
@@ -0,0 +1,213 @@
+"""
+Unit tests for the in-place dbt_cloud.yml context editor.
+"""
+
+import pytest
+import yaml
+
+from dbt_switch.config import cloud_handler
+from dbt_switch.config.context_editor import patch_context, read_context
+from dbt_switch.validation.schemas import ProjectConfig
+
+CLOUD_YAML = """# merged by hand
+version: "1"
+context:
+  active-host: "old.getdbt.com" # previous account
+  # active-project: "99999"
+  active-project: "67890"
+projects:
+  # Alpha first
+  - project-name: "Alpha"
+    project-id: "12345"
+    account-name: "Alpha Inc"
+    account-id: "1"
+    account-host: "cloud.getdbt.com"
+    token-name: "cli"
+    token-value: "dbtu_alpha"
+  - project-name: "Beta"
+    project-id: "67890"
+    account-name: "Beta Corp"
+    account-id: "2"
+    account-host: "old.getdbt.com"
+    token-name: "cli"
+    token-value: "dbtu_beta"
+"""
+
+
+class TestPatchContext:
+    """Test rewriting the context block line by line."""
+
+    def test_only_context_lines_change(self):
+        """Everything except the two values is preserved byte for byte."""
+        patched = patch_context(CLOUD_YAML, "cloud.getdbt.com", "12345")
+
+        old_lines = CLOUD_YAML.splitlines()
+        new_lines = patched.splitlines()
+        changed = [i for i, (a, b) in enumerate(zip(old_lines, new_lines)) if a != b]
+        assert len(old_lines) == len(new_lines)
+        assert changed == [3, 5]
+        assert new_lines[3] == '  active-host: "cloud.getdbt.com" # previous account'
+        assert new_lines[5] == '  active-project: "12345"'
+
+    def test_result_parses_to_new_context(self):
+        """The patched file is still valid YAML with the new context."""
+        patched = patch_context(CLOUD_YAML, "cloud.getdbt.com", "12345")
+        data = yaml.safe_load(patched)
+
+        assert data["context"] == {
+            "active-host": "cloud.getdbt.com",
+            "active-project": "12345",
+        }
+        assert len(data["projects"]) == 2
+
+    def test_yaml_dump_layout(self):
+        """Files previously written by yaml.dump keep single quotes."""
+        text = yaml.dump(
+            {
+                "context": {"active-host": "a.com", "active-project": "1"},
+                "projects": [],
+                "version": "1",
+            },
+            default_flow_style=False,
+        )
+        patched = patch_context(text, "b.com", "2")
+
+        assert "active-project: '2'" in patched
+        assert yaml.safe_load(patched)["context"]["active-project"] == "2"
+
+    def test_context_last_and_nested_context_keys(self):
+        """Only a column-0 `context:` header counts, wherever it appears."""
+        text = (
+            "projects:\n"
+            "  - project-name: x\n"
+            "    context: not-the-header\n"
+            "context:\n"
+            "  active-host: a.com\n"
+            "  active-project: '1'"
+        )
+        patched = patch_context(text, "b.com", "2")
+
+        assert patched.endswith("  active-host: b.com\n  active-project: '2'")
+        assert patched.startswith("projects:\n  - project-name: x\n")
+
+    def test_plain_values_stay_strings(self):
+        """Plain scalars are quoted when they would not load as strings."""
+        text = "context:\n  active-host: a.com\n  active-project: abc\n"
+        patched = patch_context(text, "https://b.getdbt.com", "12345")
+
+        assert "active-host: https://b.getdbt.com\n" in patched
+        assert 'active-project: "12345"' in patched
+        assert yaml.safe_load(patched)["context"]["active-project"] == "12345"
+
+    def test_crlf_preserved(self):
+        """Windows line endings survive the rewrite."""
+        text = 'context:\r\n  active-host: "a"\r\n  active-project: "1"\r\n'
+        patched = patch_context(text, "b", "2")
+
+        assert patched == 'context:\r\n  active-host: "b"\r\n  active-project: "2"\r\n'
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            'context: {active-host: "a", active-project: "1"}\n',
+            'context:\n  active-host: "a"\n',
+            'context:\n  active-host: "a"\n  active-host: "b"\n  active-project: "1"\n',
+            "context:\n  active-host: &h a\n  active-project: '1'\n",
+            "context:\n  active-host: |\n    a\n  active-project: '1'\n",
+            "context:\n  active-host:\n    a\n  active-project: '1'\n",
+            "context:\n\tactive-host: a\n\tactive-project: '1'\n",
+            "version: '1'\n",
+            "context:\n  active-host: a\n  active-project: '1'\ncontext:\n  x: y\n",
+            "context:\n  active-host: my#host\n  active-project: '1'\n",
+            "context:\n  active-host: 'a'# note\n  active-project: '1'\n",
+        ],
+    )
+    def test_unusual_layouts_rejected(self, text):
+        """Layouts that can't be patched safely return None."""
+        assert patch_context(text, "b", "2") is None
+
+    def test_read_context(self):
+        """Context values are read without a full parse."""
+        assert read_context(CLOUD_YAML) == {
+            "active-host": "old.getdbt.com",
+            "active-project": "67890",
+        }
+
+    def test_hash_inside_plain_value(self):
+        """A `#` without whitespace before it is part of the value, not a comment."""
+        text = "context:\n  active-host: my#host\n  active-project: '1' # note\n"
+        assert read_context(text) is None
+
+        text = "context:\n  active-host: my #host\n  active-project: '1' # note\n"
+        assert read_context(text) == {"active-host": "my", "active-project": "1"}
+
+
+class TestSwitchInPlace:
+    """Test that switch_project uses the in-place path."""
+
+    def test_switch_project_patches_file(self, tmp_path, monkeypatch):
+        """Switching rewrites the context without re-serializing projects."""
+        cloud_file = tmp_path / "dbt_cloud.yml"
+        cloud_file.write_text(CLOUD_YAML)
+        monkeypatch.setattr(cloud_handler, "DBT_CLOUD_FILE", cloud_file)
+        monkeypatch.setattr(
+            cloud_handler,
+            "resolve_project",
+            lambda _: (
+                "alpha",
+                ProjectConfig(host="cloud.getdbt.com", project_id=12345),
+            ),
+        )
+        monkeypatch.setattr(
+            cloud_handler,
+            "write_dbt_cloud_config",
+            lambda _: pytest.fail("full rewrite used"),
+        )
+
+        cloud_handler.switch_project("alpha")
+
+        text = cloud_file.read_text()
+        assert "# Alpha first" in text
+        assert read_context(text) == {
+            "active-host": "cloud.getdbt.com",
+            "active-project": "12345",
+        }
+
+    def test_switch_project_falls_back(self, tmp_path, monkeypatch):
+        """Unusual layouts go through the full read/write path."""
+        cloud_file = tmp_path / "dbt_cloud.yml"
+        cloud_file.write_text(
+            'version: "1"\ncontext: {active-host: a.com, active-project: "1"}\n'
+        )
+        monkeypatch.setattr(cloud_handler, "DBT_CLOUD_FILE", cloud_file)
+        monkeypatch.setattr(
+            cloud_handler,
+            "resolve_project",
+            lambda _: ("b", ProjectConfig(host="b.com", project_id=2)),
+        )
+
+        cloud_handler.switch_project("b")
+
+        data = yaml.safe_load(cloud_file.read_text())
+        assert data["context"] == {"active-host": "b.com", "active-project": "2"}
+
+    def test_switch_project_keeps_hash_in_value(self, tmp_path, monkeypatch):
+        """A plain value containing `#` is switched through the full parse."""
+        cloud_file = tmp_path / "dbt_cloud.yml"
+        cloud_file.write_text(
+            'version: "1"\ncontext:\n  active-host: my#host\n  active-project: "1"\n'
+        )
+        monkeypatch.setattr(cloud_handler, "DBT_CLOUD_FILE", cloud_file)
+        monkeypatch.setattr(
+            cloud_handler,
+            "resolve_project",
+            lambda _: ("b", ProjectConfig(host="other#host", project_id=2)),
+        )
+
+        cloud_handler.switch_project("b")
+
+        data = yaml.safe_load(cloud_file.read_text())
+        assert data["context"] == {
+            "active-host": "other#host",
+            "active-project": "2",
+        }
@@ -0,0 +1,201 @@
+"""
+Unit tests for the cached `dbt-switch current` answer.
+"""
+
+import json
+import os
+
+import pytest
+
+from dbt_switch.config import cloud_handler, current
+from dbt_switch.config.current import (
+    current_cache_path,
+    fast_current,
+    format_current,
+    read_current,
+    record_current,
+)
+from dbt_switch.config.file_handler import save_config
+from dbt_switch.config.input_handler import show_current_project
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+
+def _cloud_yaml(host, project_id):
+    return (
+        'version: "1"\n'
+        "context:\n"
+        f'  active-host: "{host}"\n'
+        f'  active-project: "{project_id}"\n'
+        "projects: []\n"
+    )
+
+
+def _backdate(*paths):
+    """Move mtimes out of the racy window so stat keys are trusted."""
+    for path in paths:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60_000_000_000))
+
+
+@pytest.fixture
+def files(isolated_config_paths):
+    """Both config files with a 'prod' profile active."""
+    save_config(
+        DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="prod.getdbt.com", project_id=11111),
+                "dev": ProjectConfig(host="dev.getdbt.com", project_id=22222),
+            }
+        )
+    )
+    switch_file = isolated_config_paths / "dbt_switch.yml"
+    cloud_file = isolated_config_paths / "dbt_cloud.yml"
+    cloud_file.write_text(_cloud_yaml("prod.getdbt.com", 11111))
+    _backdate(switch_file, cloud_file)
+    return switch_file, cloud_file
+
+
+class TestReadCurrent:
+    """Test validation of the recorded active profile."""
+
+    def test_hit(self, files):
+        record_current(*files, "prod", "prod.getdbt.com", 11111)
+
+        assert read_current(*files) == {
+            "name": "prod",
+            "host": "prod.getdbt.com",
+            "project_id": "11111",
+        }
+
+    def test_missing_record(self, files):
+        assert read_current(*files) is None
+
+    def test_corrupt_record(self, files):
+        path = current_cache_path(files[1])
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("{not json")
+
+        assert read_current(*files) is None
+
+    def test_switch_file_changed(self, files):
+        switch_file, _ = files
+        record_current(*files, "prod", "prod.getdbt.com", 11111)
+        switch_file.write_text(switch_file.read_text() + "\n")
+
+        assert read_current(*files) is None
+
+    def test_cloud_context_changed(self, files):
+        _, cloud_file = files
+        record_current(*files, "prod", "prod.getdbt.com", 11111)
+        cloud_file.write_text(_cloud_yaml("dev.getdbt.com", 22222))
+
+        assert read_current(*files) is None
+
+    def test_cloud_rewritten_same_context(self, files):
+        """Rewrites that keep the context are still hits and refresh the key."""
+        _, cloud_file = files
+        record_current(*files, "prod", "prod.getdbt.com", 11111)
+        cloud_file.write_text(_cloud_yaml("prod.getdbt.com", 11111) + "# edited\n")
+
+        assert read_current(*files)["name"] == "prod"
+        record = json.loads(current_cache_path(cloud_file).read_text())
+        assert record["cloud_key"] == current.stat_key(cloud_file)
+
+    def test_unsettled_cloud_key_checks_context(self, files, monkeypatch):
+        """A just-written dbt_cloud.yml is verified by content, not by stat."""
+        _, cloud_file = files
+        record_current(*files, "prod", "prod.getdbt.com", 11111)
+        monkeypatch.setattr(
+            current, "is_settled", lambda key: key != current.stat_key(cloud_file)
+        )
+        monkeypatch.setattr(current, "read_context", lambda text: None)
+
+        assert read_current(*files) is None
+
+
+class TestFormatCurrent:
+    """Test --format rendering."""
+
+    @pytest.mark.parametrize(
+        "fmt, expected",
+        [("name", "prod"), ("host", "prod.getdbt.com"), ("id", "11111")],
+    )
+    def test_formats(self, fmt, expected):
+        info = {"name": "prod", "host": "prod.getdbt.com", "project_id": "11111"}
+
+        assert format_current(info, fmt) == expected
+
+    def test_no_matching_profile(self):
+        info = {"name": None, "host": "x.com", "project_id": "1"}
+
+        assert format_current(info, "name") is None
+        assert format_current(info, "id") == "1"
+
+
+class TestCurrentProject:
+    """Test deriving, recording and printing the active project."""
+
+    def test_derived_then_recorded(self, files):
+        _, cloud_file = files
+
+        assert cloud_handler.get_current_project()["name"] == "prod"
+        assert current_cache_path(cloud_file).exists()
+        assert read_current(*files)["name"] == "prod"
+
+    def test_unmatched_context(self, files):
+        _, cloud_file = files
+        cloud_file.write_text(_cloud_yaml("other.getdbt.com", 99))
+
+        assert cloud_handler.get_current_project() == {
+            "name": None,
+            "host": "other.getdbt.com",
+            "project_id": "99",
+        }
+
+    def test_switch_records_current(self, files):
+        cloud_handler.switch_project("dev")
+
+        record = json.loads(current_cache_path(files[1]).read_text())
+        assert (record["name"], record["project_id"]) == ("dev", "22222")
+        assert cloud_handler.get_current_project()["name"] == "dev"
+
+    def test_switch_by_id_records_name(self, files):
+        cloud_handler.switch_project("22222")
+
+        record = json.loads(current_cache_path(files[1]).read_text())
+        assert record["name"] == "dev"
+
+    def test_show_current_project(self, files, capsys):
+        assert show_current_project("host") is True
+        assert capsys.readouterr().out == "prod.getdbt.com\n"
+
+    def test_show_current_project_no_cloud_file(self, files):
+        files[1].unlink()
+
+        assert show_current_project() is False
+
+
+class TestFastCurrent:
+    """Test the entry-point fast path."""
+
+    @pytest.fixture
+    def home_files(self, files, monkeypatch):
+        monkeypatch.setattr(current, "DBT_DIR", files[0].parent)
+        return files
+
+    def test_hit(self, home_files, capsys):
+        record_current(*home_files, "prod", "prod.getdbt.com", 11111)
+
+        assert fast_current(["current", "--format=id"]) == 0
+        assert capsys.readouterr().out == "11111\n"
+
+    def test_miss_falls_through(self, home_files):
+        assert fast_current(["current"]) is None
+
+    @pytest.mark.parametrize(
+        "argv", [["list"], ["current", "--format", "url"], ["current", "--help"]]
+    )
+    def test_other_commands_fall_through(self, home_files, argv):
+        record_current(*home_files, "prod", "prod.getdbt.com", 11111)
+
+        assert fast_current(argv) is None
@@ -15,8 +15,8 @@ from dbt_switch.validation.schemas import DbtCloudConfig, DbtCloudContext
 
 class TestReadDbtCloudConfig:
     @patch("dbt_switch.config.cloud_handler.DBT_CLOUD_FILE")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("yaml.safe_load")
+    @patch("builtins.open", new_callable=mock_open, read_data=b"")
+    @patch("dbt_switch.config.cloud_handler.load_yaml")
     def test_read_valid_config(self, mock_yaml_load, mock_file, mock_path):
         mock_path.exists.return_value = True
         mock_yaml_load.return_value = {
@@ -57,13 +57,16 @@ class TestUpdateDbtCloudConfig:
 
 
 class TestSwitchProject:
-    @patch("dbt_switch.config.cloud_handler.get_project_config")
+    @patch("dbt_switch.config.cloud_handler.resolve_project")
     @patch("dbt_switch.config.cloud_handler.read_dbt_cloud_config")
     @patch("dbt_switch.config.cloud_handler.write_dbt_cloud_config")
     def test_switch_project_success(self, mock_write, mock_read, mock_get_config):
         from dbt_switch.validation.schemas import ProjectConfig
 
-        mock_get_config.return_value = ProjectConfig(host="test.com", project_id=12345)
+        mock_get_config.return_value = (
+            "test_project",
+            ProjectConfig(host="test.com", project_id=12345),
+        )
         mock_read.return_value = DbtCloudConfig(
             version="1",
             context=DbtCloudContext(active_host="old.com", active_project="67890"),
@@ -81,9 +84,11 @@ class TestSwitchProject:
         assert written_config.context.active_host == "test.com"
         assert written_config.context.active_project == "12345"
 
-    @patch("dbt_switch.config.cloud_handler.get_project_config")
+    @patch("dbt_switch.config.cloud_handler.resolve_project")
     def test_switch_project_not_found(self, mock_get_config):
-        mock_get_config.return_value = None
+        mock_get_config.side_effect = ValueError(
+            "Project 'nonexistent' not found in dbt_switch.yml"
+        )
 
         with pytest.raises(ValueError, match="Project 'nonexistent' not found"):
             switch_project("nonexistent")
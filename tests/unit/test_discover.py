@@ -0,0 +1,241 @@
+"""
+Unit tests for `dbt-switch discover` against a local fake dbt Cloud API.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from dbt_switch.config import cloud_api
+from dbt_switch.config.cloud_api import ApiClient, discover_accounts
+from dbt_switch.config.cloud_handler import (
+    discover_from_cloud,
+    read_dbt_cloud_config,
+)
+from dbt_switch.config.file_handler import get_config
+from dbt_switch.config.input_handler import discover_user_config
+
+
+class FakeApi(ThreadingHTTPServer):
+    """Accounts 7 (25 projects) and 8 (3 projects, first call fails)."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.projects = {
+            "7": [{"id": 100 + i, "name": f"Acme {i}"} for i in range(25)],
+            "8": [{"id": 200 + i, "name": f"Beta {i}"} for i in range(3)],
+        }
+        self.tokens = {"7": "tok7", "8": "tok8"}
+        self.fail_once = {"8"}
+        self.requests = []
+        self.not_modified = 0
+        self.ports = set()
+        self.lock = threading.Lock()
+
+    @property
+    def host(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=()):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        api = self.server
+        parts = urlsplit(self.path)
+        segments = parts.path.strip("/").split("/")
+        with api.lock:
+            api.requests.append(self.path)
+            api.ports.add(self.client_address[1])
+        account = segments[3] if len(segments) > 3 else None
+        if self.headers.get("Authorization") != f"Token {api.tokens.get(account)}":
+            return self._send(401, {"status": {"user_message": "Invalid token"}})
+        with api.lock:
+            fail = account in api.fail_once
+            api.fail_once.discard(account)
+        if fail:
+            return self._send(503, {}, [("Retry-After", "0")])
+
+        if len(segments) == 4:
+            return self._send(200, {"data": {"id": int(account), "name": "Acme Inc"}})
+        query = parse_qs(parts.query)
+        limit, offset = int(query["limit"][0]), int(query["offset"][0])
+        projects = api.projects[account]
+        etag = f'"{account}-{offset}-{len(projects)}"'
+        if self.headers.get("If-None-Match") == etag:
+            with api.lock:
+                api.not_modified += 1
+            return self._send(304)
+        body = {
+            "data": projects[offset : offset + limit],
+            "extra": {"pagination": {"count": limit, "total_count": len(projects)}},
+        }
+        self._send(200, body, [("ETag", etag)])
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(cloud_api, "PAGE_SIZE", 10)
+    server = FakeApi()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _account(api, account_id, token=None):
+    return {
+        "host": api.host,
+        "account_id": account_id,
+        "account_name": "Old name",
+        "token_name": "cli",
+        "token_value": token or f"tok{account_id}",
+    }
+
+
+class TestApiClient:
+    """Test pagination, retries, ETags and connection reuse."""
+
+    def test_pages_and_retry(self, api):
+        client = ApiClient(backoff=0)
+        entries, errors = discover_accounts(
+            [_account(api, "7"), _account(api, "8")], client
+        )
+        client.close()
+
+        assert errors == []
+        ids = sorted(int(entry["project-id"]) for entry in entries)
+        assert ids == list(range(100, 125)) + [200, 201, 202]
+        assert {entry["account-name"] for entry in entries} == {"Acme Inc"}
+        # 1 account + 3 pages for 7, 1 account + 1 page + 1 retry for 8
+        assert len(api.requests) == 7
+
+    def test_etag_revalidation(self, api):
+        client = ApiClient(backoff=0)
+        discover_accounts([_account(api, "7")], client)
+        first, _ = discover_accounts(
+            [_account(api, "7")], ApiClient(etags=client.etags)
+        )
+        assert len(first) == 25
+        assert api.not_modified == 3
+
+    def test_connections_are_reused(self, api):
+        client = ApiClient()
+        for _ in range(5):
+            client.get_json(f"{api.host}/api/v2/accounts/7/", "tok7")
+        client.close()
+        assert len(api.ports) == 1
+
+    def test_errors_reported_per_account(self, api):
+        client = ApiClient(backoff=0)
+        entries, errors = discover_accounts(
+            [_account(api, "7"), _account(api, "8", token="wrong")], client
+        )
+        assert len(entries) == 25
+        assert len(errors) == 1
+        assert errors[0].startswith("account 8 on http://127.0.0.1")
+        assert "HTTP 401" in errors[0]
+
+    def test_retries_exhausted(self, api):
+        api.fail_once = {"7"}
+        client = ApiClient(retries=0)
+        with pytest.raises(ValueError, match="HTTP 503"):
+            client.get_json(f"{api.host}/api/v2/accounts/7/", "tok7")
+
+
+class TestDiscoverFromCloud:
+    """Test merging discovered projects into both config files."""
+
+    @pytest.fixture
+    def cloud_file(self, isolated_config_paths, api):
+        path = isolated_config_paths / "dbt_cloud.yml"
+        path.write_text(
+            f"""version: "1"
+context:
+  active-host: "{api.host}"
+  active-project: "100"
+projects:
+  - project-name: "Acme 0"
+    project-id: "100"
+    account-name: "Acme"
+    account-id: "7"
+    account-host: "{api.host}"
+    token-name: "cli"
+    token-value: "tok7"
+  - project-name: "Beta 0"
+    project-id: "200"
+    account-name: "Beta"
+    account-id: "8"
+    account-host: "{api.host}/"
+    token-name: "cli"
+    token-value: "tok8"
+"""
+        )
+        return path
+
+    def test_merges_into_both_files(self, cloud_file):
+        result = discover_from_cloud()
+
+        assert result["errors"] == []
+        assert len(result["discovered"]) == 26
+        cloud_config = read_dbt_cloud_config()
+        assert len(cloud_config.projects) == 28
+        assert cloud_config.context.active_project == "100"
+        config = get_config()
+        assert len(config.profiles) == 28
+        assert config.resolve_profile("201") == "beta-1"
+
+        # Nothing new the second time round
+        assert discover_from_cloud()["discovered"] == []
+
+    def test_project_ids_are_per_account(self, cloud_file, api):
+        # Account 8 also has a project 105, like account 7
+        api.projects["8"].append({"id": 105, "name": "Beta 105"})
+
+        result = discover_from_cloud()
+
+        assert result["discovered"].count("105") == 2
+        keys = [(p.account_id, p.project_id) for p in read_dbt_cloud_config().projects]
+        assert ("7", "105") in keys and ("8", "105") in keys
+        assert len(keys) == len(set(keys)) == 29
+
+    def test_etags_kept_only_after_write(self, cloud_file):
+        from dbt_switch.config import cloud_handler
+
+        with patch.object(
+            cloud_handler, "write_dbt_cloud_config", side_effect=OSError("disk full")
+        ):
+            with pytest.raises(OSError):
+                discover_from_cloud()
+        assert not cloud_api.etag_cache_path(cloud_file).exists()
+
+        discover_from_cloud()
+        assert cloud_api.load_etags(cloud_file)
+
+    def test_reports_failed_accounts(self, cloud_file, api, caplog):
+        api.tokens["8"] = "rotated"
+        assert discover_user_config() is False
+        assert "✗ account 8" in caplog.text
+        assert len(read_dbt_cloud_config().projects) == 26
+
+    def test_missing_cloud_file(self, isolated_config_paths):
+        assert discover_user_config() is False
@@ -0,0 +1,150 @@
+"""
+Unit tests for `dbt-switch doctor`.
+"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dbt_switch.config.doctor import check_profiles, diagnose, probe_hosts
+from dbt_switch.config.file_handler import save_config
+from dbt_switch.config.input_handler import doctor_user_config
+from dbt_switch.validation.schemas import (
+    DbtCloudProjectItem,
+    DbtSwitchConfig,
+    ProjectConfig,
+)
+
+
+def _item(project_id, host):
+    return DbtCloudProjectItem(
+        project_name=f"p{project_id}",
+        project_id=str(project_id),
+        account_name="Acme",
+        account_id="7",
+        account_host=host,
+        token_name="token",
+        token_value="secret",
+    )
+
+
+def _config(**profiles):
+    return DbtSwitchConfig(
+        profiles={
+            name: ProjectConfig(host=host, project_id=pid)
+            for name, (host, pid) in profiles.items()
+        }
+    )
+
+
+class _Stub(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.send_response(401)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_host():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dead_host():
+    # A port that was free a moment ago refuses connections
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+class TestCheckProfiles:
+    """Test the cross-check against the dbt_cloud.yml projects list."""
+
+    def test_all_match(self):
+        config = _config(
+            prod=("https://Prod.getdbt.com/", 1), dev=("dev.getdbt.com", 2)
+        )
+        items = [_item(1, "prod.getdbt.com"), _item(2, "dev.getdbt.com")]
+        assert check_profiles(config, items) == []
+
+    def test_reports_every_problem(self):
+        config = _config(
+            missing=("prod.getdbt.com", 9),
+            stray=("other.getdbt.com", 8),
+            moved=("dev.getdbt.com", 1),
+            ok=("dev.getdbt.com", 2),
+        )
+        items = [_item(1, "prod.getdbt.com"), _item(2, "dev.getdbt.com")]
+        problems = check_profiles(config, items)
+
+        assert [name for name, _ in problems] == ["missing", "moved", "stray", "stray"]
+        assert "project ID 9 not found" in problems[0][1]
+        assert "does not match 'prod.getdbt.com'" in problems[1][1]
+        assert "project ID 8 not found" in problems[2][1]
+        assert "no project in dbt_cloud.yml uses host" in problems[3][1]
+
+
+class TestProbeHosts:
+    """Test the concurrent host probes against local servers."""
+
+    def test_reachable_and_unreachable(self, stub_host, dead_host):
+        config = _config(
+            a=(stub_host, 1), b=(stub_host + "/", 2), c=(dead_host, 3), d=(dead_host, 4)
+        )
+        problems = probe_hosts(config, timeout=2.0, workers=2)
+        assert [name for name, _ in problems] == ["c", "d"]
+        assert all("is unreachable" in message for _, message in problems)
+
+    def test_no_profiles(self):
+        assert probe_hosts(DbtSwitchConfig()) == []
+
+
+class TestDiagnose:
+    """Test the doctor entry points over the config files."""
+
+    @pytest.fixture
+    def files(self, isolated_config_paths, stub_host, dead_host):
+        save_config(_config(good=(stub_host, 1), dead=(dead_host, 2)))
+        (isolated_config_paths / "dbt_cloud.yml").write_text(
+            f"""version: "1"
+context:
+  active-host: "{stub_host}"
+  active-project: "1"
+projects:
+  - project-name: "Good"
+    project-id: "1"
+    account-name: "Acme"
+    account-id: "7"
+    account-host: "{stub_host}"
+    token-name: "token"
+    token-value: "secret"
+"""
+        )
+
+    def test_file_checks_then_probe(self, files):
+        assert [name for name, _ in diagnose()] == ["dead", "dead"]
+        problems = diagnose(probe=True, timeout=2.0)
+        assert [name for name, _ in problems] == ["dead", "dead", "dead"]
+        assert "is unreachable" in problems[-1][1]
+
+    def test_report(self, files, caplog):
+        assert doctor_user_config() is False
+        output = caplog.text
+        assert "✗ dead: project ID 2 not found in dbt_cloud.yml" in output
+        assert "Found 2 problem(s) in 1 project(s)" in output
+
+    def test_missing_cloud_file(self, isolated_config_paths):
+        save_config(_config(a=("a.getdbt.com", 1)))
+        with pytest.raises(ValueError, match="dbt_cloud.yml"):
+            diagnose()
+        assert doctor_user_config() is False
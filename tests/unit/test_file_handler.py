@@ -3,16 +3,19 @@ Simplified unit tests for file handling operations.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import mock_open, patch
 
 from dbt_switch.config.file_handler import (
     init_config,
     get_config,
     add_config,
     get_project_config,
+    resolve_project,
+    save_config,
     update_project,
     delete_project_config,
 )
+from dbt_switch.config.cache import cache_path_for
 from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
 
 
@@ -25,22 +28,29 @@ def temp_config_file(tmp_path):
 class TestFileOperations:
     """Test core file operations."""
 
-    @patch("dbt_switch.config.file_handler.CONFIG_FILE")
-    def test_init_config(self, mock_config_file):
+    def test_init_config(self, temp_config_file, monkeypatch):
         """Test config initialization."""
-        mock_config_file.exists.return_value = False
-        mock_config_file.parent.mkdir = MagicMock()
+        monkeypatch.setattr(
+            "dbt_switch.config.file_handler.CONFIG_FILE", temp_config_file
+        )
+
+        init_config()
 
-        with patch("builtins.open", create=True), patch("yaml.dump"):
-            init_config()
+        assert temp_config_file.read_text() == "profiles: {}\n"
 
     @patch("dbt_switch.config.file_handler.CONFIG_FILE")
     def test_get_config(self, mock_config_file):
         """Test loading config."""
         mock_config_file.exists.return_value = True
 
-        with patch("builtins.open", create=True):
-            with patch("yaml.safe_load", return_value={"profiles": {}}):
+        with (
+            patch("builtins.open", mock_open(read_data=b"profiles: {}\n")),
+            patch("dbt_switch.config.file_handler.load_snapshot", return_value=None),
+        ):
+            with patch(
+                "dbt_switch.config.file_handler.load_yaml",
+                return_value={"profiles": {}},
+            ):
                 result = get_config()
                 assert isinstance(result, DbtSwitchConfig)
 
@@ -92,6 +102,14 @@ class TestAddConfig:
         result = get_project_config("nonexistent")
         assert result is None
 
+        result = get_project_config("12345")
+        assert result is not None
+        assert result.project_id == 12345
+
+        result = get_project_config("test-")
+        assert result is not None
+        assert result.host == "test.getdbt.com"
+
 
 class TestUpdateProject:
     """Test updating project configurations."""
@@ -184,3 +202,49 @@ class TestDeleteProjectConfig:
 
         with pytest.raises(ValueError):
             delete_project_config("nonexistent")
+
+
+class TestResolveProject:
+    """Test -p resolution with prefixes and suggestions."""
+
+    @pytest.fixture
+    def saved(self, isolated_config_paths):
+        save_config(
+            DbtSwitchConfig(
+                profiles={
+                    "analytics-prod": ProjectConfig(host="a.com", project_id=1),
+                    "analytics-dev": ProjectConfig(host="a.com", project_id=2),
+                    "finance": ProjectConfig(host="f.com", project_id=3),
+                }
+            )
+        )
+        return isolated_config_paths / "dbt_switch.yml"
+
+    def test_exact_id_and_prefix(self, saved):
+        assert resolve_project("finance")[0] == "finance"
+        assert resolve_project("2")[0] == "analytics-dev"
+        assert resolve_project("analytics-p")[0] == "analytics-prod"
+
+    def test_ambiguous_prefix(self, saved):
+        with pytest.raises(
+            ValueError, match="matches several projects: analytics-dev, analytics-prod"
+        ):
+            resolve_project("analytics")
+
+    def test_did_you_mean(self, saved):
+        with pytest.raises(ValueError, match="Did you mean: finance"):
+            resolve_project("finanse")
+
+    def test_no_suggestion(self, saved):
+        with pytest.raises(ValueError) as exc_info:
+            resolve_project("zzz")
+        assert str(exc_info.value) == "Project 'zzz' not found in dbt_switch.yml"
+
+    def test_name_index_persisted(self, saved, monkeypatch):
+        """The trigram index is stored once the file is outside the racy window."""
+        monkeypatch.setattr("dbt_switch.config.cache.is_settled", lambda key: True)
+
+        with pytest.raises(ValueError):
+            resolve_project("finanse")
+
+        assert cache_path_for(saved, "names").exists()
@@ -0,0 +1,251 @@
+"""
+Unit tests for dbt_switch.d profile fragments.
+"""
+
+import os
+import sys
+import time
+import pytest
+from unittest.mock import patch
+
+from dbt_switch.config import file_handler
+from dbt_switch.config.file_handler import (
+    delete_project_config,
+    get_config,
+    save_config,
+    sync_cloud_projects,
+    update_project,
+)
+from dbt_switch.config.fragments import fragment_dir, fragment_paths, sources_key
+from dbt_switch.config.input_handler import show_current_project, validate_user_config
+from dbt_switch.utils.logger import logger
+from dbt_switch.validation.schemas import DbtCloudProjectItem
+
+MAIN_YAML = """
+profiles:
+  prod:
+    host: prod.getdbt.com
+    project_id: 1
+"""
+
+TEAM_YAML = """
+profiles:
+  analytics:
+    host: team.getdbt.com
+    project_id: 10
+  marketing:
+    host: team.getdbt.com
+    project_id: 11
+"""
+
+
+def _write_settled(path, content, age_seconds=10):
+    """Write a file and push its mtime outside the racy window."""
+    path.write_text(content)
+    past = time.time() - age_seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def config_file(isolated_config_paths):
+    path = isolated_config_paths / "dbt_switch.yml"
+    _write_settled(path, MAIN_YAML)
+    fragment_dir(path).mkdir()
+    return path
+
+
+def _fragment(config_file, name, content, age_seconds=10):
+    path = fragment_dir(config_file) / name
+    _write_settled(path, content, age_seconds)
+    return path
+
+
+class TestFragmentPaths:
+    """Test which files are read as fragments."""
+
+    def test_sorted_yml_files_only(self, config_file):
+        for name in ("b.yml", "a.yml", ".hidden.yml", "notes.txt", "c.yaml"):
+            _fragment(config_file, name, "profiles: {}\n")
+        (fragment_dir(config_file) / "d.yml").mkdir()
+
+        assert [p.name for p in fragment_paths(config_file)] == ["a.yml", "b.yml"]
+
+    def test_missing_directory(self, isolated_config_paths):
+        assert fragment_paths(isolated_config_paths / "dbt_switch.yml") == []
+
+
+class TestSourcesKey:
+    """Test the key covering dbt_switch.yml and its fragments."""
+
+    def test_without_directory_is_stat_key(self, isolated_config_paths):
+        from dbt_switch.config.cache import stat_key
+
+        path = isolated_config_paths / "dbt_switch.yml"
+        _write_settled(path, MAIN_YAML)
+        assert sources_key(path) == stat_key(path)
+
+    def test_changes_with_fragment_edit(self, config_file):
+        fragment = _fragment(config_file, "team.yml", TEAM_YAML)
+        before = sources_key(config_file)
+
+        _write_settled(fragment, TEAM_YAML.replace("10", "12"), age_seconds=5)
+
+        assert sources_key(config_file) != before
+
+    def test_changes_with_new_fragment(self, config_file):
+        before = sources_key(config_file)
+        _fragment(config_file, "team.yml", TEAM_YAML)
+        assert sources_key(config_file) != before
+
+
+class TestMerge:
+    """Test loading dbt_switch.yml with its fragments."""
+
+    def test_profiles_merged(self, config_file):
+        fragment = _fragment(config_file, "team.yml", TEAM_YAML)
+
+        config = get_config()
+
+        assert sorted(config.profiles) == ["analytics", "marketing", "prod"]
+        assert config.resolve_profile("11") == "marketing"
+        assert config.profile_source("analytics") == str(fragment)
+        assert config.profile_source("prod") is None
+
+    def test_only_changed_fragment_is_parsed(self, config_file):
+        _fragment(config_file, "a.yml", TEAM_YAML)
+        b = _fragment(
+            config_file, "b.yml", "profiles:\n  ops: {host: o.com, project_id: 20}\n"
+        )
+        get_config()
+
+        _write_settled(b, "profiles:\n  ops: {host: o.com, project_id: 21}\n", 5)
+        with patch.object(
+            file_handler, "load_yaml", wraps=file_handler.load_yaml
+        ) as load_yaml:
+            config = get_config(read_only=True)
+
+        assert load_yaml.call_count == 1
+        assert config.profiles["ops"].project_id == 21
+        assert config.profiles["analytics"].project_id == 10
+
+    def test_conflicts_skipped(self, config_file, caplog):
+        _fragment(config_file, "a.yml", TEAM_YAML)
+        _fragment(
+            config_file,
+            "b.yml",
+            """
+profiles:
+  prod:
+    host: other.getdbt.com
+    project_id: 99
+  copy:
+    host: team.getdbt.com
+    project_id: 10
+  ops:
+    host: ops.getdbt.com
+    project_id: 30
+""",
+        )
+
+        config = get_config()
+
+        assert config.profiles["prod"].host == "prod.getdbt.com"
+        assert "copy" not in config.profiles
+        assert config.profiles["ops"].project_id == 30
+        assert "project 'prod' is already defined in dbt_switch.yml" in caplog.text
+        assert "project ID 10 of 'copy' is already used by 'analytics'" in caplog.text
+
+    def test_invalid_fragment_skipped(self, config_file, caplog):
+        _fragment(
+            config_file, "bad.yml", "profiles:\n  x: {host: h.com, project_id: -1}\n"
+        )
+
+        config = get_config()
+
+        assert sorted(config.profiles) == ["prod"]
+        assert "bad.yml" in caplog.text
+
+
+class TestCurrent:
+    """Test that fragment problems stay out of values printed for the shell."""
+
+    def test_current_stdout_is_only_the_name(self, config_file, capsys, monkeypatch):
+        # Point the logger at the captured stdout, as it is in a real run
+        for handler in logger.handlers:
+            monkeypatch.setattr(handler, "stream", sys.stdout)
+        _fragment(
+            config_file, "team.yml", "profiles:\n  prod: {host: o.com, project_id: 5}\n"
+        )
+        config_file.with_name("dbt_cloud.yml").write_text(
+            'version: "1"\n'
+            "context:\n"
+            '  active-host: "prod.getdbt.com"\n'
+            '  active-project: "1"\n'
+            "projects: []\n"
+        )
+
+        assert show_current_project() is True
+
+        captured = capsys.readouterr()
+        assert captured.out == "prod\n"
+        assert "project 'prod' is already defined in dbt_switch.yml" in captured.err
+
+
+class TestWrites:
+    """Test that fragment profiles stay in their own files."""
+
+    def test_save_keeps_fragment_profiles_out(self, config_file):
+        _fragment(config_file, "team.yml", TEAM_YAML)
+
+        save_config(get_config())
+
+        assert "analytics" not in config_file.read_text()
+        assert "prod" in config_file.read_text()
+        assert "analytics" in get_config().profiles
+
+    def test_update_and_delete_rejected(self, config_file):
+        _fragment(config_file, "team.yml", TEAM_YAML)
+
+        with pytest.raises(ValueError, match="edit that file instead"):
+            update_project("analytics", host="new.getdbt.com")
+        with pytest.raises(ValueError, match="edit that file instead"):
+            delete_project_config("analytics")
+
+    def test_sync_leaves_fragment_profiles(self, config_file):
+        _fragment(config_file, "team.yml", TEAM_YAML)
+        item = DbtCloudProjectItem(
+            **{
+                "project-name": "Analytics",
+                "project-id": "10",
+                "account-name": "Acme",
+                "account-id": "1",
+                "account-host": "moved.getdbt.com",
+                "token-name": "cli",
+                "token-value": "dbtu_token",
+            }
+        )
+
+        result = sync_cloud_projects([item])
+
+        assert result["unchanged"] == ["analytics"]
+        assert "analytics" not in config_file.read_text()
+
+
+class TestValidate:
+    """Test `dbt-switch validate` across dbt_switch.yml and its fragments."""
+
+    def test_reports_cross_file_conflicts(self, config_file, caplog):
+        _fragment(config_file, "a.yml", TEAM_YAML)
+        _fragment(
+            config_file, "b.yml", "profiles:\n  prod: {host: o.com, project_id: 5}\n"
+        )
+
+        assert validate_user_config() is False
+        assert "b.yml:2: profiles.prod: Project 'prod' is already defined in" in (
+            caplog.text
+        )
+        assert "a.yml is valid" in caplog.text
+
+    def test_all_valid(self, config_file):
+        _fragment(config_file, "a.yml", TEAM_YAML)
+        assert validate_user_config() is True
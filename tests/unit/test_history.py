@@ -0,0 +1,146 @@
+"""
+Unit tests for the switch history.
+"""
+
+import pytest
+
+from dbt_switch.config import history
+from dbt_switch.config.cloud_handler import switch_project
+from dbt_switch.config.file_handler import format_project_list, save_config
+from dbt_switch.config.history import (
+    history_path,
+    previous_project,
+    read_recent,
+    recent_path,
+    record_switch,
+)
+from dbt_switch.config.input_handler import show_history
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+CLOUD_YAML = """version: "1"
+context:
+  active-host: "prod.getdbt.com"
+  active-project: "11111"
+projects: []
+"""
+
+
+@pytest.fixture
+def config_file(isolated_config_paths):
+    return isolated_config_paths / "dbt_switch.yml"
+
+
+def _names(entries):
+    return [name for _, name in entries]
+
+
+class TestHistoryLog:
+    """Test appending, tail reads and compaction."""
+
+    def test_most_recent_distinct_first(self, config_file):
+        for name in ["a", "b", "a", "c", "b"]:
+            record_switch(config_file, name)
+
+        assert _names(read_recent(config_file, 10)) == ["b", "c", "a"]
+        assert _names(read_recent(config_file, 2)) == ["b", "c"]
+        assert previous_project(config_file) == "c"
+        assert recent_path(config_file).read_text() == "b\nc\na\n"
+
+    def test_empty(self, config_file):
+        assert read_recent(config_file, 5) == []
+        assert previous_project(config_file) is None
+        record_switch(config_file, "only")
+        assert previous_project(config_file) is None
+
+    def test_lines_split_across_blocks(self, config_file, monkeypatch):
+        monkeypatch.setattr(history, "TAIL_BLOCK", 5)
+        names = [f"project-{i}" for i in range(30)]
+        for name in names:
+            record_switch(config_file, name)
+        assert _names(read_recent(config_file, 30)) == names[::-1]
+
+    def test_toggle_reads_only_the_tail(self, config_file, monkeypatch):
+        path = history_path(config_file)
+        path.write_text("".join(f"{i}\tproject-{i}\n" for i in range(50000)))
+        read_sizes = []
+        real_open = open
+
+        class Spy:
+            def __init__(self, file):
+                self._file = file
+
+            def __getattr__(self, name):
+                return getattr(self._file, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                self._file.close()
+
+            def read(self, size=-1):
+                data = self._file.read(size)
+                read_sizes.append(len(data))
+                return data
+
+        monkeypatch.setattr(
+            history, "open", lambda *a, **k: Spy(real_open(*a, **k)), raising=False
+        )
+        assert previous_project(config_file) == "project-49998"
+        assert sum(read_sizes) <= history.TAIL_BLOCK
+
+    def test_compaction(self, config_file, monkeypatch):
+        monkeypatch.setattr(history, "COMPACT_BYTES", 200)
+        monkeypatch.setattr(history, "KEEP_ENTRIES", 3)
+        for i in range(40):
+            record_switch(config_file, f"p{i % 5}")
+
+        assert history_path(config_file).stat().st_size <= 200
+        assert _names(read_recent(config_file, 10))[:3] == ["p4", "p3", "p2"]
+
+
+class TestSwitchBack:
+    """Test `dbt-switch -` through switch_project."""
+
+    @pytest.fixture
+    def cloud_file(self, isolated_config_paths):
+        save_config(
+            DbtSwitchConfig(
+                profiles={
+                    "prod": ProjectConfig(host="prod.getdbt.com", project_id=11111),
+                    "dev": ProjectConfig(host="dev.getdbt.com", project_id=22222),
+                }
+            )
+        )
+        path = isolated_config_paths / "dbt_cloud.yml"
+        path.write_text(CLOUD_YAML)
+        return path
+
+    def test_toggle(self, cloud_file):
+        with pytest.raises(ValueError, match="No previous project"):
+            switch_project("-")
+
+        switch_project("dev")
+        switch_project("prod")
+        switch_project("-")
+        assert 'active-project: "22222"' in cloud_file.read_text()
+        switch_project("-")
+        assert 'active-project: "11111"' in cloud_file.read_text()
+
+    def test_list_recent_first(self, cloud_file):
+        config = DbtSwitchConfig(
+            profiles={
+                name: ProjectConfig(host="a.getdbt.com", project_id=i)
+                for i, name in enumerate(["a", "b", "c"], start=1)
+            }
+        )
+        lines = format_project_list(config, "c", ["c", "gone", "b", "c"])
+        assert [line.split()[0] for line in lines[1:]] == ["*", "b", "a"]
+        assert lines[1].startswith("  * c")
+
+    def test_show_history(self, cloud_file, capsys):
+        assert show_history() is False
+        switch_project("dev")
+        capsys.readouterr()
+        assert show_history() is True
+        assert capsys.readouterr().out.startswith("  1  dev ")
@@ -0,0 +1,236 @@
+"""
+Unit tests for bulk import.
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+
+from dbt_switch.config import file_handler
+from dbt_switch.config.file_handler import get_config, import_configs, save_config
+from dbt_switch.config.import_reader import detect_format, iter_import_records
+from dbt_switch.config.input_handler import import_user_config
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+
+@pytest.fixture
+def existing_config():
+    """Seed the isolated dbt_switch.yml with two profiles."""
+    save_config(
+        DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="prod.getdbt.com", project_id=11111),
+                "dev": ProjectConfig(host="dev.getdbt.com", project_id=22222),
+            }
+        )
+    )
+
+
+def _records(*rows):
+    return [
+        {"name": name, "host": host, "project_id": pid, "location": f"row {i}"}
+        for i, (name, host, pid) in enumerate(rows, start=1)
+    ]
+
+
+class TestImportReaders:
+    """Test CSV, JSON Lines and YAML readers."""
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "projects.csv"
+        path.write_text("name,host,project_id\nalpha,a.getdbt.com,1\nbeta,b.com,2\n")
+
+        records = list(iter_import_records(path))
+
+        assert [r["name"] for r in records] == ["alpha", "beta"]
+        assert records[1]["project_id"] == "2"
+        assert records[1]["location"] == "projects.csv:3"
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "projects.jsonl"
+        rows = [
+            {"name": "alpha", "host": "a.com", "project_id": 1},
+            {"project-name": "beta", "host": "b.com", "project-id": 2},
+        ]
+        path.write_text("\n".join(json.dumps(r) for r in rows) + "\n\n")
+
+        records = list(iter_import_records(path))
+
+        assert [(r["name"], r["project_id"]) for r in records] == [
+            ("alpha", 1),
+            ("beta", 2),
+        ]
+
+    def test_jsonl_invalid_line(self, tmp_path):
+        path = tmp_path / "projects.jsonl"
+        path.write_text('{"name": "alpha"}\n{oops\n')
+
+        with pytest.raises(ValueError, match="projects.jsonl:2"):
+            list(iter_import_records(path))
+
+    def test_json_array(self, tmp_path):
+        path = tmp_path / "projects.json"
+        rows = [
+            {"name": "alpha", "host": "a.com", "project_id": 1},
+            {"project-name": "beta", "host": "b.com", "project-id": 2},
+        ]
+        path.write_text(json.dumps(rows, indent=2))
+
+        records = list(iter_import_records(path))
+
+        assert [(r["name"], r["project_id"]) for r in records] == [
+            ("alpha", 1),
+            ("beta", 2),
+        ]
+        assert records[1]["location"] == "projects.json:[1]"
+
+    @pytest.mark.parametrize("content", ['{"name": "alpha"}', "[{oops"])
+    def test_json_not_an_array(self, tmp_path, content):
+        path = tmp_path / "projects.json"
+        path.write_text(content)
+
+        with pytest.raises(ValueError, match="projects.json"):
+            list(iter_import_records(path))
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "profiles:\n  alpha:\n    host: a.com\n    project_id: 1\n",
+            "alpha:\n  host: a.com\n  project_id: 1\n",
+        ],
+    )
+    def test_yaml(self, tmp_path, content):
+        path = tmp_path / "projects.yml"
+        path.write_text(content)
+
+        records = list(iter_import_records(path))
+
+        assert records == [
+            {
+                "name": "alpha",
+                "host": "a.com",
+                "project_id": 1,
+                "location": "projects.yml:alpha",
+            }
+        ]
+
+    def test_unknown_suffix(self, tmp_path):
+        with pytest.raises(ValueError, match="--format"):
+            detect_format(tmp_path / "projects.txt")
+
+
+class TestImportConfigs:
+    """Test the single-pass import into dbt_switch.yml."""
+
+    def test_import_into_empty(self):
+        result = import_configs(_records(("alpha", "a.com", 1), ("beta", "b.com", "2")))
+
+        assert result == {"added": ["alpha", "beta"], "replaced": [], "skipped": []}
+        assert get_config().profiles["beta"].project_id == 2
+
+    def test_single_write(self, existing_config):
+        """N records cost one save, not N."""
+        rows = [(f"p{i}", "h.com", 100 + i) for i in range(50)]
+        with patch.object(
+            file_handler, "save_config", wraps=file_handler.save_config
+        ) as mock_save:
+            import_configs(_records(*rows))
+
+        mock_save.assert_called_once()
+        assert len(get_config().profiles) == 52
+
+    def test_invalid_records_reported_together(self, existing_config):
+        records = _records(
+            ("bad name", "a.com", 1),
+            ("ok", "", 2),
+            ("dup", "a.com", 3),
+            ("dup", "b.com", 4),
+            ("same-id", "c.com", 3),
+        )
+
+        with pytest.raises(ValueError) as exc_info:
+            import_configs(records)
+
+        message = str(exc_info.value)
+        assert message.startswith("4 invalid record(s)")
+        for location in ("row 1", "row 2", "row 4", "row 5"):
+            assert location in message
+        assert set(get_config().profiles) == {"prod", "dev"}
+
+    def test_conflicts_fail_reports_all(self, existing_config):
+        records = _records(
+            ("prod", "x.com", 1), ("new", "y.com", 22222), ("fresh", "z.com", 3)
+        )
+
+        with pytest.raises(ValueError) as exc_info:
+            import_configs(records, on_conflict="fail")
+
+        message = str(exc_info.value)
+        assert "2 conflict(s)" in message
+        assert "project 'prod' already exists" in message
+        assert "project ID 22222 is used by 'dev'" in message
+        assert "fresh" not in get_config().profiles
+
+    def test_conflicts_skip(self, existing_config):
+        records = _records(
+            ("prod", "x.com", 1), ("new", "y.com", 22222), ("fresh", "z.com", 3)
+        )
+
+        result = import_configs(records, on_conflict="skip")
+
+        assert result == {
+            "added": ["fresh"],
+            "replaced": [],
+            "skipped": ["prod", "new"],
+        }
+        config = get_config()
+        assert config.profiles["prod"].project_id == 11111
+        assert "new" not in config.profiles
+
+    def test_conflicts_replace(self, existing_config):
+        records = _records(("prod", "x.com", 1), ("new", "y.com", 22222))
+
+        result = import_configs(records, on_conflict="replace")
+
+        assert result == {"added": [], "replaced": ["prod", "new"], "skipped": []}
+        config = get_config()
+        assert config.profiles["prod"].host == "x.com"
+        assert config.profiles["new"].project_id == 22222
+        assert "dev" not in config.profiles
+
+    def test_conflicts_replace_swapped_ids(self, existing_config):
+        """Two existing profiles may trade project IDs in one replace import."""
+        records = _records(("prod", "p.com", 22222), ("dev", "d.com", 11111))
+
+        import_configs(records, on_conflict="replace")
+
+        config = get_config()
+        assert config.profiles["prod"].project_id == 22222
+        assert config.profiles["dev"].project_id == 11111
+
+    def test_invalid_on_conflict(self):
+        with pytest.raises(ValueError, match="on_conflict"):
+            import_configs([], on_conflict="merge")
+
+
+class TestImportUserConfig:
+    """Test the input handler wrapper used by the CLI."""
+
+    def test_success(self, tmp_path, existing_config):
+        path = tmp_path / "projects.csv"
+        path.write_text("name,host,project_id\nalpha,a.com,1\n")
+
+        assert import_user_config(str(path)) is True
+        assert "alpha" in get_config().profiles
+
+    def test_failure_returns_false(self, tmp_path, existing_config):
+        path = tmp_path / "projects.csv"
+        path.write_text("name,host,project_id\nprod,a.com,1\n")
+
+        assert import_user_config(str(path)) is False
+
+    def test_unknown_format_returns_false(self, tmp_path):
+        path = tmp_path / "projects.txt"
+        path.write_text("")
+
+        assert import_user_config(str(path)) is False
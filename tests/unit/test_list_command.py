@@ -1,13 +1,19 @@
 """Unit tests for the list command functionality."""
 
+import io
+import json
 from unittest.mock import patch, MagicMock
-from dbt_switch.config.file_handler import list_all_projects
+
+from dbt_switch.config import file_handler
+from dbt_switch.config.file_handler import (
+    list_all_projects,
+    select_profiles,
+    write_project_records,
+)
 from dbt_switch.config.input_handler import list_projects
 from dbt_switch.validation.schemas import (
     DbtSwitchConfig,
     ProjectConfig,
-    DbtCloudConfig,
-    DbtCloudContext,
 )
 
 
@@ -39,8 +45,8 @@ def test_list_all_projects_with_active():
     with (
         patch("dbt_switch.config.file_handler.get_config") as mock_get_config,
         patch(
-            "dbt_switch.config.cloud_handler.read_dbt_cloud_config"
-        ) as mock_read_dbt_cloud_config,
+            "dbt_switch.config.cloud_handler.read_active_context"
+        ) as mock_read_active_context,
         patch("builtins.print") as mock_print,
     ):
         # Setup mock data
@@ -52,14 +58,8 @@ def test_list_all_projects_with_active():
         )
         mock_get_config.return_value = mock_config
 
-        # Setup cloud config with active project
-        mock_cloud_config = DbtCloudConfig(
-            version="1",
-            context=DbtCloudContext(
-                active_host="cloud.getdbt.com", active_project="12345"
-            ),
-        )
-        mock_read_dbt_cloud_config.return_value = mock_cloud_config
+        # Setup cloud context with active project
+        mock_read_active_context.return_value = ("cloud.getdbt.com", "12345")
 
         list_all_projects()
 
@@ -71,13 +71,36 @@ def test_list_all_projects_with_active():
         mock_print.assert_any_call("    staging      (cloud.getdbt.com, ID: 67890)")
 
 
+def test_list_all_projects_active_host_written_differently():
+    """A URL-style host in dbt_switch.yml still matches the active context."""
+    with (
+        patch("dbt_switch.config.file_handler.get_config") as mock_get_config,
+        patch(
+            "dbt_switch.config.cloud_handler.read_active_context"
+        ) as mock_read_active_context,
+        patch("builtins.print") as mock_print,
+    ):
+        mock_get_config.return_value = DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="https://cloud.getdbt.com/", project_id=1)
+            }
+        )
+        mock_read_active_context.return_value = ("cloud.getdbt.com", "1")
+
+        list_all_projects()
+
+        mock_print.assert_any_call(
+            "  * prod         (https://cloud.getdbt.com/, ID: 1) [ACTIVE]"
+        )
+
+
 def test_list_all_projects_no_active():
     """Test list command when no active project can be determined."""
     with (
         patch("dbt_switch.config.file_handler.get_config") as mock_get_config,
         patch(
-            "dbt_switch.config.cloud_handler.read_dbt_cloud_config"
-        ) as mock_read_dbt_cloud_config,
+            "dbt_switch.config.cloud_handler.read_active_context"
+        ) as mock_read_active_context,
         patch("builtins.print") as mock_print,
     ):
         # Setup mock data
@@ -91,14 +114,8 @@ def test_list_all_projects_no_active():
         )
         mock_get_config.return_value = mock_config
 
-        # Setup cloud config that doesn't match any project
-        mock_cloud_config = DbtCloudConfig(
-            version="1",
-            context=DbtCloudContext(
-                active_host="different.getdbt.com", active_project="99999"
-            ),
-        )
-        mock_read_dbt_cloud_config.return_value = mock_cloud_config
+        # Setup cloud context that doesn't match any project
+        mock_read_active_context.return_value = ("different.getdbt.com", "99999")
 
         list_all_projects()
 
@@ -113,8 +130,8 @@ def test_list_all_projects_no_cloud_config():
     with (
         patch("dbt_switch.config.file_handler.get_config") as mock_get_config,
         patch(
-            "dbt_switch.config.cloud_handler.read_dbt_cloud_config"
-        ) as mock_read_dbt_cloud_config,
+            "dbt_switch.config.cloud_handler.read_active_context"
+        ) as mock_read_active_context,
         patch("builtins.print") as mock_print,
     ):
         # Setup mock data
@@ -123,8 +140,8 @@ def test_list_all_projects_no_cloud_config():
         mock_config = DbtSwitchConfig(profiles={"prod": mock_project_config1})
         mock_get_config.return_value = mock_config
 
-        # Cloud config returns None (file doesn't exist)
-        mock_read_dbt_cloud_config.return_value = None
+        # No context (file doesn't exist)
+        mock_read_active_context.return_value = None
 
         list_all_projects()
 
@@ -133,6 +150,30 @@ def test_list_all_projects_no_cloud_config():
         mock_print.assert_any_call("    prod         (cloud.getdbt.com, ID: 12345)")
 
 
+def test_list_all_projects_reads_only_the_context(isolated_config_paths, capsys):
+    """Marking the active project never builds the dbt_cloud.yml models."""
+    file_handler.save_config(
+        DbtSwitchConfig(
+            profiles={"prod": ProjectConfig(host="cloud.getdbt.com", project_id=1)}
+        )
+    )
+    (isolated_config_paths / "dbt_cloud.yml").write_text(
+        'version: "1"\n'
+        "context:\n"
+        '  active-host: "cloud.getdbt.com"\n'
+        '  active-project: "1"\n'
+        "projects: []\n"
+    )
+
+    with patch(
+        "dbt_switch.config.cloud_handler.read_dbt_cloud_config",
+        side_effect=AssertionError("full read"),
+    ):
+        list_all_projects()
+
+    assert "* prod" in capsys.readouterr().out
+
+
 def test_list_projects_wrapper():
     """Test that the wrapper function calls the main function."""
     with patch(
@@ -140,3 +181,128 @@ def test_list_projects_wrapper():
     ) as mock_list_all_projects:
         list_projects()
         mock_list_all_projects.assert_called_once()
+
+
+def _config():
+    return DbtSwitchConfig(
+        profiles={
+            "prod": ProjectConfig(host="cloud.getdbt.com", project_id=1),
+            "analytics-dev": ProjectConfig(host="emea.dbt.com", project_id=2),
+            "analytics-prod": ProjectConfig(
+                host="https://Cloud.getdbt.com/", project_id=3
+            ),
+            "marketing": ProjectConfig(host="cloud.getdbt.com", project_id=4),
+        }
+    )
+
+
+def test_select_profiles_filters():
+    """Host, glob and prefix filters, ordering and limit."""
+    config = _config()
+    assert select_profiles(config) == [
+        "prod",
+        "analytics-dev",
+        "analytics-prod",
+        "marketing",
+    ]
+    assert select_profiles(config, host="https://cloud.getdbt.com") == [
+        "analytics-prod",
+        "marketing",
+        "prod",
+    ]
+    assert select_profiles(config, match="analytics") == [
+        "analytics-dev",
+        "analytics-prod",
+    ]
+    assert select_profiles(config, match="*prod") == ["analytics-prod", "prod"]
+    assert select_profiles(config, match="analytics-*", host="cloud.getdbt.com") == [
+        "analytics-prod"
+    ]
+    assert select_profiles(config, match="nothing*") == []
+    assert select_profiles(config, order=["marketing", "gone"], limit=2) == [
+        "marketing",
+        "prod",
+    ]
+
+
+def test_write_project_records_formats():
+    """JSON, JSON Lines and TSV output, including empty documents."""
+    config = _config()
+    names = ["prod", "marketing"]
+
+    out = io.StringIO()
+    write_project_records(config, names, "prod", "json", out)
+    assert json.loads(out.getvalue()) == [
+        {"name": "prod", "host": "cloud.getdbt.com", "project_id": 1, "active": True},
+        {
+            "name": "marketing",
+            "host": "cloud.getdbt.com",
+            "project_id": 4,
+            "active": False,
+        },
+    ]
+
+    out = io.StringIO()
+    write_project_records(config, names, None, "jsonl", out)
+    lines = out.getvalue().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == names
+
+    out = io.StringIO()
+    write_project_records(config, names, "marketing", "tsv", out)
+    assert out.getvalue() == (
+        "name\thost\tproject_id\tactive\n"
+        "prod\tcloud.getdbt.com\t1\tfalse\n"
+        "marketing\tcloud.getdbt.com\t4\ttrue\n"
+    )
+
+    for output_format, expected in (("json", []), ("jsonl", None), ("tsv", None)):
+        out = io.StringIO()
+        write_project_records(config, [], None, output_format, out)
+        if expected is not None:
+            assert json.loads(out.getvalue()) == expected
+        else:
+            assert len(out.getvalue().splitlines()) <= 1
+
+
+def test_write_project_records_chunked(monkeypatch):
+    """Rows are written a chunk at a time, not one write per row."""
+    monkeypatch.setattr(file_handler, "LIST_CHUNK_ROWS", 100)
+    config = DbtSwitchConfig(
+        profiles={
+            f"p{i}": ProjectConfig(host="cloud.getdbt.com", project_id=i + 1)
+            for i in range(250)
+        }
+    )
+    out = io.StringIO()
+    writes = []
+    real_write = out.write
+    monkeypatch.setattr(out, "write", lambda text: writes.append(real_write(text)))
+
+    write_project_records(config, list(config.profiles), None, "json", out)
+
+    assert len(writes) == 5  # head, three chunks, tail
+    assert len(json.loads(out.getvalue())) == 250
+
+
+def test_list_all_projects_jsonl(capsys):
+    """Machine formats go to stdout; messages stay out of it."""
+    with (
+        patch("dbt_switch.config.file_handler.get_config", return_value=_config()),
+        patch(
+            "dbt_switch.config.cloud_handler.read_active_context",
+            return_value=None,
+        ),
+    ):
+        list_projects(output_format="jsonl", match="analytics", limit=1)
+    assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+        {
+            "name": "analytics-dev",
+            "host": "emea.dbt.com",
+            "project_id": 2,
+            "active": False,
+        }
+    ]
+
+    with patch("dbt_switch.config.file_handler.get_config", return_value=None):
+        list_projects(output_format="json")
+    assert capsys.readouterr().out == "[\n]\n"
@@ -0,0 +1,45 @@
+"""
+Unit tests for the trigram name index behind "did you mean" suggestions.
+"""
+
+from dbt_switch.validation.name_index import NameIndex, name_trigrams
+
+
+class TestNameIndex:
+    """Test building, snapshotting and querying the index."""
+
+    NAMES = ["analytics-prod", "analytics-dev", "finance", "marketing", "ops"]
+
+    def test_trigrams(self):
+        assert name_trigrams("Ab") == {"  a", " ab", "ab "}
+
+    def test_suggest_typos(self):
+        index = NameIndex.build(self.NAMES)
+
+        assert index.suggest("analytcs-prod")[0] == "analytics-prod"
+        assert index.suggest("finanse") == ["finance"]
+        assert index.suggest("zzz") == []
+
+    def test_limit(self):
+        index = NameIndex.build(self.NAMES)
+
+        assert index.suggest("analytics", limit=1) in (
+            ["analytics-dev"],
+            ["analytics-prod"],
+        )
+
+    def test_snapshot_round_trip(self):
+        index = NameIndex.build(self.NAMES)
+
+        restored = NameIndex.from_snapshot(index.to_snapshot())
+
+        assert restored.names == sorted(self.NAMES)
+        assert restored.suggest("markting") == ["marketing"]
+        assert NameIndex.from_snapshot({"names": "oops"}) is None
+
+    def test_common_trigrams_are_bounded(self):
+        """Queries made only of trigrams every name shares read no postings."""
+        index = NameIndex.build(f"project-{i}" for i in range(20000))
+
+        assert index.suggest("project-") == []
+        assert index.suggest("projcet-1234")[0] == "project-1234"
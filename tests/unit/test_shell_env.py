@@ -0,0 +1,147 @@
+"""
+Unit tests for per-shell switching with `dbt-switch env`.
+"""
+
+import subprocess
+
+import pytest
+
+from dbt_switch.config import cloud_handler, current
+from dbt_switch.config.file_handler import save_config
+from dbt_switch.config.input_handler import print_project_env
+from dbt_switch.utils.shell import (
+    ENV_VARS,
+    detect_shell,
+    format_exports,
+    format_unsets,
+)
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+CLOUD_YAML = """version: "1"
+context:
+  active-host: "prod.getdbt.com"
+  active-project: "11111"
+projects:
+  - project-name: "Dev"
+    project-id: "22222"
+    account-name: "Acme"
+    account-id: "7"
+    account-host: "dev.getdbt.com"
+    token-name: "token"
+    token-value: "secret"
+"""
+
+
+@pytest.fixture
+def files(isolated_config_paths):
+    save_config(
+        DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="prod.getdbt.com", project_id=11111),
+                "dev": ProjectConfig(host="https://dev.getdbt.com/", project_id=22222),
+            }
+        )
+    )
+    cloud_file = isolated_config_paths / "dbt_cloud.yml"
+    cloud_file.write_text(CLOUD_YAML)
+    return isolated_config_paths / "dbt_switch.yml", cloud_file
+
+
+class TestFormatting:
+    """Test statement rendering and shell detection."""
+
+    def test_sh_exports_are_quoted(self):
+        out = format_exports({"A": "plain", "B": "it's $HOME"}, "sh")
+
+        assert out == "export A=plain;\nexport B='it'\"'\"'s $HOME';\n"
+        result = subprocess.run(
+            ["sh", "-c", out + 'printf %s "$B"'], capture_output=True, text=True
+        )
+        assert result.stdout == "it's $HOME"
+
+    def test_fish_exports(self):
+        assert format_exports({"A": "it's"}, "fish") == "set -gx A 'it\\'s';\n"
+
+    def test_unsets(self):
+        assert format_unsets(["A", "B"], "sh") == "unset A;\nunset B;\n"
+        assert format_unsets(["A"], "fish") == "set -e A;\n"
+
+    @pytest.mark.parametrize(
+        "shell, expected",
+        [("/usr/bin/fish", "fish"), ("/bin/zsh", "sh"), ("", "sh")],
+    )
+    def test_detect_shell(self, monkeypatch, shell, expected):
+        monkeypatch.setenv("SHELL", shell)
+
+        assert detect_shell() == expected
+
+
+class TestProjectEnv:
+    """Test resolving a profile into environment variables."""
+
+    def test_with_account_id(self, files):
+        assert cloud_handler.project_env("dev") == {
+            "DBT_SWITCH_PROJECT": "dev",
+            "DBT_CLOUD_HOST": "dev.getdbt.com",
+            "DBT_CLOUD_PROJECT_ID": "22222",
+            "DBT_CLOUD_ACCOUNT_ID": "7",
+        }
+
+    def test_by_project_id_without_cloud_file(self, files):
+        files[1].unlink()
+
+        env = cloud_handler.project_env("11111")
+
+        assert env["DBT_SWITCH_PROJECT"] == "prod"
+        assert "DBT_CLOUD_ACCOUNT_ID" not in env
+
+    def test_unknown_project(self, files):
+        with pytest.raises(ValueError, match="not found"):
+            cloud_handler.project_env("nope")
+
+    def test_nothing_written(self, files):
+        before = [path.stat().st_mtime_ns for path in files]
+
+        print_project_env("dev", "sh")
+
+        assert [path.stat().st_mtime_ns for path in files] == before
+
+
+class TestPrintProjectEnv:
+    """Test the input handler wrapper used by the CLI."""
+
+    def test_clears_stale_account_id(self, files, capsys):
+        files[1].unlink()
+
+        assert print_project_env("prod", "sh") is True
+
+        out = capsys.readouterr().out
+        assert out.startswith("unset DBT_CLOUD_ACCOUNT_ID;\n")
+        assert "export DBT_SWITCH_PROJECT=prod;" in out
+
+    def test_unset(self, capsys):
+        assert print_project_env(None, "fish", unset=True) is True
+        assert capsys.readouterr().out.count("set -e") == len(ENV_VARS)
+
+    def test_missing_project(self, files):
+        assert print_project_env(None, "sh") is False
+        assert print_project_env("nope", "sh") is False
+
+
+class TestShellProjectIsCurrent:
+    """A shell's own project takes precedence over dbt_cloud.yml."""
+
+    @pytest.fixture
+    def shell_env(self, monkeypatch):
+        monkeypatch.setenv("DBT_SWITCH_PROJECT", "dev")
+        monkeypatch.setenv("DBT_CLOUD_HOST", "dev.getdbt.com")
+        monkeypatch.setenv("DBT_CLOUD_PROJECT_ID", "22222")
+
+    def test_get_current_project(self, files, shell_env):
+        assert cloud_handler.get_current_project()["name"] == "dev"
+
+    def test_fast_current(self, files, shell_env, monkeypatch, capsys):
+        monkeypatch.setattr(current, "DBT_DIR", files[0].parent)
+
+        assert current.fast_current(["current", "--format", "id"]) == 0
+        assert capsys.readouterr().out == "22222\n"
@@ -0,0 +1,163 @@
+"""
+Unit tests for generating dbt_switch.yml profiles from dbt_cloud.yml.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from dbt_switch.config import file_handler
+from dbt_switch.config.cloud_handler import sync_from_cloud
+from dbt_switch.config.file_handler import get_config, save_config
+from dbt_switch.config.input_handler import sync_user_config
+from dbt_switch.validation.helpers import (
+    slugify_project_name,
+    validate_project_name_format,
+)
+from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
+
+
+def _cloud_yaml(*projects):
+    lines = [
+        'version: "1"',
+        "context:",
+        '  active-host: "cloud.getdbt.com"',
+        '  active-project: "1"',
+        "projects:",
+    ]
+    for name, project_id, host in projects:
+        lines += [
+            f'  - project-name: "{name}"',
+            f'    project-id: "{project_id}"',
+            '    account-name: "Acme"',
+            '    account-id: "1"',
+            f'    account-host: "{host}"',
+            '    token-name: "token"',
+            '    token-value: "secret"',
+        ]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def write_cloud(isolated_config_paths):
+    def _write(*projects):
+        (isolated_config_paths / "dbt_cloud.yml").write_text(_cloud_yaml(*projects))
+
+    return _write
+
+
+class TestSlugifyProjectName:
+    """Test project name slugs."""
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("Analytics", "analytics"),
+            ("Finance (EU) Models", "finance-eu-models"),
+            ("  data--platform / core ", "data-platform-core"),
+            ("snake_case_ok", "snake_case_ok"),
+            ("Ünïcode Prøject", "unicode-prject"),
+            ("!!!", ""),
+        ],
+    )
+    def test_slugs(self, name, expected):
+        slug = slugify_project_name(name)
+
+        assert slug == expected
+        if slug:
+            validate_project_name_format(slug)
+
+
+class TestSyncFromCloud:
+    """Test the incremental sync from the dbt_cloud.yml projects list."""
+
+    def test_creates_profiles(self, write_cloud):
+        write_cloud(
+            ("Analytics", 101, "cloud.getdbt.com"),
+            ("Finance (EU)", 102, "emea.dbt.com"),
+        )
+
+        result = sync_from_cloud()
+
+        assert result["added"] == ["analytics", "finance-eu"]
+        profiles = get_config().profiles
+        assert profiles["finance-eu"] == ProjectConfig(
+            host="emea.dbt.com", project_id=102
+        )
+
+    def test_name_collision_gets_id_suffix(self, write_cloud):
+        save_config(
+            DbtSwitchConfig(
+                profiles={"analytics": ProjectConfig(host="x.com", project_id=1)}
+            )
+        )
+        write_cloud(("Analytics", 101, "cloud.getdbt.com"), ("???", 102, "a.com"))
+
+        result = sync_from_cloud()
+
+        assert result["added"] == ["analytics-101", "project-102"]
+
+    def test_id_suffixed_name_already_taken(self, write_cloud):
+        """A slug-plus-ID name held by another project gets a further suffix."""
+        write_cloud(
+            ("Analytics", 1, "a.com"),
+            ("Analytics-2", 7, "a.com"),
+            ("Analytics", 2, "a.com"),
+        )
+
+        result = sync_from_cloud()
+
+        assert result["added"] == ["analytics", "analytics-2", "analytics-2-2"]
+        profiles = get_config().profiles
+        assert profiles["analytics-2"].project_id == 7
+        assert profiles["analytics-2-2"].project_id == 2
+
+    def test_rerun_is_incremental(self, write_cloud):
+        write_cloud(("Analytics", 101, "cloud.getdbt.com"), ("Ops", 102, "a.com"))
+        sync_from_cloud()
+
+        with patch.object(
+            file_handler, "save_config", wraps=file_handler.save_config
+        ) as mock_save:
+            result = sync_from_cloud()
+
+        mock_save.assert_not_called()
+        assert result["unchanged"] == ["analytics", "ops"]
+
+    def test_matches_existing_profile_by_id(self, write_cloud):
+        """A hand-named profile keeps its name; only a changed host is updated."""
+        save_config(
+            DbtSwitchConfig(
+                profiles={"my-prod": ProjectConfig(host="old.com", project_id=101)}
+            )
+        )
+        write_cloud(("Analytics", 101, "new.com"), ("Ops", 102, "a.com"))
+
+        with patch.object(
+            file_handler, "save_config", wraps=file_handler.save_config
+        ) as mock_save:
+            result = sync_from_cloud()
+
+        mock_save.assert_called_once()
+        assert result["updated"] == ["my-prod"]
+        assert result["added"] == ["ops"]
+        profiles = get_config().profiles
+        assert set(profiles) == {"my-prod", "ops"}
+        assert profiles["my-prod"].host == "new.com"
+
+    def test_duplicate_and_invalid_entries(self, write_cloud):
+        write_cloud(
+            ("Analytics", 101, "a.com"),
+            ("Analytics", 101, "a.com"),
+            ("Broken", "abc", "a.com"),
+        )
+
+        result = sync_from_cloud()
+
+        assert result["added"] == ["analytics"]
+        assert result["skipped"] == ["abc"]
+
+    def test_missing_cloud_file(self):
+        with pytest.raises(ValueError, match="dbt_cloud.yml"):
+            sync_from_cloud()
+
+        assert sync_user_config() is False
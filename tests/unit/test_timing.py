@@ -0,0 +1,85 @@
+"""
+Unit tests for the phase timer and profiler wrapper.
+"""
+
+import io
+import pstats
+import pytest
+
+from dbt_switch.utils import timing
+
+
+@pytest.fixture(autouse=True)
+def reset_timing():
+    yield
+    timing.disable()
+
+
+class TestPhases:
+    """Test phase recording and the report."""
+
+    def test_disabled_records_nothing(self):
+        with timing.phase("ignored"):
+            pass
+
+        assert timing.phases() == []
+        assert not timing.is_enabled()
+
+    def test_nested_phases_and_report(self):
+        timing.enable()
+        with timing.phase("outer"):
+            with timing.phase("inner"):
+                pass
+        with timing.phase("next"):
+            pass
+
+        assert [(name, depth) for name, depth, _ in timing.phases()] == [
+            ("outer", 0),
+            ("inner", 1),
+            ("next", 0),
+        ]
+
+        stream = io.StringIO()
+        timing.report(stream)
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "dbt-switch timings (ms):"
+        assert lines[2].endswith("    inner")
+        assert lines[-1].endswith("total")
+        assert not timing.is_enabled()
+
+    def test_phase_recorded_when_block_raises(self):
+        timing.enable()
+        with pytest.raises(RuntimeError):
+            with timing.phase("boom"):
+                raise RuntimeError
+
+        assert timing.phases()[0][0] == "boom"
+
+    def test_handler_hooks(self, isolated_config_paths):
+        """get_config reports its parse and validate phases."""
+        from dbt_switch.config.file_handler import get_config
+
+        (isolated_config_paths / "dbt_switch.yml").write_text("profiles: {}\n")
+        timing.enable()
+        get_config()
+
+        names = [name for name, _, _ in timing.phases()]
+        assert "parse dbt_switch.yml" in names
+        assert "validate dbt_switch.yml" in names
+
+
+class TestRunProfiled:
+    """Test the cProfile wrapper used for DBT_SWITCH_PROFILE."""
+
+    def test_writes_stats_on_system_exit(self, tmp_path, capsys):
+        path = tmp_path / "run.prof"
+
+        def command():
+            sum(range(1000))
+            raise SystemExit(0)
+
+        with pytest.raises(SystemExit):
+            timing.run_profiled(command, str(path))
+
+        assert pstats.Stats(str(path)).total_calls > 0
+        assert f"Wrote profile to {path}" in capsys.readouterr().err
@@ -177,18 +177,14 @@ class TestUpdateProject:
     """Test update_project function."""
 
     @patch("dbt_switch.config.file_handler.save_config")
-    @patch("dbt_switch.config.file_handler.validate_full_config_after_modification")
     @patch("dbt_switch.config.file_handler.create_validated_project_config")
-    @patch("dbt_switch.config.file_handler.validate_unique_project_id")
     @patch("dbt_switch.config.file_handler.get_config")
     @patch("dbt_switch.utils.logger.logger.info")
     def test_update_project_success(
         self,
         mock_logger,
         mock_get_config,
-        mock_validate_id,
         mock_create_project,
-        mock_validate_config,
         mock_save_config,
     ):
         """Test successful update of both host and project ID."""
@@ -205,13 +201,12 @@ class TestUpdateProject:
 
         update_project("test-project", host="new-host.getdbt.com", project_id=67890)
 
-        mock_validate_id.assert_called_once_with(
-            mock_config, 67890, exclude_project="test-project"
-        )
         mock_create_project.assert_called_once_with(
             host="new-host.getdbt.com", project_id=67890
         )
-        mock_validate_config.assert_called_once_with(mock_config)
+        mock_config.replace_profile.assert_called_once_with(
+            "test-project", mock_project
+        )
         mock_save_config.assert_called_once_with(mock_config)
         mock_logger.assert_called_with(
             "Updated project 'test-project' with host 'new-host.getdbt.com' and project_id 67890"
@@ -5,6 +5,9 @@ Simplified unit tests for Pydantic validation models.
 import pytest
 from pydantic import ValidationError
 
+from dbt_switch.config.input_handler import validate_user_config
+from dbt_switch.config.validate import validate_switch_text
+from dbt_switch.config.yaml_io import dump_yaml
 from dbt_switch.validation.schemas import ProjectConfig, DbtSwitchConfig
 
 
@@ -59,3 +62,225 @@ class TestDbtSwitchConfig:
                     "proj2": ProjectConfig(host="host2.getdbt.com", project_id=12345),
                 }
             )
+
+
+class TestProfileMutations:
+    """Test the indexed add/replace/remove methods on DbtSwitchConfig."""
+
+    @pytest.fixture
+    def config(self, sample_dbt_config):
+        return sample_dbt_config
+
+    def test_add_profile(self, config):
+        config.add_profile("qa", ProjectConfig(host="qa.getdbt.com", project_id=44444))
+
+        assert config.profiles["qa"].project_id == 44444
+        assert config.project_id_index()[44444] == "qa"
+
+    @pytest.mark.parametrize(
+        "name, project_id, message",
+        [
+            ("bad name", 44444, "invalid characters"),
+            ("prod", 44444, "already exists"),
+            ("qa", 22222, "already in use"),
+        ],
+    )
+    def test_add_profile_rejects(self, config, name, project_id, message):
+        with pytest.raises(ValueError, match=message):
+            config.add_profile(
+                name, ProjectConfig(host="qa.com", project_id=project_id)
+            )
+
+        assert set(config.profiles) == {"prod", "dev", "staging"}
+
+    def test_replace_profile_moves_id(self, config):
+        config.replace_profile(
+            "prod", ProjectConfig(host="prod.getdbt.com", project_id=99999)
+        )
+
+        index = config.project_id_index()
+        assert index[99999] == "prod"
+        assert 11111 not in index
+        config.add_profile("old", ProjectConfig(host="x.com", project_id=11111))
+
+    def test_replace_profile_rejects_taken_id(self, config):
+        with pytest.raises(ValueError, match="already in use"):
+            config.replace_profile(
+                "prod", ProjectConfig(host="prod.getdbt.com", project_id=22222)
+            )
+
+        assert config.profiles["prod"].project_id == 11111
+
+    def test_remove_profile_frees_id(self, config):
+        config.project_id_index()
+        removed = config.remove_profile("dev")
+
+        assert removed.project_id == 22222
+        config.add_profile("dev2", ProjectConfig(host="x.com", project_id=22222))
+        with pytest.raises(ValueError, match="not found"):
+            config.remove_profile("dev")
+
+    def test_result_passes_full_validation(self, config):
+        """The incremental checks keep the same invariants as the validators."""
+        config.add_profile("qa", ProjectConfig(host="qa.com", project_id=44444))
+        config.replace_profile("dev", ProjectConfig(host="dev.com", project_id=55555))
+        config.remove_profile("staging")
+
+        DbtSwitchConfig(**config.model_dump())
+
+
+class TestProfileLookups:
+    """Test the lazily built lookup indexes on DbtSwitchConfig."""
+
+    @pytest.fixture
+    def config(self):
+        return DbtSwitchConfig(
+            profiles={
+                "prod": ProjectConfig(host="https://cloud.getdbt.com/", project_id=1),
+                "dev": ProjectConfig(host="cloud.getdbt.com", project_id=2),
+                "emea": ProjectConfig(host="emea.dbt.com", project_id=3),
+            }
+        )
+
+    def test_find_profile_normalizes_host(self, config):
+        assert config.find_profile("cloud.getdbt.com", "1") == "prod"
+        assert config.find_profile("https://CLOUD.getdbt.com", 2) == "dev"
+        assert config.find_profile("emea.dbt.com", "1") is None
+        assert config.find_profile("cloud.getdbt.com", "not-an-id") is None
+
+    def test_names_for_host(self, config):
+        assert config.names_for_host("https://cloud.getdbt.com") == {"prod", "dev"}
+        assert config.names_for_host("unknown.com") == set()
+
+    def test_resolve_profile(self, config):
+        assert config.resolve_profile("emea") == "emea"
+        assert config.resolve_profile("3") == "emea"
+        assert config.resolve_profile("99") is None
+        assert config.resolve_profile("missing") is None
+
+    def test_resolve_profile_prefix(self, config):
+        config.add_profile("development", ProjectConfig(host="d.com", project_id=5))
+
+        assert config.resolve_profile("em") is None
+        assert config.resolve_profile("em", prefix=True) == "emea"
+        assert config.resolve_profile("dev", prefix=True) == "dev"
+        assert config.resolve_profile("deve", prefix=True) == "development"
+        assert config.resolve_profile("d", prefix=True) is None
+        assert config.names_with_prefix("d") == ["dev", "development"]
+        assert config.names_with_prefix("d", limit=1) == ["dev"]
+
+    def test_name_indexes_follow_mutations(self, config):
+        assert config.sorted_names() == ["dev", "emea", "prod"]
+        assert config.name_index().suggest("prd") == ["prod"]
+
+        config.add_profile("alpha", ProjectConfig(host="a.com", project_id=9))
+        config.remove_profile("emea")
+
+        assert config.sorted_names() == ["alpha", "dev", "prod"]
+        assert config.name_index().suggest("alpah") == ["alpha"]
+
+    def test_indexes_follow_mutations(self, config):
+        config.host_index()
+        config.replace_profile("dev", ProjectConfig(host="emea.dbt.com", project_id=2))
+        config.remove_profile("prod")
+        config.add_profile("new", ProjectConfig(host="cloud.getdbt.com", project_id=4))
+
+        assert config.names_for_host("cloud.getdbt.com") == {"new"}
+        assert config.names_for_host("emea.dbt.com") == {"emea", "dev"}
+        assert config.find_profile("emea.dbt.com", 2) == "dev"
+
+
+class TestValidateSwitchText:
+    """Test whole-file validation with line numbers."""
+
+    def test_reports_every_problem(self):
+        text = """profiles:
+  prod:
+    host: cloud.getdbt.com
+    project_id: 1
+  bad name:
+    host: cloud.getdbt.com
+    project_id: 2
+  also bad!:
+    host: ""
+    project_id: -3
+  qa:
+    host: emea.dbt.com
+    project_id: 1
+  prod:
+    host: cloud.getdbt.com
+    project_id: 4
+  noid:
+    host: x.com
+  staging:
+    host: x.com
+    project_id: 4
+"""
+        problems = validate_switch_text(text)
+
+        assert [(line, location) for line, location, _ in problems] == [
+            (5, "profiles.bad name"),
+            (8, "profiles.also bad!"),
+            (9, "profiles.also bad!.host"),
+            (10, "profiles.also bad!.project_id"),
+            (14, "profiles.prod"),
+            (17, "profiles.noid.project_id"),
+            (21, "profiles.staging.project_id"),
+        ]
+        messages = dict(((line, message) for line, _, message in problems))
+        assert "defined more than once (also on line 2)" in messages[14]
+        assert messages[21] == "Project ID 4 is already used by 'prod' (line 16)"
+        assert messages[10] == "Project ID must be a positive integer."
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("profiles: {}\n", []),
+            ("other: 1\n", []),
+            ("", [(None, "", "File is empty; expected a 'profiles' mapping")]),
+            ("- 1\n", [(1, "", "Expected a mapping with a 'profiles' key")]),
+            ("profiles:\n", [(1, "profiles", "Expected a mapping of projects")]),
+        ],
+    )
+    def test_document_shape(self, text, expected):
+        assert validate_switch_text(text) == expected
+
+    def test_yaml_syntax_error(self):
+        [(line, location, message)] = validate_switch_text("profiles:\n  a: [\n")
+        assert line == 3
+        assert message.startswith("Invalid YAML")
+
+    def test_agrees_with_model(self, sample_dbt_config):
+        text = dump_yaml(sample_dbt_config.model_dump())
+        assert validate_switch_text(text) == []
+
+    def test_model_names_every_clash(self):
+        with pytest.raises(ValidationError) as excinfo:
+            DbtSwitchConfig(
+                profiles={
+                    "a": {"host": "x.com", "project_id": 1},
+                    "b": {"host": "x.com", "project_id": 1},
+                    "c": {"host": "x.com", "project_id": 2},
+                    "d": {"host": "x.com", "project_id": 2},
+                }
+            )
+        assert "1 is used by a, b; 2 is used by c, d" in str(excinfo.value)
+
+        with pytest.raises(ValidationError, match="'x y', 'z!' contain invalid"):
+            DbtSwitchConfig(
+                profiles={
+                    "x y": {"host": "x.com", "project_id": 1},
+                    "z!": {"host": "x.com", "project_id": 2},
+                }
+            )
+
+    def test_user_wrapper(self, tmp_path, caplog):
+        path = tmp_path / "dbt_switch.yml"
+        path.write_text("profiles:\n  ok:\n    host: x.com\n    project_id: 0\n")
+        assert validate_user_config(path) is False
+        assert f"✗ {path}:4: profiles.ok.project_id: Project ID must be" in caplog.text
+        assert "Found 1 problem(s)" in caplog.text
+
+        path.write_text("profiles:\n  ok:\n    host: x.com\n    project_id: 1\n")
+        assert validate_user_config(path) is True
+        assert validate_user_config(tmp_path / "missing.yml") is False
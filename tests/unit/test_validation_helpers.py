@@ -11,6 +11,7 @@ from dbt_switch.validation.helpers import (
     validate_full_config_after_modification,
     create_validated_project_config,
 )
+from dbt_switch.validation.hosts import normalize_host
 from dbt_switch.validation.schemas import DbtSwitchConfig, ProjectConfig
 
 
@@ -57,6 +58,8 @@ class TestValidateProjectNameFormat:
         with pytest.raises(ValueError, match="already in use"):
             validate_unique_project_id(config, 111)
 
+        validate_unique_project_id(config, 111, exclude_project="proj1")
+
     def test_config_validation(self):
         """Test config validation."""
         config = DbtSwitchConfig(
@@ -75,3 +78,24 @@ class TestValidateProjectNameFormat:
         assert isinstance(config, ProjectConfig)
         assert config.host == "test.com"
         assert config.project_id == 123
+
+
+class TestNormalizeHost:
+    """Test canonical host comparison."""
+
+    @pytest.mark.parametrize(
+        "host",
+        [
+            "cloud.getdbt.com",
+            "https://cloud.getdbt.com",
+            "https://Cloud.GetDbt.com/",
+            "http://cloud.getdbt.com/deploy/123?x=1",
+            "  cloud.getdbt.com.  ",
+            "cloud.getdbt.com:443",
+        ],
+    )
+    def test_equivalent_forms(self, host):
+        assert normalize_host(host) == "cloud.getdbt.com"
+
+    def test_other_port_kept(self):
+        assert normalize_host("localhost:8080") == "localhost:8080"
@@ -0,0 +1,80 @@
+"""
+Unit tests for the shared YAML I/O layer.
+"""
+
+import importlib
+import io
+import pytest
+import yaml
+
+from dbt_switch.config import yaml_io
+
+CLOUD_DATA = {
+    "version": "1",
+    "context": {"active-host": "cloud.getdbt.com", "active-project": "12345"},
+    "projects": [
+        {
+            "project-name": "Alpha Analytics",
+            "project-id": "12345",
+            "account-name": "Alpha Industries",
+            "account-id": "11111",
+            "account-host": "cloud.getdbt.com",
+            "token-name": "cloud-cli-alpha",
+            "token-value": "dbtu_alpha_token_here",
+        }
+    ],
+}
+SWITCH_DATA = {
+    "profiles": {
+        "alpha": {"host": "cloud.getdbt.com", "project_id": 12345},
+        "beta": {"host": "https://xyz123.us1.dbt.com", "project_id": 67890},
+    }
+}
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+class TestBackendParity:
+    """Both backends must behave identically."""
+
+    @pytest.mark.parametrize("data", [CLOUD_DATA, SWITCH_DATA, {"profiles": {}}])
+    def test_identical_dump(self, data):
+        """libyaml and pure-Python dumpers produce the same text."""
+        c_text = yaml_io.dump_yaml(data, dumper=yaml.CSafeDumper)
+        py_text = yaml_io.dump_yaml(data, dumper=yaml.SafeDumper)
+
+        assert c_text == py_text
+
+    @pytest.mark.parametrize("data", [CLOUD_DATA, SWITCH_DATA])
+    def test_identical_load(self, data):
+        """libyaml and pure-Python loaders produce the same objects."""
+        text = yaml_io.dump_yaml(data)
+
+        c_data = yaml_io.load_yaml(io.StringIO(text), loader=yaml.CSafeLoader)
+        py_data = yaml_io.load_yaml(io.StringIO(text), loader=yaml.SafeLoader)
+
+        assert c_data == py_data == data
+
+    def test_libyaml_selected(self):
+        """The C backend is used when available."""
+        assert yaml_io.YAML_BACKEND == "libyaml"
+        assert yaml_io.SafeLoader is yaml.CSafeLoader
+
+
+class TestBackendFallback:
+    """Without libyaml the pure-Python classes are used."""
+
+    def test_fallback_without_libyaml(self, monkeypatch):
+        monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+        monkeypatch.delattr(yaml, "CSafeDumper", raising=False)
+        try:
+            module = importlib.reload(yaml_io)
+            assert module.YAML_BACKEND == "python"
+            assert module.SafeLoader is yaml.SafeLoader
+            assert module.load_yaml(module.dump_yaml(SWITCH_DATA)) == SWITCH_DATA
+        finally:
+            monkeypatch.undo()
+            importlib.reload(yaml_io)
+
+    def test_dump_is_block_style(self):
+        """Nested mappings are written in block style, as before."""
+        assert yaml_io.dump_yaml(SWITCH_DATA).startswith("profiles:\n  alpha:\n")